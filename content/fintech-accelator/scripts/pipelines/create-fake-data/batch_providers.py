@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Batched providers for FakeGenericTable.
+
+A batched provider produces the values of a whole column slice in one call
+instead of one value per call. FakeGenericTable detects them through the
+``batch`` method and fills the column per chunk; string, dict and lambda
+providers keep working through the per-row path.
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+
+from faker import Faker
+
+
+class BatchProvider:
+    """
+    Base class for providers that can produce N values at once.
+
+    Subclasses implement ``batch(faker, rows)`` where ``rows`` holds the
+    absolute row numbers being generated (its length is the number of values
+    to return). Randomness must come from ``faker.random`` so the values follow
+    the seeding done by FakeGenericTable.
+    """
+
+    # When True the table calls ``batch`` once per chunk instead of once per locale
+    locale_independent = False
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Any]:
+        raise NotImplementedError
+
+    def __call__(self, faker: Faker) -> Any:
+        """Per-row form, so a batched provider can still be used as a lambda."""
+        return self.batch(faker, [0])[0]
+
+
+class ChoiceProvider(BatchProvider):
+    """
+    Pick values from a fixed list, optionally weighted.
+
+    Replaces lambdas like ``lambda _: random.choice(STATUS)``.
+    """
+
+    locale_independent = True
+
+    def __init__(self, elements: Sequence[Any], weights: Optional[Sequence[float]] = None):
+        if not elements:
+            raise ValueError("ChoiceProvider needs at least one element")
+        if weights is not None and len(weights) != len(elements):
+            raise ValueError(f"Number of weights ({len(weights)}) must match number of elements ({len(elements)})")
+        self.elements = list(elements)
+        self.cum_weights = None
+        if weights is not None:
+            total = 0.0
+            self.cum_weights = []
+            for weight in weights:
+                total += weight
+                self.cum_weights.append(total)
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Any]:
+        return faker.random.choices(self.elements, cum_weights=self.cum_weights, k=len(rows))
+
+
+class IntRangeProvider(BatchProvider):
+    """Uniform integers in the closed range [low, high]."""
+
+    locale_independent = True
+
+    def __init__(self, low: int, high: int):
+        if low > high:
+            raise ValueError(f"Invalid range: low ({low}) is greater than high ({high})")
+        self.low = low
+        self.span = high - low + 1
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[int]:
+        randbelow = faker.random.randrange
+        low, span = self.low, self.span
+        return [low + randbelow(span) for _ in rows]
+
+
+class BooleanProvider(BatchProvider):
+    """Return ``true_value`` with probability ``chance``, ``false_value`` otherwise."""
+
+    locale_independent = True
+
+    def __init__(self, chance: float = 0.5, true_value: Any = True, false_value: Any = False):
+        self.chance = chance
+        self.true_value = true_value
+        self.false_value = false_value
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Any]:
+        rand = faker.random.random
+        chance, true_value, false_value = self.chance, self.true_value, self.false_value
+        return [true_value if rand() < chance else false_value for _ in rows]
+
+
+def is_batch_provider(provider: Any) -> bool:
+    """Check whether a provider exposes the batched ``batch(faker, rows)`` form."""
+    return callable(getattr(provider, 'batch', None))
+
+
+# Card schemes used by UniqueCardNumberProvider: (IIN prefix, card length, weight)
+CARD_SCHEMES = [
+    ('4', 16, 40),                                            # Visa
+    ('51', 16, 5), ('52', 16, 5), ('53', 16, 5), ('54', 16, 5), ('55', 16, 5),
+    ('2221', 16, 1), ('2720', 16, 1),                         # Mastercard 2-series
+    ('34', 15, 6), ('37', 15, 6),                             # American Express
+    ('6011', 16, 5), ('65', 16, 4),                           # Discover
+    ('3528', 16, 2), ('3589', 16, 2),                         # JCB
+    ('36', 14, 2), ('38', 14, 2),                             # Diners Club
+    ('62', 16, 4),                                            # UnionPay
+]
+
+# Luhn value of each digit once doubled
+_LUHN_DOUBLED = [0, 2, 4, 6, 8, 1, 3, 5, 7, 9]
+
+
+def luhn_check_digit(payload: str) -> str:
+    """
+    Compute the Luhn check digit of a card number without its last digit.
+
+    Args:
+        payload: Digits of the card number, check digit excluded
+
+    Returns:
+        Check digit as a one-character string
+    """
+    total = 0
+    # The rightmost payload digit is doubled, then every second one to the left
+    for index, char in enumerate(reversed(payload)):
+        digit = ord(char) - 48
+        if index % 2 == 0:
+            digit = _LUHN_DOUBLED[digit]
+        total += digit
+    return str((10 - total % 10) % 10)
+
+
+class UniqueCardNumberProvider(BatchProvider):
+    """
+    Unique, Luhn-valid card numbers derived from the row number.
+
+    The row number goes through a keyed Feistel permutation of [0, 10**10),
+    and the result becomes the last 10 digits before the check digit. Two
+    different rows therefore never share a card number, without keeping any
+    set of issued numbers (O(1) memory) and regardless of how rows are split
+    across shards or workers. The IIN prefix (Visa, Mastercard, Amex, ...) and
+    any padding digits come from the seeded random stream.
+    """
+
+    ACCOUNT_DIGITS = 10
+    _HALF = 10 ** 5
+    _ROUNDS = 4
+
+    def __init__(self, key: int = 0, schemes: Optional[Sequence[Tuple[str, int, float]]] = None):
+        schemes = list(schemes or CARD_SCHEMES)
+        for prefix, length, _ in schemes:
+            if length - len(prefix) - 1 < self.ACCOUNT_DIGITS:
+                raise ValueError(f"Card length {length} too short for prefix {prefix}")
+        self.schemes = [(prefix, length - len(prefix) - 1 - self.ACCOUNT_DIGITS) for prefix, length, _ in schemes]
+        self.weights = [weight for _, _, weight in schemes]
+        self.round_keys = [
+            (key * 0x9E3779B97F4A7C15 + round_number * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+            for round_number in range(self._ROUNDS)
+        ]
+
+    def _permute(self, counter: int) -> int:
+        """Keyed bijection of [0, 10**10) (balanced Feistel network over two base-10**5 halves)."""
+        half = self._HALF
+        left, right = divmod(counter, half)
+        for round_key in self.round_keys:
+            mixed = (right * 0x94D049BB133111EB + round_key) & 0xFFFFFFFFFFFFFFFF
+            mixed ^= mixed >> 29
+            left, right = right, (left + mixed) % half
+        return left * half + right
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[str]:
+        limit = 10 ** self.ACCOUNT_DIGITS
+        rng = faker.random
+        schemes = rng.choices(self.schemes, weights=self.weights, k=len(rows))
+        numbers = []
+        for row, (prefix, padding) in zip(rows, schemes):
+            if not 0 <= row < limit:
+                raise ValueError(f"Row number {row} outside the unique card range")
+            payload = prefix
+            if padding:
+                payload += str(rng.randrange(10 ** padding)).zfill(padding)
+            payload += str(self._permute(row)).zfill(self.ACCOUNT_DIGITS)
+            numbers.append(payload + luhn_check_digit(payload))
+        return numbers
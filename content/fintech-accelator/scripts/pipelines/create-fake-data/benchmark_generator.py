@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Throughput and memory benchmarks of the fake data generator.
+
+For every fintech entity definition (class/*_fake_fintech.py) and every
+combination of record count and locale variability, three operations of
+FakeGenericTable are measured:
+
+- generate: generate_fake_data
+- to_sql: to_sql over the generated records
+- export_foreign_keys: export_foreign_keys_file (tables exporting keys only)
+
+Each case is timed without tracing (rows/sec), after a short warm-up run,
+then run again under tracemalloc to measure its peak traced memory. The
+size of the SQL produced by to_sql is recorded too, for scale_planner.py. Tables are generated in
+dependency order and hand their key columns to the dependent tables in
+memory, as in the orchestrator, and every file is written to a temporary
+directory, so the FK-Values files of data/sql are never touched.
+
+Results are written as JSON; a run can be compared against a baseline file
+and flags the cases whose throughput dropped, or whose memory grew, by more
+than a tolerance (exit code 1, for nightly jobs).
+"""
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fk_samplers import PoolSampler
+from orchestrator import CLASS_DIR, FINTECH_TABLES, dependency_order
+
+
+DEFAULT_RECORDS = (10_000, 100_000)
+DEFAULT_VARIABILITY = (0.0, 0.3, 1.0)
+DEFAULT_TOLERANCE = 0.15
+
+# Rows generated before timing a table, so loading locales and value banks is not measured
+WARMUP_RECORDS = 1_000
+
+
+def _case_key(result: Dict[str, Any]) -> Tuple[str, str, int, float]:
+    return result['table'], result['operation'], result['records'], result['variability']
+
+
+def _max_rss_mb() -> float:
+    """High-water mark of the resident set size of this process (ru_maxrss)."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _create_table(table: str, records: int, pools: Dict[str, PoolSampler], output_dir: str):
+    """Build the FakeGenericTable of an entity definition, fed with in-memory foreign keys."""
+    spec = FINTECH_TABLES[table]
+    if CLASS_DIR not in sys.path:
+        sys.path.append(CLASS_DIR)
+    module = importlib.import_module(spec.module)
+
+    foreign_keys = {
+        column: pools[f"{source}.{source_column}"]
+        for column, (source, source_column) in spec.foreign_keys.items()
+    }
+    # SERIAL keys handed as ranges, so the entity scripts do not look up the table state in data/sql
+    for column in spec.serial_keys:
+        foreign_keys[column] = range(1, records + 1)
+    kwargs = {'auto_prefix': 'BENCH', 'foreign_keys': foreign_keys}
+    if spec.takes_records:
+        kwargs['records'] = records
+
+    data_table = module.generate_data_dummy(**kwargs)
+    data_table.path_output = output_dir
+    return data_table
+
+
+def _run_operations(data_table, spec, records: int, variability: float, seed: int,
+                    trace: bool) -> Tuple[Dict[str, Tuple[float, Optional[float], Optional[int]]], List[Dict[str, Any]]]:
+    """
+    Run the benchmarked operations of one table once.
+
+    Args:
+        data_table: Table to benchmark
+        spec: Table specification (exported key columns)
+        records: Number of records
+        variability: Locale variability
+        seed: Random seed
+        trace: Measure the peak traced memory of each operation
+
+    Returns:
+        Tuple of ({operation: (seconds, peak traced MB or None, output bytes or None)},
+        generated records)
+    """
+    measures = {}
+
+    def measure(operation: str, function):
+        if trace:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        value = function()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024 if trace else None
+        measures[operation] = (seconds, peak, len(value.encode('utf-8')) if isinstance(value, str) else None)
+        return value
+
+    generated = measure('generate', lambda: data_table.generate_fake_data(records, seed=seed, variability=variability))
+    measure('to_sql', lambda: data_table.to_sql(generated))
+    if spec.exports:
+        measure('export_foreign_keys', lambda: data_table.export_foreign_keys_file(generated, list(spec.exports)))
+    return measures, generated
+
+
+def run_benchmarks(records: Sequence[int] = DEFAULT_RECORDS,
+                   variabilities: Sequence[float] = DEFAULT_VARIABILITY,
+                   tables: Optional[Sequence[str]] = None,
+                   seed: int = 42,
+                   memory: bool = True,
+                   verbose: bool = False,
+                   log=print) -> Dict[str, Any]:
+    """
+    Benchmark the entity definitions over a sweep of record counts and variabilities.
+
+    Args:
+        records: Record counts to benchmark
+        variabilities: Locale variabilities to benchmark
+        tables: Tables to report (default: all); the tables they depend on
+                are generated too, to feed their foreign keys
+        seed: Random seed
+        memory: Also run every case under tracemalloc for its peak memory
+        verbose: Keep the output of the generator instead of silencing it
+        log: Function receiving the progress lines
+
+    Returns:
+        Run metadata and one result per (table, operation, records, variability)
+    """
+    reported = set(tables or FINTECH_TABLES)
+    unknown = reported - set(FINTECH_TABLES)
+    if unknown:
+        raise KeyError(f"Unknown tables: {', '.join(sorted(unknown))}")
+    # Tables the reported ones depend on are generated too, for their keys
+    needed = set()
+    pending = list(reported)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(FINTECH_TABLES[name].depends_on)
+    order = [name for name in dependency_order(FINTECH_TABLES) if name in needed]
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix='fake-data-benchmark-') as output_dir:
+        for count in records:
+            for variability in variabilities:
+                pools: Dict[str, PoolSampler] = {}
+                for table in order:
+                    spec = FINTECH_TABLES[table]
+                    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+                    with quiet:
+                        data_table = _create_table(table, count, pools, output_dir)
+                        data_table.generate_fake_data(min(count, WARMUP_RECORDS), seed=seed, variability=variability)
+                        timings, generated = _run_operations(data_table, spec, count, variability, seed, trace=False)
+                        for column in spec.exports:
+                            pools[f"{table}.{column}"] = PoolSampler(record[column] for record in generated)
+                        del generated
+
+                        peaks = {}
+                        if memory and table in reported:
+                            tracemalloc.start()
+                            try:
+                                traced, generated = _run_operations(data_table, spec, count, variability, seed,
+                                                                    trace=True)
+                                del generated
+                            finally:
+                                tracemalloc.stop()
+                            peaks = {operation: peak for operation, (_, peak, _) in traced.items()}
+
+                    if table not in reported:
+                        continue
+                    for operation, (seconds, _, output_bytes) in timings.items():
+                        result = {
+                            'table': table,
+                            'operation': operation,
+                            'records': count,
+                            'variability': variability,
+                            'seconds': seconds,
+                            'rows_per_second': count / seconds if seconds else 0.0,
+                            'peak_traced_mb': peaks.get(operation),
+                            'output_bytes': output_bytes,
+                        }
+                        results.append(result)
+                        peak = f"{result['peak_traced_mb']:9.1f} MB" if peaks else ''
+                        log(f"{table:<20} {operation:<20} {count:>10} rows  v={variability:<4} "
+                            f"{seconds:8.2f}s  {result['rows_per_second']:12,.0f} rows/s  {peak}")
+
+    return {
+        'created': datetime.now().replace(microsecond=0).isoformat(sep=' '),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'max_rss_mb': _max_rss_mb(),
+        'results': results,
+    }
+
+
+def compare_results(current: Dict[str, Any],
+                    baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Compare a run against a baseline run.
+
+    Args:
+        current: Output of run_benchmarks
+        baseline: Baseline output of run_benchmarks (e.g. loaded from JSON)
+        tolerance: Relative change tolerated before flagging a regression
+
+    Returns:
+        One entry per case present in both runs, with the throughput and
+        memory ratios (current / baseline) and whether it regressed
+    """
+    baseline_results = {_case_key(result): result for result in baseline.get('results', [])}
+    comparisons = []
+    for result in current['results']:
+        reference = baseline_results.get(_case_key(result))
+        if reference is None:
+            continue
+        speed = result['rows_per_second'] / reference['rows_per_second'] if reference['rows_per_second'] else None
+        memory = None
+        if result['peak_traced_mb'] is not None and reference.get('peak_traced_mb'):
+            memory = result['peak_traced_mb'] / reference['peak_traced_mb']
+        comparisons.append({
+            'table': result['table'],
+            'operation': result['operation'],
+            'records': result['records'],
+            'variability': result['variability'],
+            'speed_ratio': speed,
+            'memory_ratio': memory,
+            'regression': (speed is not None and speed < 1 - tolerance)
+                          or (memory is not None and memory > 1 + tolerance),
+        })
+    return comparisons
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the fake data generator on the fintech entity definitions')
+    parser.add_argument('--records', type=int, nargs='+', default=list(DEFAULT_RECORDS),
+                        help='Record counts to benchmark (e.g. 10000 100000 1000000 10000000)')
+    parser.add_argument('--variability', type=float, nargs='+', default=list(DEFAULT_VARIABILITY),
+                        help='Locale variabilities to benchmark (default: 0 0.3 1)')
+    parser.add_argument('--tables', type=str, nargs='+', default=None, choices=list(FINTECH_TABLES),
+                        help='Tables to benchmark (default: all)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the tracemalloc pass (throughput only, about twice as fast)')
+    parser.add_argument('--output', type=str, default=None, help='Write the results to a JSON file (e.g. a new baseline)')
+    parser.add_argument('--compare', type=str, default=None, help='Baseline JSON file to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Relative slowdown or memory growth flagged as a regression (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--verbose', action='store_true', help='Show the output of the generator')
+    args = parser.parse_args()
+
+    run = run_benchmarks(args.records, args.variability, args.tables, args.seed,
+                         memory=not args.no_memory, verbose=args.verbose)
+    print(f"Max RSS: {run['max_rss_mb']:.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"Results written to {os.path.abspath(args.output)}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparisons = compare_results(run, baseline, args.tolerance)
+        regressions = [comparison for comparison in comparisons if comparison['regression']]
+        print(f"Compared {len(comparisons)} cases with {args.compare} (baseline of {baseline.get('created')}):")
+        for comparison in comparisons:
+            memory = comparison['memory_ratio']
+            print(f"  {'REGRESSION' if comparison['regression'] else 'ok':<10} "
+                  f"{comparison['table']:<20} {comparison['operation']:<20} {comparison['records']:>10} rows  "
+                  f"v={comparison['variability']:<4} speed x{comparison['speed_ratio'] or 0:.2f}"
+                  + (f"  memory x{memory:.2f}" if memory is not None else ""))
+        if regressions:
+            print(f"❌ {len(regressions)} regressions beyond {args.tolerance:.0%}")
+            sys.exit(1)
+        print("✅ No regressions")
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 import sys
 import os
-import random
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from fake_data_generic import FakeGenericTable
+from batch_providers import ChoiceProvider
+from numeric_providers import DigitStringProvider
+from template_providers import TemplateProvider
+from temporal_providers import DATE_FORMAT, TemporalProvider
 
-def generate_data_dummy(auto_prefix:str = None):
+def generate_data_dummy(auto_prefix:str = None, foreign_keys:dict = None, value_banks:bool = False):
     """
     Example of generating data for the CLIENTS table.
     
@@ -22,6 +25,13 @@ def generate_data_dummy(auto_prefix:str = None):
         phone VARCHAR(50),
         address VARCHAR(255)
     );
+
+    Args:
+        auto_prefix: Prefix of the output files
+        foreign_keys: Foreign key pools to use instead of the FK-Values files
+                      (e.g. handed over in memory by the orchestrator)
+        value_banks: Draw first_name and last_name (and the names of the
+                     email) from per-locale value banks (see value_banks.py)
     """
     # Define columns in order
     columns = [
@@ -53,7 +63,7 @@ def generate_data_dummy(auto_prefix:str = None):
     # Define faker providers for each column
     faker_providers = [
         # client_id: Custom format "CL-NNNNNN"
-        lambda faker: f"CL-{faker.random_number(digits=15)}",
+        DigitStringProvider(15, prefix='CL-'),
         
         # first_name: Use Faker's first_name method
         'first_name',
@@ -65,14 +75,14 @@ def generate_data_dummy(auto_prefix:str = None):
         'last_name',
         
         # gender: Random selection from specific values
-        {'method': 'random_element', 'elements': ('Male', 'Female', 'Other')},
+        ChoiceProvider(('Male', 'Female', 'Other')),
         
         # birth_date: Birth date for an adult
-        lambda faker: faker.date_of_birth(minimum_age=18, maximum_age=75).strftime('%Y-%m-%d'),
+        TemporalProvider(start_date='-75y', end_date='-18y', unit='day', date_format=DATE_FORMAT),
         
-        # email: Custom email using first and last name
-
-        lambda faker: faker.email().split('@')[0] + faker.last_name() + faker.word() + str(faker.random_number(digits=5)) + '@' + random.choice(CUSTOM_DOMAINS),
+        # email: Custom email using first and last name (compiled template, see template_providers)
+        TemplateProvider("{first_name|slug}.{last_name|slug}{digits:5}@{choice:DOMAINS}",
+                         choices={'DOMAINS': CUSTOM_DOMAINS}, value_banks=value_banks),
         
         # phone: Faker's phone_number method
         'phone_number',
@@ -88,7 +98,10 @@ def generate_data_dummy(auto_prefix:str = None):
         columns=columns,
         path_output='../../../data/sql',
         prefix=auto_prefix,
-        faker_providers=faker_providers
+        faker_providers=faker_providers,
+        foreign_keys=foreign_keys,
+        value_banks=value_banks,
+        unique_columns=['client_id']
     )
     
     return data_table
@@ -98,26 +111,77 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Generate fake data for the CLIENTS table')
-    parser.add_argument('--records', type=int, required=True, help='Number of records to generate')
+    parser.add_argument('--records', type=int, default=None,
+                       help='Number of records to generate (not needed with --append)')
+    parser.add_argument('--append', type=int, default=None, metavar='N',
+                       help='Append N rows after the recorded table state (delta SQL/COPY and FK-Values files)')
+    parser.add_argument('--save-state', action='store_true',
+                       help='Record the table state of a full run, so --append can continue it later')
     parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility')
     parser.add_argument('--variability', type=float, default=0.3, 
                        help='Locale variability (0-1, where 0 = single locale, 1 = all locales)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes (output is identical for any value)')
+    parser.add_argument('--output-format', choices=['sql', 'parquet', 'arrow'], default='sql',
+                       help='Table data format: SQL INSERT file or typed columnar file (requires pyarrow)')
+    parser.add_argument('--compress', action='store_true',
+                       help='Write gzip-compressed SQL and FK-Values files (.sql.gz / .txt.gz)')
+    parser.add_argument('--fk-format', choices=['text', 'binary', 'both'], default='text',
+                       help='Foreign key outputs: FK-Values text file, memory-mapped .fkb store or both')
+    parser.add_argument('--dsn', type=str, default=None,
+                       help='PostgreSQL DSN: load the table with COPY instead of writing the SQL file (requires psycopg2)')
     parser.add_argument('--prefix', type=str, default='XX', 
                        help='prefix of file')
+    parser.add_argument('--value-banks', action='store_true',
+                       help='Draw first and last names from per-locale value banks (cached in ~/.cache)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print the time spent generating each column, per locale')
+    parser.add_argument('--profile-json', type=str, default=None,
+                       help='Also write the column profile to this JSON file (implies --profile)')
     
     args = parser.parse_args()
+    if args.records is None and args.append is None:
+        parser.error('--records or --append is required')
     
     # Create table
-    dummy_table = generate_data_dummy(args.prefix)
+    dummy_table = generate_data_dummy(args.prefix, value_banks=args.value_banks)
+    if args.save_state:
+        dummy_table.save_state = True
+    if args.profile or args.profile_json:
+        dummy_table.enable_profiling(args.profile_json)
     
-    # Generate fake data
-    records = dummy_table.generate_fake_data(
-        num_records=args.records,
-        seed=args.seed,
-        variability=args.variability
-    )
+    if args.append:
+        # Generate only the new rows, continuing the recorded table state
+        dummy_table.append_records(
+            args.append,
+            ['client_id'],
+            write_sql=args.output_format == 'sql',
+            columnar_format=None if args.output_format == 'sql' else args.output_format,
+            compress=args.compress,
+            fk_format=args.fk_format,
+            workers=args.workers,
+            conn=args.dsn
+        )
+    else:
+        # Generate fake data as a stream of chunks
+        chunks = dummy_table.iter_fake_data(
+            num_records=args.records,
+            seed=args.seed,
+            variability=args.variability,
+            workers=args.workers
+        )
     
-    # Export to SQL file
-    dummy_table.export_to_sql_file(records)
-    # Export column client_id
-    dummy_table.export_foreign_keys_file(records, ['client_id'])
\ No newline at end of file
+        if args.dsn:
+            # Stream straight into PostgreSQL with COPY and write the Foreign Keys Records in the same pass
+            dummy_table.load_to_postgres(args.dsn, chunks, ['client_id'], compress=args.compress,
+                                         fk_format=args.fk_format)
+        else:
+            # Export table data (SQL or columnar) and Foreign Keys Records in a single pass
+            dummy_table.export_chunks(
+                chunks,
+                ['client_id'],
+                write_sql=args.output_format == 'sql',
+                columnar_format=None if args.output_format == 'sql' else args.output_format,
+                compress=args.compress,
+                fk_format=args.fk_format
+            )
@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 import sys
 import os
-import random
-import uuid
-from datetime import timedelta
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from fake_data_generic import FakeGenericTable
-from read_columns_from_file import read_column_data
+from batch_providers import ChoiceProvider, UniqueCardNumberProvider
+from read_columns_from_file import read_foreign_key_pool
+from table_state import foreign_key_rows
+from temporal_providers import DATE_FORMAT, TemporalProvider
 
-def generate_data_dummy(auto_prefix:str = None, records:int = None):
+def generate_data_dummy(auto_prefix:str = None, records:int = None, foreign_keys:dict = None, from_state:bool = False):
     """
     Example of generating data for the CREDIT_CARDS table.
     
@@ -22,6 +22,14 @@ def generate_data_dummy(auto_prefix:str = None, records:int = None):
         franchise_id INT NOT NULL
     );
 
+    Args:
+        auto_prefix: Prefix of the output files
+        records: Number of records generated per table (size of the SERIAL key ranges)
+        foreign_keys: Foreign key pools to use instead of the FK-Values files
+                      (e.g. handed over in memory by the orchestrator)
+        from_state: Size the SERIAL key ranges from the rows recorded in the
+                    table states instead (appends; records, then the ranges
+                    recorded in this table's state are the fallback)
     """
     # Define columns in order
     columns = [
@@ -40,56 +48,34 @@ def generate_data_dummy(auto_prefix:str = None, records:int = None):
         'Canceled',
     ]
    
-    # Define custom providers as class methods to maintain state
-    class CustomProviders:
-        def __init__(self):
-            self.used_card_ids = set()
-            
-        def unique_card_id_generator(self, faker):
-            """Generar un número de tarjeta único verificando que no exista ya en el conjunto"""
-            max_attempts = 100  # Limite de intentos para evitar bucles infinitos
-            
-            for _ in range(max_attempts):
-                # Genera un número de tarjeta
-                card_id = faker.credit_card_number()
-                
-                # Si no está en el conjunto de usados, agrégalo y devuélvelo
-                if card_id not in self.used_card_ids:
-                    self.used_card_ids.add(card_id)
-                    return card_id
-                    
-            # Si no podemos encontrar un ID único después de muchos intentos,
-            # generamos uno basado en UUID para garantizar unicidad
-            unique_id = f"CC-{str(uuid.uuid4())[:16]}"
-            self.used_card_ids.add(unique_id)
-            return unique_id
-    
-    # Crear instancia de providers personalizada
-    custom_providers = CustomProviders()
-
     # Define faker providers for each column
     faker_providers = [
-        # card_id - usando nuestra función personalizada
-        lambda faker: custom_providers.unique_card_id_generator(faker),
+        # card_id - unique Luhn-valid number derived from the row number
+        UniqueCardNumberProvider(),
         # client_id
         'random_value',
         # issue_date
-        lambda faker: faker.date_between(start_date='-5y', end_date='-1y'),
-        # expiration_date
-        lambda faker: (faker.date_between(start_date='-5y', end_date='-1y') + timedelta(days=365 * random.randint(3, 5))).strftime('%Y-%m-%d'),
+        TemporalProvider(start_date='-5y', end_date='-1y', unit='day'),
+        # expiration_date: 3 to 5 years of validity
+        TemporalProvider(start_date='-5y', end_date='-1y', unit='day', date_format=DATE_FORMAT,
+                         offset_days=[365 * years for years in (3, 4, 5)]),
         # status
-        lambda faker: random.choice(STATUS),
+        ChoiceProvider(STATUS),
         # franchise_id
         'random_value'
     ]
     
-    # Add foreign keys
-    foreign_keys = {
-        'client_id': read_column_data(
+    # Add foreign keys (pools handed in memory take precedence over the FK-Values files)
+    foreign_keys = dict(foreign_keys or {})
+    if 'client_id' not in foreign_keys:
+        foreign_keys['client_id'] = read_foreign_key_pool(
             file_path = '../../../data/sql/FK-Values/FK-FINTECH-CLIENTS.txt',
-            column_number = 1),  # Placeholder - will be populated with real client_ids
-        'franchise_id': [id for id in range(1, (records + 1))]  # Protección para cuando records es None
-    }
+            column_number = 1)
+    if 'franchise_id' not in foreign_keys:
+        # SERIAL range of the franchises (lazy range, never materialized)
+        franchises = (foreign_key_rows('../../../data/sql', 'fintech', 'credit_cards', 'franchise_id',
+                                       'franchises', records) if from_state else records)
+        foreign_keys['franchise_id'] = range(1, (franchises + 1))
     
     # Create the table
     data_table = FakeGenericTable(
@@ -109,25 +95,77 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Generate fake data for the CREDIT_CARDS table')
-    parser.add_argument('--records', type=int, required=True, help='Number of records to generate')
+    parser.add_argument('--records', type=int, default=None,
+                       help='Number of records to generate (not needed with --append)')
+    parser.add_argument('--append', type=int, default=None, metavar='N',
+                       help='Append N rows after the recorded table state (delta SQL/COPY and FK-Values files)')
+    parser.add_argument('--save-state', action='store_true',
+                       help='Record the table state of a full run, so --append can continue it later')
     parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility')
     parser.add_argument('--variability', type=float, default=0.3, 
                        help='Locale variability (0-1, where 0 = single locale, 1 = all locales)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes (output is identical for any value)')
+    parser.add_argument('--output-format', choices=['sql', 'parquet', 'arrow'], default='sql',
+                       help='Table data format: SQL INSERT file or typed columnar file (requires pyarrow)')
+    parser.add_argument('--compress', action='store_true',
+                       help='Write gzip-compressed SQL and FK-Values files (.sql.gz / .txt.gz)')
+    parser.add_argument('--fk-format', choices=['text', 'binary', 'both'], default='text',
+                       help='Foreign key outputs: FK-Values text file, memory-mapped .fkb store or both')
+    parser.add_argument('--dsn', type=str, default=None,
+                       help='PostgreSQL DSN: load the table with COPY instead of writing the SQL file (requires psycopg2)')
     parser.add_argument('--prefix', type=str, default='XX', 
                        help='prefix of file')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print the time spent generating each column, per locale')
+    parser.add_argument('--profile-json', type=str, default=None,
+                       help='Also write the column profile to this JSON file (implies --profile)')
     args = parser.parse_args()
+    if args.records is None and args.append is None:
+        parser.error('--records or --append is required')
     
     # Create table
-    dummy_table = generate_data_dummy(args.prefix, args.records)
+    try:
+        dummy_table = generate_data_dummy(args.prefix, args.records, from_state=args.append is not None)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if args.save_state:
+        dummy_table.save_state = True
+    if args.profile or args.profile_json:
+        dummy_table.enable_profiling(args.profile_json)
     
-    # Generate fake data
-    records = dummy_table.generate_fake_data(
-        num_records=args.records,
-        seed=args.seed,
-        variability=args.variability
-    )
+    if args.append:
+        # Generate only the new rows, continuing the recorded table state
+        dummy_table.append_records(
+            args.append,
+            ['card_id'],
+            write_sql=args.output_format == 'sql',
+            columnar_format=None if args.output_format == 'sql' else args.output_format,
+            compress=args.compress,
+            fk_format=args.fk_format,
+            workers=args.workers,
+            conn=args.dsn
+        )
+    else:
+        # Generate fake data as a stream of chunks
+        chunks = dummy_table.iter_fake_data(
+            num_records=args.records,
+            seed=args.seed,
+            variability=args.variability,
+            workers=args.workers
+        )
     
-    # Export to SQL file
-    dummy_table.export_to_sql_file(records)
-    # Export Foreign Keys Records
-    dummy_table.export_foreign_keys_file(records, ['card_id'])
\ No newline at end of file
+        if args.dsn:
+            # Stream straight into PostgreSQL with COPY and write the Foreign Keys Records in the same pass
+            dummy_table.load_to_postgres(args.dsn, chunks, ['card_id'], compress=args.compress,
+                                         fk_format=args.fk_format)
+        else:
+            # Export table data (SQL or columnar) and Foreign Keys Records in a single pass
+            dummy_table.export_chunks(
+                chunks,
+                ['card_id'],
+                write_sql=args.output_format == 'sql',
+                columnar_format=None if args.output_format == 'sql' else args.output_format,
+                compress=args.compress,
+                fk_format=args.fk_format
+            )
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 import sys
 import os
-import random
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from fake_data_generic import FakeGenericTable
-from read_columns_from_file import read_column_data
+from batch_providers import ChoiceProvider
+from read_columns_from_file import read_column_data, read_foreign_key_pool
 
  # Card Franquises
 CARD_NETWORKS = [
@@ -30,7 +30,7 @@ CARD_NETWORKS = [
         "Visa Electron"
     ]
 
-def generate_data_dummy(auto_prefix:str = None):
+def generate_data_dummy(auto_prefix:str = None, foreign_keys:dict = None):
     """
     Example of generating data for the FRANCHISES table.
     
@@ -42,6 +42,10 @@ def generate_data_dummy(auto_prefix:str = None):
         country_code VARCHAR(3) NOT NULL
     );
 
+    Args:
+        auto_prefix: Prefix of the output files
+        foreign_keys: Foreign key pools to use instead of the FK-Values files
+                      (e.g. handed over in memory by the orchestrator)
     """
     # Define columns in order
     columns = [
@@ -54,24 +58,23 @@ def generate_data_dummy(auto_prefix:str = None):
     
     faker_providers = [
         # name
-        lambda faker: random.choice(CARD_NETWORKS),
+        ChoiceProvider(CARD_NETWORKS),
         # issuer_id
         'random_value',
         # country_code
         'random_value'
     ]
     
-    # Add foreign keys
-    foreign_keys = {
-        
-        'issuer_id': read_column_data(
+    # Add foreign keys (pools handed in memory take precedence over the FK-Values files)
+    foreign_keys = dict(foreign_keys or {})
+    if 'issuer_id' not in foreign_keys:
+        foreign_keys['issuer_id'] = read_foreign_key_pool(
             file_path = '../../../data/sql/FK-Values/FK-FINTECH-ISSUERS.txt',
-            column_number = 1),
-        
-        'country_code': read_column_data(
+            column_number = 1)
+    if 'country_code' not in foreign_keys:
+        foreign_keys['country_code'] = read_column_data(
             file_path = '../../../data/sql/FK-Values/FK-FINTECH-COUNTRIES.txt',
-            column_number = 1)  # Placeholder - will be populated with real client_ids
-    }
+            column_number = 1)
     
     # Create the table
     data_table = FakeGenericTable(
@@ -91,23 +94,67 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Generate fake data for the CLIENTS table')
-    parser.add_argument('--records', type=int, required=True, help='Number of records to generate')
+    parser.add_argument('--records', type=int, default=None,
+                       help='Number of records to generate (not needed with --append)')
+    parser.add_argument('--append', type=int, default=None, metavar='N',
+                       help='Append N rows after the recorded table state (delta SQL/COPY and FK-Values files)')
+    parser.add_argument('--save-state', action='store_true',
+                       help='Record the table state of a full run, so --append can continue it later')
     parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility')
     parser.add_argument('--variability', type=float, default=0.3, 
                        help='Locale variability (0-1, where 0 = single locale, 1 = all locales)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes (output is identical for any value)')
+    parser.add_argument('--output-format', choices=['sql', 'parquet', 'arrow'], default='sql',
+                       help='Table data format: SQL INSERT file or typed columnar file (requires pyarrow)')
+    parser.add_argument('--compress', action='store_true',
+                       help='Write gzip-compressed SQL and FK-Values files (.sql.gz / .txt.gz)')
+    parser.add_argument('--dsn', type=str, default=None,
+                       help='PostgreSQL DSN: load the table with COPY instead of writing the SQL file (requires psycopg2)')
     parser.add_argument('--prefix', type=str, default='XX', 
                        help='prefix of file')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print the time spent generating each column, per locale')
+    parser.add_argument('--profile-json', type=str, default=None,
+                       help='Also write the column profile to this JSON file (implies --profile)')
     args = parser.parse_args()
+    if args.records is None and args.append is None:
+        parser.error('--records or --append is required')
     
     # Create table
     dummy_table = generate_data_dummy(args.prefix)
+    if args.save_state:
+        dummy_table.save_state = True
+    if args.profile or args.profile_json:
+        dummy_table.enable_profiling(args.profile_json)
     
-    # Generate fake data
-    records = dummy_table.generate_fake_data(
-        num_records=args.records,
-        seed=args.seed,
-        variability=args.variability
-    )
+    if args.append:
+        # Generate only the new rows, continuing the recorded table state
+        dummy_table.append_records(
+            args.append,
+            write_sql=args.output_format == 'sql',
+            columnar_format=None if args.output_format == 'sql' else args.output_format,
+            compress=args.compress,
+            workers=args.workers,
+            conn=args.dsn
+        )
+    else:
+        # Generate fake data as a stream of chunks
+        chunks = dummy_table.iter_fake_data(
+            num_records=args.records,
+            seed=args.seed,
+            variability=args.variability,
+            workers=args.workers
+        )
     
-    # Export to SQL file
-    dummy_table.export_to_sql_file(records)
\ No newline at end of file
+        if args.dsn:
+            # Stream straight into PostgreSQL with COPY
+            dummy_table.load_to_postgres(args.dsn, chunks)
+        else:
+            # Export to SQL or columnar file
+            dummy_table.export_chunks(
+                chunks,
+                write_sql=args.output_format == 'sql',
+                columnar_format=None if args.output_format == 'sql' else args.output_format,
+                compress=args.compress
+            )
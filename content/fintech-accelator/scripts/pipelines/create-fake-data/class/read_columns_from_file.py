@@ -1,41 +1,149 @@
 import os
-from typing import List
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from compressed_io import open_text, resolve_existing_path
+from fk_samplers import ForeignKeySampler, PoolSampler, StringArray
+from fk_store import MappedPoolSampler, foreign_key_store_path
 
-def read_column_data(file_path: str, column_number: int = 1, delimiter: str = '|', skip_header:bool = True) -> List[str]:
+# Parsed files of this process: (real path, delimiter, skip_header) -> (mtime_ns, size, columns, short lines)
+_COLUMN_CACHE: Dict[Tuple[str, Optional[str], bool], Tuple[int, int, List[StringArray], Dict[int, Tuple[int, int]]]] = {}
+
+
+def _parse_columns(file_path: str,
+                   delimiter: Optional[str],
+                   skip_header: bool) -> Tuple[List[StringArray], Dict[int, Tuple[int, int]]]:
     """
-    Flexible function that handles both single-column and delimited files
+    Split every column of a file in one streaming pass
+    
+    Returns:
+        Tuple of (one StringArray per column of the first data line, first
+        short line of each column that some line lacks, as (line, fields))
+    """
+    columns: List[StringArray] = []
+    short_lines: Dict[int, Tuple[int, int]] = {}
+    header = None
+    line_number = 0
+    
+    def add(line: str) -> None:
+        nonlocal line_number
+        line_number += 1
+        parts = [line] if delimiter is None else line.split(delimiter)
+        if not columns:
+            columns.extend(StringArray() for _ in parts)
+        for index, column in enumerate(columns):
+            if index < len(parts):
+                column.append(parts[index].strip())
+            else:
+                short_lines.setdefault(index, (line_number, len(parts)))
+    
+    with open_text(file_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            # The first line is only a header if more lines follow
+            if skip_header and header is None and not line_number:
+                header = line
+                continue
+            add(line)
+    
+    if header is not None and not line_number:
+        add(header)
+    if not columns:
+        raise ValueError("File is empty")
+    return columns, short_lines
+
+
+def read_columns_data(file_path: str,
+                      column_numbers: Sequence[int],
+                      delimiter: Optional[str] = '|',
+                      skip_header: bool = True) -> List[StringArray]:
+    """
+    Extract several columns of a file in a single pass, with a process-level cache
+    
+    A file is parsed once (all of its columns at a time) and kept as compact
+    StringArray columns; later calls for the same path, modification time
+    and size reuse them, so one orchestrated run parses each FK file once.
     
     Args:
-        file_path: Path to the input file
-        column_number: Column to extract (default: 1)
+        file_path: Path to the input file (.gz files are read transparently)
+        column_numbers: Columns to extract (1-based)
         delimiter: Column separator (None for single-column files)
+        skip_header: Skip the first line when the file has more than one
         
     Returns:
-        List of values from the specified column
+        One StringArray per requested column (shared by callers: do not modify)
     """
+    file_path = resolve_existing_path(file_path)
     if not os.path.exists(file_path):
         raise ValueError(f"File not found: {file_path}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = [line.strip() for line in f if line.strip()]
+    stat = os.stat(file_path)
+    key = (os.path.realpath(file_path), delimiter, skip_header)
+    cached = _COLUMN_CACHE.get(key)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        cached = (stat.st_mtime_ns, stat.st_size) + _parse_columns(file_path, delimiter, skip_header)
+        _COLUMN_CACHE[key] = cached
+    _, _, columns, short_lines = cached
     
-    if not lines:
-        raise ValueError("File is empty")
+    result = []
+    for column_number in column_numbers:
+        index = column_number - 1
+        if index >= len(columns):
+            raise ValueError(f"Line 1 has only {len(columns)} columns")
+        if index in short_lines:
+            line, fields = short_lines[index]
+            raise ValueError(f"Line {line} has only {fields} columns")
+        result.append(columns[index])
+    return result
+
+
+def read_column_data(file_path: str, column_number: int = 1, delimiter: str = '|', skip_header:bool = True) -> Sequence[str]:
+    """
+    Flexible function that handles both single-column and delimited files
+    
+    Gzip-compressed files (.gz) are read transparently. A path like
+    FK-FINTECH-X.txt also matches FK-FINTECH-X.txt.gz (the newest one wins).
+    Files are parsed once per process (see read_columns_data).
     
-    # skip header
-    if skip_header and len(lines) > 1:
-        lines = lines[1:]
+    Args:
+        file_path: Path to the input file
+        column_number: Column to extract (default: 1)
+        delimiter: Column separator (None for single-column files)
         
-    # Single-column mode
-    if delimiter is None:
-        return lines
+    Returns:
+        Compact sequence of values from the specified column
+    """
+    return read_columns_data(file_path, [column_number], delimiter, skip_header)[0]
+
+
+def clear_column_cache() -> None:
+    """Drop the parsed files kept by read_columns_data"""
+    _COLUMN_CACHE.clear()
+
+
+def read_foreign_key_pool(file_path: str, column_number: int = 1) -> ForeignKeySampler:
+    """
+    Foreign key pool of an FK-Values file, memory-mapped when possible
     
-    # Multi-column mode
-    result = []
-    for i, line in enumerate(lines):
-        parts = line.split(delimiter)
-        if len(parts) < column_number:
-            raise ValueError(f"Line {i+1} has only {len(parts)} columns")
-        result.append(parts[column_number-1].strip())
+    When the binary store written next to the file (FK-X.fkb) is at least as
+    recent as the text file, the pool samples the mapped store directly: no
+    parsing, no list of strings, and the pages are shared by every process
+    using it. Otherwise the text file is read with read_column_data. Values
+    are str either way (integer columns of the store are converted).
+    
+    Args:
+        file_path: Path to the FK-Values text file
+        column_number: Column to extract (default: 1)
+        
+    Returns:
+        MappedPoolSampler over the .fkb store, or PoolSampler of the text values
+    """
+    store_path = foreign_key_store_path(file_path)
+    text_path = resolve_existing_path(file_path)
+    if os.path.exists(store_path) and (
+            not os.path.exists(text_path) or os.path.getmtime(store_path) >= os.path.getmtime(text_path)):
+        return MappedPoolSampler(store_path, column_number, as_text=True)
     
-    return result
\ No newline at end of file
+    return PoolSampler(read_column_data(file_path, column_number))
@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 import sys
 import os
-import random
 from datetime import timedelta
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from fake_data_generic import FakeGenericTable
-from read_columns_from_file import read_column_data
+from batch_providers import ChoiceProvider
+from numeric_providers import DigitStringProvider
+from read_columns_from_file import read_column_data, read_foreign_key_pool
+from fk_samplers import ZipfSampler, as_sampler
+from table_state import foreign_key_rows
+from temporal_providers import DATETIME_FORMAT, TemporalProvider
 
-def generate_data_dummy(auto_prefix:str = None, records:int = None):
+def generate_data_dummy(auto_prefix:str = None, records:int = None, card_skew:float = None, foreign_keys:dict = None,
+                        time_profile:str = 'uniform', from_state:bool = False):
     """
     Example of generating data for the TRANSACTIONS table.
     
@@ -25,6 +30,17 @@ def generate_data_dummy(auto_prefix:str = None, records:int = None):
         method_id INT NOT NULL
     );
 
+    Args:
+        auto_prefix: Prefix of the output files
+        records: Number of records generated per table (size of the SERIAL key ranges)
+        card_skew: Zipf exponent of the card_id draws (None for uniform)
+        foreign_keys: Foreign key pools to use instead of the FK-Values files
+                      (e.g. handed over in memory by the orchestrator)
+        time_profile: Arrival profile of transaction_date ('uniform', 'diurnal'
+                      or 'seasonal', see temporal_providers)
+        from_state: Size the SERIAL key ranges from the rows recorded in the
+                    table states instead (appends; records, then the ranges
+                    recorded in this table's state are the fallback)
     """
     # Define columns in order
     columns = [
@@ -63,40 +79,51 @@ def generate_data_dummy(auto_prefix:str = None, records:int = None):
     # Define faker providers for each column
     faker_providers = [
         # transaction id
-        lambda faker: f"TS-{faker.random_number(digits=25)}{random.choice(['AM','PM'])}",
+        DigitStringProvider(25, prefix='TS-', suffixes=['AM', 'PM']),
         # card_id
         'random_value',
-        # amount
-        lambda faker: faker.pydecimal(left_digits=13, right_digits=2, positive=True),
+        # amount - DECIMAL(15,2), see numeric_providers
+        'money',
         # currency
         'random_value',
         # transaction_date
-        lambda faker: faker.date_time_between(start_date='-2y', end_date='now').strftime('%Y-%m-%d %H:%M:%S'),
+        TemporalProvider(start_date='-2y', end_date='now', profile=time_profile, date_format=DATETIME_FORMAT),
         # channel
-        lambda faker: random.choice(CHANNEL),
+        ChoiceProvider(CHANNEL),
         # status
-        lambda faker: random.choice(TRANSACTION_STATUS),
+        ChoiceProvider(TRANSACTION_STATUS),
         # device type
-        lambda faker: random.choice(DEVICE_TYPES),
+        ChoiceProvider(DEVICE_TYPES),
         # location_id
         'random_value',
         # method_id
         'random_value'
     ]
     
-    # Add foreign keys
-    foreign_keys = {
-        
-        'card_id': read_column_data(
+    # Add foreign keys (pools handed in memory take precedence over the FK-Values files)
+    foreign_keys = dict(foreign_keys or {})
+    
+    # Card ids, optionally skewed so some cards get far more transactions
+    card_ids = foreign_keys.get('card_id')
+    if card_ids is None:
+        card_ids = read_foreign_key_pool(
             file_path = '../../../data/sql/FK-Values/FK-FINTECH-CREDIT_CARDS.txt',
-            column_number = 1),
-        'currency': read_column_data(
+            column_number = 1)
+    card_ids = as_sampler(card_ids)
+    if card_skew:
+        card_ids = ZipfSampler(card_ids, exponent=card_skew)
+    foreign_keys['card_id'] = card_ids
+    
+    if 'currency' not in foreign_keys:
+        foreign_keys['currency'] = read_column_data(
             file_path = '../../../data/sql/FK-Values/FK-FINTECH-COUNTRIES.txt',
-            column_number = 2),
-        'location_id': [id for id in range(1, (records + 1))],
-        'method_id': [id for id in range(1, (4 + 1))],
-        
-    }
+            column_number = 2)
+    if 'location_id' not in foreign_keys:
+        # SERIAL range of the merchant locations
+        locations = (foreign_key_rows('../../../data/sql', 'fintech', 'transactions', 'location_id',
+                                      'merchant_locations', records) if from_state else records)
+        foreign_keys['location_id'] = range(1, (locations + 1))
+    foreign_keys.setdefault('method_id', range(1, (4 + 1)))
     
     # Create the table
     data_table = FakeGenericTable(
@@ -106,7 +133,10 @@ def generate_data_dummy(auto_prefix:str = None, records:int = None):
         path_output='../../../data/sql',
         faker_providers=faker_providers,
         prefix=auto_prefix,
-        foreign_keys=foreign_keys
+        foreign_keys=foreign_keys,
+        unique_columns=['transaction_id'],
+        # Appended batches continue after the last transaction_date range
+        time_column='transaction_date'
     )
     
     return data_table
@@ -116,23 +146,78 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Generate fake data for the CLIENTS table')
-    parser.add_argument('--records', type=int, required=True, help='Number of records to generate')
+    parser.add_argument('--records', type=int, default=None,
+                       help='Number of records to generate (not needed with --append)')
+    parser.add_argument('--append', type=int, default=None, metavar='N',
+                       help='Append N rows after the recorded table state (delta SQL/COPY and FK-Values files)')
+    parser.add_argument('--save-state', action='store_true',
+                       help='Record the table state of a full run, so --append can continue it later')
+    parser.add_argument('--until', type=str, default='now',
+                       help="End of the appended transaction_date range: 'now' or an offset from the watermark (e.g. +1d)")
     parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility')
     parser.add_argument('--variability', type=float, default=0.3, 
                        help='Locale variability (0-1, where 0 = single locale, 1 = all locales)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes (output is identical for any value)')
+    parser.add_argument('--output-format', choices=['sql', 'parquet', 'arrow'], default='sql',
+                       help='Table data format: SQL INSERT file or typed columnar file (requires pyarrow)')
+    parser.add_argument('--compress', action='store_true',
+                       help='Write gzip-compressed SQL and FK-Values files (.sql.gz / .txt.gz)')
+    parser.add_argument('--dsn', type=str, default=None,
+                       help='PostgreSQL DSN: load the table with COPY instead of writing the SQL file (requires psycopg2)')
+    parser.add_argument('--card-skew', type=float, default=None,
+                       help='Zipf exponent for card_id (e.g. 1.1); uniform when omitted')
+    parser.add_argument('--time-profile', choices=['uniform', 'diurnal', 'seasonal'], default='uniform',
+                       help='Arrival profile of transaction_date (default: uniform)')
     parser.add_argument('--prefix', type=str, default='XX', 
                        help='prefix of file')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print the time spent generating each column, per locale')
+    parser.add_argument('--profile-json', type=str, default=None,
+                       help='Also write the column profile to this JSON file (implies --profile)')
     args = parser.parse_args()
+    if args.records is None and args.append is None:
+        parser.error('--records or --append is required')
     
     # Create table
-    dummy_table = generate_data_dummy(args.prefix, args.records)
+    try:
+        dummy_table = generate_data_dummy(args.prefix, args.records, args.card_skew, time_profile=args.time_profile,
+                                          from_state=args.append is not None)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    if args.save_state:
+        dummy_table.save_state = True
+    if args.profile or args.profile_json:
+        dummy_table.enable_profiling(args.profile_json)
     
-    # Generate fake data
-    records = dummy_table.generate_fake_data(
-        num_records=args.records,
-        seed=args.seed,
-        variability=args.variability
-    )
+    if args.append:
+        # Generate only the new rows, continuing the recorded table state
+        dummy_table.append_records(
+            args.append,
+            write_sql=args.output_format == 'sql',
+            columnar_format=None if args.output_format == 'sql' else args.output_format,
+            compress=args.compress,
+            workers=args.workers,
+            conn=args.dsn,
+            end_date=args.until
+        )
+    else:
+        # Generate fake data as a stream of chunks
+        chunks = dummy_table.iter_fake_data(
+            num_records=args.records,
+            seed=args.seed,
+            variability=args.variability,
+            workers=args.workers
+        )
     
-    # Export to SQL file
-    dummy_table.export_to_sql_file(records)
\ No newline at end of file
+        if args.dsn:
+            # Stream straight into PostgreSQL with COPY
+            dummy_table.load_to_postgres(args.dsn, chunks)
+        else:
+            # Export to SQL or columnar file
+            dummy_table.export_chunks(
+                chunks,
+                write_sql=args.output_format == 'sql',
+                columnar_format=None if args.output_format == 'sql' else args.output_format,
+                compress=args.compress
+            )
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-column profiling of FakeGenericTable.
+
+When a table is generated with profiling enabled, every filler call of
+_generate_chunk_columns (one per column, chunk and locale, see
+FakeGenericTable._compile_columns) is timed and recorded here with the
+number of values it produced. Timing a whole column slice instead of each
+cell keeps the overhead to two clock reads per call, so the report reflects
+the normal generation speed.
+
+The report ranks the columns by cumulative time, names their provider (the
+Faker methods called by a lambda included) and breaks the time down by
+locale, which points at the provider that needs a faster replacement.
+"""
+import builtins
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from batch_providers import is_batch_provider
+
+
+# Locale key of the columns filled once per chunk (foreign keys, locale independent providers)
+ALL_LOCALES = '*'
+
+
+def provider_label(provider_info: Union[str, Dict, Any], foreign_key: Optional[Any] = None) -> str:
+    """
+    Short description of a column provider for the profiling report.
+
+    Args:
+        provider_info: Provider specification (string, dict, function or batched)
+        foreign_key: Foreign key sampler of the column, if any
+
+    Returns:
+        e.g. 'pydecimal', 'random_element', 'lambda: random_number, choice',
+        'ValueBankProvider(first_name)', 'TemplateProvider({first_name|slug}...)'
+        or 'foreign key (PoolSampler)'
+    """
+    if foreign_key is not None:
+        return f"foreign key ({type(foreign_key).__name__})"
+    if isinstance(provider_info, str):
+        return provider_info
+    if isinstance(provider_info, dict):
+        return str(provider_info.get('method'))
+    if is_batch_provider(provider_info):
+        name = type(provider_info).__name__
+        inner = getattr(provider_info, 'provider', None) or getattr(provider_info, 'template', None)
+        return f"{name}({inner})" if isinstance(inner, str) else name
+    code = getattr(provider_info, '__code__', None)
+    if code is not None:
+        # Attribute and global names used by the function, e.g. faker.pydecimal -> pydecimal
+        names = [name for name in code.co_names if name != 'random' and not hasattr(builtins, name)]
+        kind = 'lambda' if provider_info.__name__ == '<lambda>' else provider_info.__name__
+        return f"{kind}: {', '.join(names)}" if names else kind
+    return type(provider_info).__name__
+
+
+class ColumnProfiler:
+    """
+    Cumulative time, filler calls and values per column and locale.
+
+    Args:
+        labels: Provider label of each column (see provider_label)
+        json_path: File the report is also written to by finish() (None to skip)
+    """
+
+    def __init__(self, labels: Dict[str, str], json_path: Optional[str] = None):
+        self.labels = dict(labels)
+        self.json_path = json_path
+        # (column, locale) -> [seconds, calls, values]
+        self._stats: Dict[tuple, List[float]] = {}
+
+    def record(self, column: str, locale: Optional[str], seconds: float, values: int) -> None:
+        """
+        Add one filler call.
+
+        Args:
+            column: Column name
+            locale: Locale of the Faker instance used (None for chunk-level columns)
+            seconds: Duration of the call
+            values: Number of values produced
+        """
+        stats = self._stats.get((column, locale or ALL_LOCALES))
+        if stats is None:
+            stats = self._stats[(column, locale or ALL_LOCALES)] = [0.0, 0, 0]
+        stats[0] += seconds
+        stats[1] += 1
+        stats[2] += values
+
+    def reset(self) -> None:
+        """Drop the recorded calls."""
+        self._stats.clear()
+
+    def snapshot(self) -> Dict[tuple, List[float]]:
+        """Picklable copy of the recorded calls (sent back by worker processes)."""
+        return {key: list(stats) for key, stats in self._stats.items()}
+
+    def merge(self, snapshot: Dict[tuple, List[float]]) -> None:
+        """Add the calls of a snapshot taken in another process."""
+        for key, (seconds, calls, values) in snapshot.items():
+            stats = self._stats.setdefault(key, [0.0, 0, 0])
+            stats[0] += seconds
+            stats[1] += calls
+            stats[2] += values
+
+    def columns(self) -> List[Dict[str, Any]]:
+        """
+        Profile of every column, slowest first.
+
+        Returns:
+            One entry per column with its provider, seconds, filler calls,
+            values, microseconds per value, share of the total time and the
+            per-locale breakdown (most time first)
+        """
+        per_column: Dict[str, Dict[str, Any]] = {}
+        for (column, locale), (seconds, calls, values) in self._stats.items():
+            entry = per_column.setdefault(column, {
+                'column': column,
+                'provider': self.labels.get(column, '?'),
+                'seconds': 0.0,
+                'calls': 0,
+                'values': 0,
+                'locales': [],
+            })
+            entry['seconds'] += seconds
+            entry['calls'] += calls
+            entry['values'] += values
+            entry['locales'].append({
+                'locale': locale,
+                'seconds': seconds,
+                'values': values,
+                'us_per_value': seconds / values * 1e6 if values else 0.0,
+            })
+
+        total = sum(entry['seconds'] for entry in per_column.values())
+        ranked = sorted(per_column.values(), key=lambda entry: entry['seconds'], reverse=True)
+        for entry in ranked:
+            entry['us_per_value'] = entry['seconds'] / entry['values'] * 1e6 if entry['values'] else 0.0
+            entry['share'] = entry['seconds'] / total if total else 0.0
+            entry['locales'].sort(key=lambda locale: locale['seconds'], reverse=True)
+        return ranked
+
+    def report(self, top_locales: int = 3) -> str:
+        """
+        Ranked hot-column report.
+
+        Args:
+            top_locales: Locales listed under each column (most time first)
+
+        Returns:
+            Multi-line text report
+        """
+        ranked = self.columns()
+        total = sum(entry['seconds'] for entry in ranked)
+        lines = [f"⏱️ Column profile ({total:.2f}s in column fillers):",
+                 f"  {'column':<20} {'provider':<36} {'seconds':>8} {'share':>6} {'values':>10} {'µs/value':>9}"]
+        for entry in ranked:
+            lines.append(f"  {entry['column']:<20} {entry['provider'][:36]:<36} {entry['seconds']:8.3f} "
+                         f"{entry['share']:6.1%} {entry['values']:>10} {entry['us_per_value']:9.2f}")
+            if len(entry['locales']) > 1:
+                slowest = ', '.join(f"{locale['locale']} {locale['us_per_value']:.1f}µs"
+                                    for locale in entry['locales'][:top_locales])
+                lines.append(f"  {'':<20} top locales: {slowest}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        columns = self.columns()
+        return {'total_seconds': sum(entry['seconds'] for entry in columns), 'columns': columns}
+
+    def save_json(self, file_path: str) -> None:
+        """Write the ranked profile as JSON."""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def finish(self) -> None:
+        """Print the report and write the JSON file, if configured."""
+        print(self.report())
+        if self.json_path:
+            self.save_json(self.json_path)
+            print(f"Column profile written to {self.json_path}")
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Columnar (Parquet / Arrow IPC) export of generated data.
+
+Generated records are written once as typed columns and every load format
+(INSERT statements, PostgreSQL COPY text, CSV) is derived from them later in
+a single streaming pass, without re-parsing SQL text.
+
+Requires pyarrow (pip install pyarrow); it is imported lazily so the rest of
+the pipeline keeps working without it.
+"""
+import argparse
+import csv
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional
+
+from sql_writer import ColumnFormatter, SQLInsertWriter, copy_text
+
+
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Key of the schema metadata holding the fully qualified table name
+TABLE_METADATA_KEY = b'fake_data.table'
+
+# Rows buffered before the schema is fixed while a column has only None values
+SCHEMA_SAMPLE_ROWS = 100_000
+
+
+def _import_pyarrow():
+    """Import pyarrow, failing with an actionable message when missing."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Columnar export requires pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def _infer_arrow_type(values: List[Any]):
+    """
+    Pick the Arrow type of a column from its first values.
+
+    Args:
+        values: Values of the column in the first chunks
+
+    Returns:
+        pyarrow DataType, or None if every value is None
+    """
+    pa = _import_pyarrow()
+    sample = next((value for value in values if value is not None), None)
+
+    if sample is None:
+        return None
+    if isinstance(sample, bool):
+        return pa.bool_()
+    if isinstance(sample, int):
+        return pa.int64()
+    if isinstance(sample, float):
+        return pa.float64()
+    if isinstance(sample, Decimal):
+        # Keep the largest scale seen so no value of the sample is rounded
+        scale = max(-value.as_tuple().exponent for value in values if isinstance(value, Decimal))
+        return pa.decimal128(38, max(scale, 0))
+    if isinstance(sample, datetime):
+        return pa.timestamp('s')
+    if isinstance(sample, date):
+        return pa.date32()
+    return pa.string()
+
+
+def _declared_arrow_type(column_type: Any):
+    """Arrow type of a column declared as a Python type or a pyarrow DataType (None if unknown)."""
+    pa = _import_pyarrow()
+    if isinstance(column_type, pa.DataType):
+        return column_type
+    python_types = {bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string(),
+                    datetime: pa.timestamp('s'), date: pa.date32()}
+    return python_types.get(column_type)
+
+
+def provider_arrow_types(columns: List[str], providers: List[Any]) -> Dict[str, Any]:
+    """
+    Arrow types fixed by the column providers, e.g. DECIMAL(15,2) for a MoneyProvider.
+
+    Args:
+        columns: Column names
+        providers: Provider of each column
+
+    Returns:
+        Arrow type by column, for the providers that declare a precision and scale
+    """
+    pa = _import_pyarrow()
+    return {
+        column: pa.decimal128(provider.precision, provider.scale)
+        for column, provider in zip(columns, providers)
+        if isinstance(getattr(provider, 'precision', None), int) and isinstance(getattr(provider, 'scale', None), int)
+    }
+
+
+class ColumnarWriter:
+    """
+    Incremental writer of record chunks to a Parquet or Arrow IPC file.
+
+    Each column keeps a single type for the whole file: the declared type
+    when given (column_types), otherwise the type inferred from the first
+    chunk. Chunks are buffered (up to SCHEMA_SAMPLE_ROWS rows) while a
+    column without a declared type has only None values, and a later value
+    that does not fit the type (e.g. a Decimal with more decimal places)
+    raises a ValueError naming the column instead of being rounded.
+
+    Args:
+        file_path: Path of the file to write
+        full_table_name: Table name stored in the schema metadata
+        columns: Column names, in order
+        file_format: 'parquet' or 'arrow'
+        column_types: Declared type of some columns: a Python type (int,
+                      str, date, ...) or a pyarrow DataType (e.g.
+                      pa.decimal128(15, 2), see provider_arrow_types)
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 full_table_name: str,
+                 columns: List[str],
+                 file_format: str = 'parquet',
+                 column_types: Optional[Dict[str, Any]] = None):
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {file_format} (expected one of {list(COLUMNAR_FORMATS)})")
+        self.pa = _import_pyarrow()
+        self.file_path = file_path
+        self.full_table_name = full_table_name
+        self.columns = columns
+        self.file_format = file_format
+        self.declared_types = {
+            column: _declared_arrow_type(column_type) for column, column_type in (column_types or {}).items()
+        }
+        self.schema = None
+        self._writer = None
+        self._sink = None
+        # Chunks waiting for the schema
+        self._pending: List[List[Dict[str, Any]]] = []
+        self._chunks_written = 0
+
+    def _infer_types(self, final: bool) -> Optional[List[Any]]:
+        """Types of the columns from the buffered chunks, or None while one is still unknown."""
+        types = []
+        for column in self.columns:
+            column_type = self.declared_types.get(column)
+            if column_type is None:
+                column_type = _infer_arrow_type([record[column] for chunk in self._pending for record in chunk])
+            if column_type is None:
+                if not final:
+                    return None
+                # Only None values: nullable text
+                column_type = self.pa.string()
+            types.append(column_type)
+        return types
+
+    def _open(self, types: List[Any]) -> None:
+        pa = self.pa
+        fields = [pa.field(column, column_type) for column, column_type in zip(self.columns, types)]
+        self.schema = pa.schema(fields, metadata={TABLE_METADATA_KEY: self.full_table_name.encode('utf-8')})
+        if self.file_format == 'parquet':
+            self._writer = pa.parquet.ParquetWriter(self.file_path, self.schema, compression='zstd')
+        else:
+            self._sink = pa.OSFile(self.file_path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def write_chunk(self, chunk: List[Dict[str, Any]]) -> None:
+        """Append a chunk of records as one record batch / row group."""
+        if not chunk:
+            return
+        if self._writer is None:
+            self._pending.append(chunk)
+            pending_rows = sum(len(pending) for pending in self._pending)
+            types = self._infer_types(final=pending_rows >= SCHEMA_SAMPLE_ROWS)
+            if types is not None:
+                self._open(types)
+                self._flush_pending()
+            return
+        self._write(chunk)
+
+    def _flush_pending(self) -> None:
+        pending, self._pending = self._pending, []
+        for chunk in pending:
+            self._write(chunk)
+
+    def _write(self, chunk: List[Dict[str, Any]]) -> None:
+        pa = self.pa
+        arrays = []
+        for field in self.schema:
+            try:
+                arrays.append(pa.array([record[field.name] for record in chunk], type=field.type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValueError(
+                    f"Column '{field.name}' of chunk {self._chunks_written + 1} does not fit its type {field.type} "
+                    f"in {self.file_path} (declare it with column_types): {e}"
+                ) from e
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self._chunks_written += 1
+
+    def close(self) -> None:
+        if self._writer is None and self._pending:
+            self._open(self._infer_types(final=True))
+            self._flush_pending()
+        if self._writer is not None:
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def _stored_batches(file_path: str, batch_size: int) -> Iterator[Any]:
+    """Record batches as read from the file (row groups / IPC batches of the export chunks)."""
+    pa = _import_pyarrow()
+    if file_path.endswith(COLUMNAR_FORMATS['parquet']):
+        yield from pa.parquet.ParquetFile(file_path).iter_batches(batch_size=batch_size)
+    else:
+        with pa.OSFile(file_path, 'rb') as source:
+            reader = pa.ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                yield reader.get_batch(index)
+
+
+def iter_columnar_batches(file_path: str, batch_size: int = 10_000) -> Iterator[Any]:
+    """
+    Stream the rows of a Parquet or Arrow IPC file in batches of batch_size rows.
+
+    The stored batches follow the chunk size of the export, so they are
+    sliced and joined again: every batch has exactly batch_size rows except
+    the last one.
+
+    Args:
+        file_path: Path of a .parquet or .arrow file
+        batch_size: Rows per batch
+
+    Yields:
+        pyarrow RecordBatch objects
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    pa = _import_pyarrow()
+    pending, pending_rows = [], 0
+    for batch in _stored_batches(file_path, batch_size):
+        while batch.num_rows:
+            take = min(batch_size - pending_rows, batch.num_rows)
+            pending.append(batch.slice(0, take))
+            pending_rows += take
+            batch = batch.slice(take)
+            if pending_rows == batch_size:
+                yield pending[0] if len(pending) == 1 else pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+                pending, pending_rows = [], 0
+    if pending:
+        yield pending[0] if len(pending) == 1 else pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+
+
+def read_columnar_schema(file_path: str) -> Any:
+    """Arrow schema of a Parquet or Arrow IPC file, read without loading any data."""
+    pa = _import_pyarrow()
+    if file_path.endswith(COLUMNAR_FORMATS['parquet']):
+        return pa.parquet.read_schema(file_path)
+    with pa.OSFile(file_path, 'rb') as source:
+        return pa.ipc.open_file(source).schema
+
+
+def read_columnar_table_name(file_path: str) -> Optional[str]:
+    """Fully qualified table name stored in the file schema, if any."""
+    metadata = read_columnar_schema(file_path).metadata or {}
+    table_name = metadata.get(TABLE_METADATA_KEY)
+    return table_name.decode('utf-8') if table_name else None
+
+
+def _python_types(schema) -> Dict[str, type]:
+    """Python type of the values of each column, used to pick its SQL formatter."""
+    pa = _import_pyarrow()
+    checks = [
+        (pa.types.is_boolean, bool),
+        (pa.types.is_integer, int),
+        (pa.types.is_floating, float),
+        (pa.types.is_decimal, Decimal),
+        (pa.types.is_timestamp, datetime),
+        (pa.types.is_date, date),
+        (pa.types.is_string, str),
+    ]
+    types = {}
+    for field in schema:
+        for check, python_type in checks:
+            if check(field.type):
+                types[field.name] = python_type
+                break
+    return types
+
+
+def iter_sql_value_rows(file_path: str, batch_size: int = 10_000) -> Iterator[List[str]]:
+    """
+    Stream the rows of a columnar file as SQL VALUES tuples (without parentheses).
+
+    Args:
+        file_path: Path of a .parquet or .arrow file
+        batch_size: Maximum rows per yielded list
+
+    Yields:
+        Lists of strings like "'CL-1', 'Ana', NULL"
+    """
+    types = _python_types(read_columnar_schema(file_path))
+    formatters = None
+    for batch in iter_columnar_batches(file_path, batch_size):
+        if formatters is None:
+            formatters = [ColumnFormatter(types.get(name)) for name in batch.schema.names]
+        columns = [formatter(column.to_pylist()) for formatter, column in zip(formatters, batch.columns)]
+        yield list(map(', '.join, zip(*columns)))
+
+
+def convert_columnar_file(file_path: str,
+                          output_path: str,
+                          output_format: str = 'insert',
+                          batch_size: int = 10_000,
+                          table_name: Optional[str] = None) -> int:
+    """
+    Derive an INSERT, COPY or CSV file from a columnar file in one streaming pass.
+
+    Args:
+        file_path: Path of the .parquet or .arrow source
+        output_path: Path of the file to write
+        output_format: 'insert' (one INSERT per batch), 'copy' (psql COPY ... FROM stdin
+                       script) or 'csv' (with header)
+        batch_size: Rows per INSERT statement / read batch
+        table_name: Fully qualified table name (defaults to the one stored in the file)
+
+    Returns:
+        Number of rows written
+    """
+    if output_format not in ('insert', 'copy', 'csv'):
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    table_name = table_name or read_columnar_table_name(file_path)
+    if output_format != 'csv' and not table_name:
+        raise ValueError(f"No table name stored in {file_path}, pass table_name")
+
+    total = 0
+    with open(output_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as out:
+        csv_writer = csv.writer(out) if output_format == 'csv' else None
+        sql_writer = None
+
+        for batch in iter_columnar_batches(file_path, batch_size):
+            columns = batch.schema.names
+            values = [column.to_pylist() for column in batch.columns]
+
+            if output_format == 'insert':
+                if sql_writer is None:
+                    sql_writer = SQLInsertWriter(out, table_name, columns, batch_size, _python_types(batch.schema))
+                sql_writer.write_columns(values)
+            elif output_format == 'copy':
+                if not total:
+                    out.write(f"COPY {table_name} ({', '.join(columns)}) FROM stdin;\n")
+                out.write(copy_text(values))
+            else:
+                if not total:
+                    csv_writer.writerow(columns)
+                csv_writer.writerows(
+                    ['' if value is None else value for value in row] for row in zip(*values)
+                )
+
+            total += batch.num_rows
+
+        if output_format == 'copy' and total:
+            out.write('\\.\n')
+
+    print(f"Converted {total} rows from {file_path} to {os.path.abspath(output_path)}")
+    return total
+
+
+def main():
+    """Convert a Parquet/Arrow file produced by FakeGenericTable to INSERT, COPY or CSV."""
+    parser = argparse.ArgumentParser(description='Derive INSERT/COPY/CSV files from columnar fake data')
+    parser.add_argument('input', help='Path of the .parquet or .arrow file')
+    parser.add_argument('output', help='Path of the file to write')
+    parser.add_argument('--format', choices=['insert', 'copy', 'csv'], default='insert',
+                        help='Output format (default: insert)')
+    parser.add_argument('--batch-size', type=int, default=10_000,
+                        help='Rows per INSERT statement (default: 10000)')
+    parser.add_argument('--table', default=None,
+                        help='Fully qualified table name (default: stored in the file)')
+    args = parser.parse_args()
+
+    convert_columnar_file(args.input, args.output, args.format, args.batch_size, args.table)
+
+
+if __name__ == "__main__":
+    main()
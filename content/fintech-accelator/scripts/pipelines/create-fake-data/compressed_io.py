@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Transparent gzip support for the generated SQL and FK-Values files.
+
+Compression is detected from the extension: a path ending in ``.gz`` is read
+and written through gzip in streaming text mode, any other path is a plain
+file. Readers looking for ``file.txt`` also accept ``file.txt.gz`` so the
+consumers of a table do not depend on how it was exported.
+"""
+import gzip
+import os
+from typing import IO, Union
+
+
+GZIP_EXTENSION = '.gz'
+
+# Level 6 compresses repetitive SQL almost as well as 9 at a fraction of the time
+GZIP_LEVEL = 6
+
+
+def is_gzip_path(file_path: Union[str, os.PathLike]) -> bool:
+    """Check whether a path designates a gzip-compressed file."""
+    return os.fspath(file_path).endswith(GZIP_EXTENSION)
+
+
+def with_gzip_extension(file_path: str, compress: bool) -> str:
+    """Add or keep the .gz extension of a path when compression is requested."""
+    if compress and not is_gzip_path(file_path):
+        return file_path + GZIP_EXTENSION
+    return file_path
+
+
+def resolve_existing_path(file_path: Union[str, os.PathLike]) -> str:
+    """
+    Return the existing variant of a path: as given, or with/without .gz.
+
+    Args:
+        file_path: Path of the plain or compressed file
+
+    Returns:
+        The variant that exists (the most recently written one if both
+        do), or the path as given if none exists
+    """
+    path = os.fspath(file_path)
+    sibling = path[:-len(GZIP_EXTENSION)] if is_gzip_path(path) else path + GZIP_EXTENSION
+    if not os.path.exists(sibling):
+        return path
+    if not os.path.exists(path) or os.path.getmtime(sibling) > os.path.getmtime(path):
+        return sibling
+    return path
+
+
+def open_text(file_path: Union[str, os.PathLike],
+              mode: str = 'r',
+              encoding: str = 'utf-8',
+              buffering: int = -1) -> IO[str]:
+    """
+    Open a text file, through gzip when its name ends in .gz.
+
+    Args:
+        file_path: Path of the file
+        mode: 'r', 'w' or 'a'
+        encoding: Text encoding
+        buffering: Buffer size of plain files (gzip files use their own buffering)
+
+    Returns:
+        Text file object, to be used as a context manager
+    """
+    if is_gzip_path(file_path):
+        return gzip.open(file_path, mode + 't', compresslevel=GZIP_LEVEL, encoding=encoding)
+    return open(file_path, mode, encoding=encoding, buffering=buffering)
@@ -1,19 +1,9 @@
 import os
-import time
 import logging
-from tqdm import tqdm
 import argparse
-from datetime import datetime
 
-# Fixed list of scripts to execute
-SCRIPT_LIST = [
-    'clients_fake_fintech.py',
-    'issuers_fake_fintech.py',
-    'franchises_fake_fintech.py',
-    'merchant_locations_fake_fintech.py',
-    'credit_cards_fake_fintech.py',
-    'transactions_fake_fintech.py'
-]
+from orchestrator import FINTECH_TABLES, run_pipeline
+from scale_planner import load_costs, parse_scale_factor, plan_scale_factor
 
 def setup_logging():
     """Configure the logging format to match your example"""
@@ -49,68 +39,108 @@ def check_virtual_environment():
         return False
     return True
 
-def execute_scripts(records, variability, start_prefix=3):
-    """Execute all scripts sequentially with proper logging"""
+def execute_scripts(records, variability, start_prefix=3, workers=1, output_format='sql', compress=False,
+                    parallel=None, seed=42, chunk_size=10_000, scale_factor=None, memory_budget=None,
+                    costs=None, plan_only=False, save_state=False):
+    """Generate all tables in one process, following their foreign key dependencies"""
     logger = setup_logging()
     
+    if scale_factor is not None:
+        # Row counts of every table, chunk size, workers and parallel tables from the planner
+        plan = plan_scale_factor(
+            scale_factor,
+            memory_budget=int(memory_budget * 1024 ** 3) if memory_budget else None,
+            costs=load_costs(costs, variability) if costs else None,
+        )
+        for line in plan.report().splitlines():
+            logger.info(line)
+        if not plan.fits:
+            logger.error("No settings fit the memory budget; raise --memory_budget or lower the scale factor")
+            return
+        if plan_only:
+            return
+        records, chunk_size, workers, parallel = plan.rows, plan.chunk_size, plan.workers, plan.parallel
+    
     if not check_virtual_environment():
         return
     
-    logger.info(f"Starting execution of {len(SCRIPT_LIST)} scripts")
-    logger.info(f"Parameters - records: {records}, variability: {variability}, start_prefix: {start_prefix}")
+    logger.info(f"Starting generation of {len(FINTECH_TABLES)} tables")
+    logger.info(f"Parameters - records: {records}, variability: {variability}, start_prefix: {start_prefix}, workers: {workers}, chunk_size: {chunk_size}, output_format: {output_format}, compress: {compress}, parallel: {parallel}, seed: {seed}, save_state: {save_state}")
     
     try:
-        with tqdm(total=len(SCRIPT_LIST), desc="Processing scripts") as pbar:
-            for i, script_name in enumerate(SCRIPT_LIST):
-                current_prefix = start_prefix + i
-                prefix = f"{current_prefix:02d}"
-                
-                cmd = (
-                    f"python .\\class\\{script_name} "
-                    f"--records {records} "
-                    f"--variability {variability} "
-                    f"--prefix {prefix}"
-                )
-                
-                logger.info(f"Executing script: {script_name}")
-                logger.info(f"Using prefix: {prefix}")
-                logger.debug(f"Full command: {cmd}")
-                
-                start_time = time.time()
-                exit_code = os.system(cmd)
-                execution_time = time.time() - start_time
-                
-                if exit_code != 0:
-                    logger.error(f"Script failed with exit code: {exit_code}")
-                    logger.error(f"Execution time: {execution_time:.2f}s")
-                    break
-                
-                logger.info(f"Successfully executed: {script_name}")
-                logger.info(f"Execution time: {execution_time:.2f}s")
-                pbar.update(1)
-                
-                if i < len(SCRIPT_LIST) - 1:
-                    time.sleep(1)
-        
-        logger.info("All scripts executed successfully")
+        run_pipeline(
+            records=records,
+            variability=variability,
+            start_prefix=start_prefix,
+            seed=seed,
+            workers=workers,
+            chunk_size=chunk_size,
+            parallel=parallel,
+            output_format=output_format,
+            compress=compress,
+            save_state=save_state,
+            logger=logger
+        )
+        logger.info("All tables generated successfully")
     
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}", exc_info=True)
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Execute fintech scripts sequentially')
+    parser = argparse.ArgumentParser(description='Generate all fintech tables, in parallel where dependencies allow')
     parser.add_argument('--records', type=int, default=10,
                       help='Number of records to generate (default: 10)')
     parser.add_argument('--variability', type=float, default=0.25,
                       help='Variability parameter (default: 0.25)')
     parser.add_argument('--start_prefix', type=int, default=3,
                       help='Starting prefix number (default: 3)')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Worker processes per table (default: 1)')
+    parser.add_argument('--parallel', type=int, default=None,
+                      help='Tables generated at the same time (default: CPU count, 1 = sequential)')
+    parser.add_argument('--seed', type=int, default=42,
+                      help='Random seed for reproducibility (default: 42)')
+    parser.add_argument('--output_format', choices=['sql', 'parquet', 'arrow'], default='sql',
+                      help='Table data format (default: sql)')
+    parser.add_argument('--compress', action='store_true',
+                      help='Write gzip-compressed SQL and FK-Values files')
+    parser.add_argument('--chunk_size', type=int, default=10_000,
+                      help='Records per generated chunk (default: 10000)')
+    parser.add_argument('--scale_factor', type=str, default=None,
+                      help='Scale factor (SF1, SF10, SF100 or a number): row counts of every table, and chunk size, '
+                           'workers and parallel tables chosen to fit --memory_budget (overrides --records)')
+    parser.add_argument('--memory_budget', type=float, default=None,
+                      help='Memory budget in GB of a scale factor run (default: 75%% of the host RAM)')
+    parser.add_argument('--costs', type=str, default=None,
+                      help='benchmark_generator.py results file used to plan the scale factor run')
+    parser.add_argument('--plan_only', action='store_true',
+                      help='Print the scale factor plan without generating anything')
+    parser.add_argument('--save_state', action='store_true',
+                      help='Record the state of every table so the entity scripts can --append to it later')
     
     args = parser.parse_args()
+    if args.scale_factor is not None:
+        try:
+            parse_scale_factor(args.scale_factor)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.plan_only:
+        parser.error('--plan_only requires --scale_factor')
     
     logger = setup_logging()
     execute_scripts(
         records=args.records,
         variability=args.variability,
-        start_prefix=args.start_prefix
+        start_prefix=args.start_prefix,
+        workers=args.workers,
+        output_format=args.output_format,
+        compress=args.compress,
+        parallel=args.parallel,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        scale_factor=args.scale_factor,
+        memory_budget=args.memory_budget,
+        costs=args.costs,
+        plan_only=args.plan_only,
+        save_state=args.save_state
     )
\ No newline at end of file
@@ -1,14 +1,233 @@
 #!/usr/bin/env python3
 import argparse
+import hashlib
+import io
 import math
+import multiprocessing
 import random
 import re
 import os
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, Tuple, Callable
+import shutil
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
+from time import perf_counter
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Iterable, Iterator, Sequence, TextIO
 
 from faker import Faker
 
+from batch_providers import is_batch_provider
+from column_profiler import ColumnProfiler, provider_label
+from compressed_io import open_text, resolve_existing_path, with_gzip_extension
+from fk_samplers import ForeignKeySampler, as_sampler
+from fk_store import ForeignKeyStoreWriter, concat_foreign_key_stores, foreign_key_store_path
+from numeric_providers import resolve_numeric_provider
+from sql_writer import CopyStream, SQLInsertWriter, copy_text, format_sql_value
+from table_state import TableState, delta_suffix, fingerprint_file_path, state_file_path
+from template_providers import resolve_template_provider
+from temporal_providers import TemporalProvider
+from unique_tracking import UniqueValueTracker
+from value_banks import BANKABLE_PROVIDERS, ValueBankProvider
+
+
+def _derive_seed(seed: int, *keys: Any) -> int:
+    """
+    Derive a 64-bit seed from a base seed and a set of keys.
+    
+    Uses blake2b instead of hash() so the value is the same in every process.
+    
+    Args:
+        seed: Base seed
+        keys: Extra values identifying the random stream (e.g. shard number)
+        
+    Returns:
+        Derived seed
+    """
+    material = '|'.join(str(part) for part in (seed,) + keys).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), 'big')
+
+
+class FakerCache:
+    """
+    Process-wide, bounded cache of Faker instances per locale.
+    
+    A locale is only loaded the first time a record uses it, and the instance
+    is then shared by every FakeGenericTable of the process. Cached instances
+    keep using Faker's shared random generator (seed_instance is never called
+    on them), so Faker.seed() reseeds all of them at once and sharing them
+    between tables does not change the generated values.
+    
+    The column fillers each table compiles for an instance are stored with
+    it, so evicting a locale frees the instance and its fillers together.
+    """
+    
+    def __init__(self, max_size: int = 32):
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.max_size = max_size
+        # Locale -> (instance, compiled fillers by table)
+        self._instances: "OrderedDict[str, Tuple[Faker, weakref.WeakKeyDictionary]]" = OrderedDict()
+    
+    def get(self, locale: str) -> Faker:
+        """
+        Return the Faker instance of a locale, creating it on first use.
+        
+        Args:
+            locale: Locale code (e.g., 'en_US')
+            
+        Returns:
+            Cached Faker instance configured with the locale
+        """
+        entry = self._instances.get(locale)
+        if entry is None:
+            entry = (Faker(locale), weakref.WeakKeyDictionary())
+            self._instances[locale] = entry
+            # Evict the least recently used locale when the cache is full
+            if len(self._instances) > self.max_size:
+                self._instances.popitem(last=False)
+        else:
+            self._instances.move_to_end(locale)
+        return entry[0]
+    
+    def compiled_fillers(self, faker: Faker) -> Optional["weakref.WeakKeyDictionary"]:
+        """
+        Compiled column fillers of a cached instance, by table.
+        
+        Args:
+            faker: Faker instance returned by get
+            
+        Returns:
+            Mapping from table to its fillers bound to the instance (entries
+            go away with the table), or None if the instance is not cached
+            anymore
+        """
+        entry = self._instances.get(faker.locales[0]) if len(faker.locales) == 1 else None
+        if entry is None or entry[0] is not faker:
+            return None
+        return entry[1]
+    
+    def discard_compiled(self, table: Any) -> None:
+        """Drop the fillers compiled by a table for every cached instance."""
+        for _, compiled in self._instances.values():
+            compiled.pop(table, None)
+    
+    def clear(self) -> None:
+        """Drop every cached instance."""
+        self._instances.clear()
+    
+    def __len__(self) -> int:
+        return len(self._instances)
+
+
+# Shared by all tables of the process (and inherited by forked workers)
+FAKER_CACHE = FakerCache(max_size=32)
+
+# Write buffer of the SQL files (statements are streamed, never joined in memory)
+SQL_WRITE_BUFFER = 1 << 20
+
+# Size of the blocks psycopg2 pulls from a CopyStream during COPY ... FROM STDIN
+COPY_READ_SIZE = 1 << 16
+
+# Foreign key outputs: FK-Values text file, memory-mapped .fkb store (see fk_store) or both
+FK_FORMATS = ('text', 'binary', 'both')
+
+
+# Generation state inherited by forked worker processes (see _generate_shard)
+_SHARD_CONTEXT: Optional[Tuple[Any, ...]] = None
+
+
+def _generate_shard(shard_index: int) -> Tuple[List[str], List[List[Any]], Optional[Dict]]:
+    """Worker entry point: generate the columns of one shard from the inherited context."""
+    table, locales, num_records, chunk_size, seed, start_row, batch = _SHARD_CONTEXT
+    if table.profiler:
+        table.profiler.reset()
+    row_locales, columns = table._generate_shard_columns(locales, shard_index, num_records, chunk_size, seed,
+                                                         start_row=start_row, batch=batch)
+    # The column profile of the shard goes back to the parent with its values
+    return row_locales, columns, table.profiler.snapshot() if table.profiler else None
+
+
+class _ForeignKeysOutput:
+    """
+    FK-Values text file and/or binary .fkb store of a table, written chunk by chunk.
+    
+    Both are opened on the first chunk, after checking that the exported
+    columns exist in the records. Delta files of an appended batch are also
+    added to the cumulative files of the table once complete.
+    """
+    
+    def __init__(self,
+                 text_path: Optional[str],
+                 store_path: Optional[str],
+                 columns_export: List[str],
+                 cumulative_text_path: Optional[str] = None,
+                 cumulative_store_path: Optional[str] = None):
+        self.text_path = text_path
+        self.store_path = store_path
+        self.columns_export = columns_export
+        self.cumulative_text_path = cumulative_text_path
+        self.cumulative_store_path = cumulative_store_path
+        self._text_file: Optional[TextIO] = None
+        self._store: Optional[ForeignKeyStoreWriter] = None
+        self._opened = False
+    
+    @property
+    def paths(self) -> List[str]:
+        return [path for path in (self.text_path, self.store_path) if path]
+    
+    def write_chunk(self, chunk: List[Dict[str, Any]]) -> None:
+        if not self._opened:
+            # Verify columns exist
+            for col in self.columns_export:
+                if col not in chunk[0]:
+                    raise KeyError(f"Column '{col}' not found in records")
+            if self.text_path:
+                self._text_file = open_text(self.text_path, 'w')
+                self._text_file.write("|".join(self.columns_export))
+            if self.store_path:
+                self._store = ForeignKeyStoreWriter(self.store_path, self.columns_export)
+            self._opened = True
+        
+        if self._text_file:
+            self._text_file.write("\n")
+            self._text_file.write("\n".join(
+                "|".join(str(record[col]) for col in self.columns_export)
+                for record in chunk
+            ))
+        if self._store:
+            self._store.write_records(chunk)
+    
+    def close(self, complete: bool = True) -> None:
+        """Close the outputs; an incomplete binary store is discarded instead of written."""
+        if self._text_file:
+            self._text_file.close()
+        if self._store:
+            if complete:
+                self._store.close()
+            else:
+                self._store.abort()
+        if complete and self._opened:
+            self._merge_into_cumulative()
+    
+    def _merge_into_cumulative(self) -> None:
+        """Add the rows of the delta files to the cumulative FK-Values file and .fkb store."""
+        if self.text_path and self.cumulative_text_path:
+            target = resolve_existing_path(self.cumulative_text_path)
+            if not os.path.exists(target):
+                shutil.copyfile(self.text_path, target)
+            else:
+                with open_text(self.text_path) as delta, open_text(target, 'a') as cumulative:
+                    delta.readline()  # Header
+                    cumulative.write("\n")
+                    shutil.copyfileobj(delta, cumulative)
+        if self.store_path and self.cumulative_store_path:
+            if not os.path.exists(self.cumulative_store_path):
+                shutil.copyfile(self.store_path, self.cumulative_store_path)
+            else:
+                concat_foreign_key_stores(self.cumulative_store_path, [self.cumulative_store_path, self.store_path])
+
 
 class FakeGenericTable:
     """
@@ -35,7 +254,13 @@ class FakeGenericTable:
                  faker_providers: List[Union[str, Dict, Callable]],
                  path_output: str = None,
                  prefix: str = None,
-                 foreign_keys: Optional[Dict[str, List[Any]]] = None):
+                 foreign_keys: Optional[Dict[str, Union[List[Any], range, ForeignKeySampler]]] = None,
+                 value_banks: Union[bool, List[str]] = False,
+                 unique_columns: Optional[List[str]] = None,
+                 column_types: Optional[Dict[str, type]] = None,
+                 time_column: Optional[str] = None,
+                 save_state: bool = False,
+                 profile_columns: bool = False):
         """
         Initialize the generic table object.
         
@@ -48,22 +273,132 @@ class FakeGenericTable:
                             - String: name of a Faker method (e.g., 'name', 'email')
                             - Dict: {'method': 'random_element', 'elements': ['a', 'b', 'c']}
                             - Function: lambda faker: f"PREFIX-{faker.random_number()}"
-            foreign_keys: Dictionary mapping foreign key columns to lists of valid values
-                          e.g., {'country_id': [1, 2, 3]}
+                            - Batched provider: object with a batch(faker, rows) method
+                              (see batch_providers.py), filled a whole chunk at a time
+                            - Numeric provider name, as a string or dict 'method'
+                              (e.g. 'money', 'geo_latitude', see numeric_providers.py)
+                            - Template: "{first_name|slug}{digits:5}@example.com", or
+                              {'method': 'template', 'template': ..., 'choices': {...}}
+                              (see template_providers.py)
+            foreign_keys: Dictionary mapping foreign key columns to their valid values
+                          e.g., {'country_id': [1, 2, 3]}. Values can be a list
+                          (array-backed PoolSampler), a range (lazy RangeSampler)
+                          or any sampler from fk_samplers.py (e.g. ZipfSampler)
+            value_banks: Draw string providers from pre-sampled value banks
+                         (see value_banks.py). True enables it for every
+                         provider in BANKABLE_PROVIDERS, a list enables it for
+                         the given columns only
+            unique_columns: Columns whose values must be unique (e.g. primary
+                            keys built from random digits). Duplicates are
+                            detected with a compact fingerprint table and only
+                            the colliding cells are regenerated
+            column_types: Python type of the values of some columns (e.g.
+                          {'amount': Decimal}) used to pick their SQL formatter.
+                          Other columns use the type of their first non-null value
+            time_column: Column whose TemporalProvider range is tracked in the
+                         table state: appended batches (see append_records)
+                         continue right after the last generated range
+            save_state: Record full exports in the table state file (and the
+                        fingerprints of the unique columns), so rows can be
+                        appended later with append_records. Appended batches
+                        always update the state
+            profile_columns: Record the time spent generating each column, per
+                             locale, and print a ranked report after each run
+                             (see enable_profiling and column_profiler.py)
         """
         self.table_name = table_name
         self.schema_name = schema_name
         self.columns = columns
         self.faker_providers = faker_providers
-        self.foreign_keys = foreign_keys or {}
+        self.foreign_keys = {
+            column: as_sampler(values) for column, values in (foreign_keys or {}).items()
+        }
         self.path_output = self._resolve_output_path(path_output)
         self.prefix = prefix
         
+        if value_banks:
+            self.faker_providers = self._use_value_banks(value_banks)
+        self.faker_providers = [
+            resolve_template_provider(resolve_numeric_provider(provider)) for provider in self.faker_providers
+        ]
+        
+        self.unique_columns = list(unique_columns or [])
+        for column in self.unique_columns:
+            if column not in columns:
+                raise KeyError(f"Unique column '{column}' not found in columns")
+        # Collision statistics of the last run, per unique column
+        self.unique_stats: Dict[str, Dict[str, int]] = {}
+        
+        self.column_types = dict(column_types or {})
+        
+        if time_column is not None and time_column not in columns:
+            raise KeyError(f"Time column '{time_column}' not found in columns")
+        self.time_column = time_column
+        
+        self.save_state = save_state
+        
+        # Arguments of the last iter_fake_data run, recorded in the table state by the exports
+        self._last_run: Optional[Dict[str, Any]] = None
+        
+        # Per-column timings of the runs, when enabled
+        self.profiler: Optional[ColumnProfiler] = None
+        if profile_columns:
+            self.enable_profiling()
+        
         # Validate that columns and faker_providers have the same length
         if len(columns) != len(faker_providers):
             raise ValueError(f"Number of columns ({len(columns)}) must match number of faker providers ({len(faker_providers)})")
     
     
+    def enable_profiling(self, json_path: Optional[str] = None) -> ColumnProfiler:
+        """
+        Record the time and values of every column (and locale) of the next runs.
+        
+        A ranked hot-column report is printed at the end of each
+        iter_fake_data / generate_fake_data run.
+        
+        Args:
+            json_path: Also write the report of each run to this JSON file
+            
+        Returns:
+            The profiler, also available as self.profiler
+        """
+        labels = {
+            column: provider_label(provider, self.foreign_keys.get(column))
+            for column, provider in zip(self.columns, self.faker_providers)
+        }
+        self.profiler = ColumnProfiler(labels, json_path)
+        return self.profiler
+    
+    def _use_value_banks(self, value_banks: Union[bool, List[str]]) -> List[Union[str, Dict, Callable]]:
+        """
+        Replace string providers with value bank providers.
+        
+        Args:
+            value_banks: True for every bankable provider, or list of columns
+            
+        Returns:
+            New list of providers
+        """
+        if value_banks is True:
+            selected = {
+                column for column, provider in zip(self.columns, self.faker_providers)
+                if isinstance(provider, str) and provider in BANKABLE_PROVIDERS
+            }
+        else:
+            selected = set(value_banks)
+            for column in selected:
+                if column not in self.columns:
+                    raise KeyError(f"Column '{column}' not found in columns")
+                provider = self.faker_providers[self.columns.index(column)]
+                if not isinstance(provider, str):
+                    raise ValueError(f"Value banks need a Faker method name as provider, column '{column}' has {provider!r}")
+        
+        return [
+            ValueBankProvider(provider) if column in selected else provider
+            for column, provider in zip(self.columns, self.faker_providers)
+        ]
+    
     def _resolve_output_path(self, path_output: str = None) -> str:
         """
         Resolve the output directory path.
@@ -123,7 +458,7 @@ class FakeGenericTable:
     
     def _get_faker_for_locale(self, locale: str) -> Faker:
         """
-        Create a Faker instance for a specific locale.
+        Get the Faker instance for a specific locale from the process-wide cache.
         
         Args:
             locale: Locale code (e.g., 'en_US')
@@ -131,7 +466,7 @@ class FakeGenericTable:
         Returns:
             Faker instance configured with the specified locale
         """
-        return Faker(locale)
+        return FAKER_CACHE.get(locale)
     
     def _get_data_for_column(self, faker: Faker, column: str, provider_info: Union[str, Dict, Callable]) -> Any:
         """
@@ -147,8 +482,8 @@ class FakeGenericTable:
         """
         # First check if it's a foreign key
         if column in self.foreign_keys:
-            # For foreign keys, randomly select a value from the provided list
-            return random.choice(self.foreign_keys[column])
+            # For foreign keys, randomly draw a value from the column sampler
+            return self.foreign_keys[column].sample(random)
         
         # Handle different types of provider specifications
         if isinstance(provider_info, str):
@@ -186,7 +521,9 @@ class FakeGenericTable:
     def generate_fake_data(self, 
                           num_records: int, 
                           seed: int = 42, 
-                          variability: float = 0.3) -> List[Dict[str, Any]]:
+                          variability: float = 0.3,
+                          chunk_size: int = 10_000,
+                          workers: int = 1) -> List[Dict[str, Any]]:
         """
         Generate fake data for the table.
         
@@ -194,32 +531,485 @@ class FakeGenericTable:
             num_records: Number of records to generate
             seed: Seed for random number generation to ensure reproducibility
             variability: Value between 0 and 1 determining locale variability
+            chunk_size: Number of rows whose columns are filled together
+            workers: Number of processes generating shards in parallel
             
         Returns:
             List of dictionaries containing fake data for each record
         """
+        records = []
+        for chunk in self.iter_fake_data(num_records, seed, variability, chunk_size, workers):
+            records.extend(chunk)
+        
+        return records
+    
+    def iter_fake_data(self,
+                       num_records: int,
+                       seed: int = 42,
+                       variability: float = 0.3,
+                       chunk_size: int = 10_000,
+                       workers: int = 1,
+                       start_row: int = 0,
+                       batch: int = 0,
+                       unique_trackers: Optional[Dict[str, UniqueValueTracker]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Generate fake data for the table as a stream of fixed-size chunks.
+        
+        Only a bounded number of chunks is alive at a time, so memory stays
+        bounded by chunk_size whatever num_records is.
+        
+        Every chunk is a shard, and every column of a shard has its own random
+        stream derived from ``seed``, the column name and the shard number, so
+        the output is identical for any number of workers and a column keeps
+        its values when other columns are added or reordered.
+        
+        Appended batches (see append_records) continue the row numbers of the
+        rows already generated and draw from streams of their own, derived
+        from the batch number as well; batch 0 is the initial run.
+        
+        Args:
+            num_records: Number of records to generate
+            seed: Seed for random number generation to ensure reproducibility
+            variability: Value between 0 and 1 determining locale variability
+            chunk_size: Number of records per yielded chunk (and per shard)
+            workers: Number of processes generating shards in parallel
+            start_row: Row number of the first record (rows generated before)
+            batch: Batch number of the generated rows
+            unique_trackers: Fingerprints of the unique values generated
+                             before, by unique column (updated in place)
+            
+        Yields:
+            Lists of at most chunk_size record dictionaries, in row order
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        
+        selected_locales = self._prepare_locales(seed, variability)
+        
+        num_shards = math.ceil(num_records / chunk_size)
+        if self.profiler:
+            self.profiler.reset()
+        
+        # Uniqueness is checked here, in row order, so it spans every shard
+        trackers = {
+            column: (unique_trackers or {}).get(column) or UniqueValueTracker()
+            for column in self.unique_columns
+        }
+        regenerated = {column: 0 for column in self.unique_columns}
+        self._last_run = {
+            'seed': seed,
+            'variability': variability,
+            'chunk_size': chunk_size,
+            'batch': batch,
+            'trackers': trackers,
+        }
+        
+        if workers > 1 and num_shards > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            print("⚠️ Parallel generation requires the 'fork' start method, using a single worker")
+            workers = 1
+        
+        if workers > 1 and num_shards > 1:
+            shards = self._iter_shards_parallel(selected_locales, num_records, chunk_size, seed, workers,
+                                                start_row, batch)
+        else:
+            shards = (
+                self._generate_shard_columns(selected_locales, shard_index, num_records, chunk_size, seed,
+                                             start_row=start_row, batch=batch)
+                for shard_index in range(num_shards)
+            )
+        
+        for shard_index, (row_locales, columns) in enumerate(shards):
+            if trackers:
+                start = start_row + shard_index * chunk_size
+                for column, tracker in trackers.items():
+                    regenerated[column] += self._enforce_unique(
+                        column, tracker, columns, row_locales, start, seed
+                    )
+            yield self._records_from_columns(columns)
+        
+        if trackers:
+            self.unique_stats = {
+                column: {**tracker.stats(), 'regenerated': regenerated[column]}
+                for column, tracker in trackers.items()
+            }
+            for column, stats in self.unique_stats.items():
+                print(f"🔑 Unique column {column}: {stats['unique']} values, "
+                      f"{stats['regenerated']} cells regenerated after {stats['collisions']} collisions, "
+                      f"{stats['memory_bytes'] / 1024 / 1024:.1f} MB tracker")
+        
+        if self.profiler:
+            self.profiler.finish()
+    
+    def iter_column_values(self,
+                           column: str,
+                           num_records: int,
+                           seed: int = 42,
+                           variability: float = 0.3,
+                           chunk_size: int = 10_000) -> Iterator[List[Any]]:
+        """
+        Generate the values of a single column, chunk by chunk.
+        
+        Thanks to the per-column random streams the values are the same as the
+        column of iter_fake_data with the same arguments (except for cells
+        regenerated by unique_columns), which lets a heavy or newly added column
+        be generated separately, in batches or in another process.
+        
+        Args:
+            column: Column name
+            num_records: Number of records to generate
+            seed: Seed for random number generation to ensure reproducibility
+            variability: Value between 0 and 1 determining locale variability
+            chunk_size: Number of values per yielded chunk
+            
+        Yields:
+            Lists of at most chunk_size values, in row order
+        """
+        if column not in self.columns:
+            raise KeyError(f"Column '{column}' not found in columns")
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        
+        selected_locales = self._prepare_locales(seed, variability)
+        column_index = self.columns.index(column)
+        
+        for shard_index in range(math.ceil(num_records / chunk_size)):
+            _, (values,) = self._generate_shard_columns(
+                selected_locales, shard_index, num_records, chunk_size, seed, [column_index]
+            )
+            yield values
+    
+    def _prepare_locales(self, seed: int, variability: float) -> List[str]:
+        """
+        Seed the run and select its locales.
+        
+        Args:
+            seed: Base seed of the run
+            variability: Value between 0 and 1 determining locale variability
+            
+        Returns:
+            Selected locale codes
+        """
         random.seed(seed)
         Faker.seed(seed)
         
         # Select locales based on variability
         selected_locales = self._select_locales(variability)
         print(f"Using {len(selected_locales)} locales: {', '.join(selected_locales)}")
+        return selected_locales
+    
+    def _enforce_unique(self,
+                        column: str,
+                        tracker: UniqueValueTracker,
+                        columns: List[List[Any]],
+                        row_locales: List[str],
+                        start: int,
+                        seed: int,
+                        max_attempts: int = 100) -> int:
+        """
+        Check the values of a unique column and regenerate the colliding cells.
         
-        # Create Faker instances for each locale
-        faker_instances = [self._get_faker_for_locale(locale) for locale in selected_locales]
+        A colliding cell is regenerated with the locale of its row and a seed
+        derived from the column, the row and the attempt, so the result does not
+        depend on how shards were distributed across workers.
         
-        records = []
-        for i in range(num_records):
-            # Select a random locale for this record
-            faker = random.choice(faker_instances)
+        Args:
+            column: Unique column name
+            tracker: Fingerprints of the values already emitted in this run
+            columns: Column values of the shard (modified in place)
+            row_locales: Locale of each row of the shard
+            start: Absolute row number of the first row of the shard
+            seed: Base seed of the run
+            max_attempts: Regeneration attempts per cell before giving up
             
-            record = {}
-            for column, provider in zip(self.columns, self.faker_providers):
-                record[column] = self._get_data_for_column(faker, column, provider)
+        Returns:
+            Number of regenerated cells
+        """
+        column_index = self.columns.index(column)
+        values = columns[column_index]
+        regenerated = 0
+        
+        for position, value in enumerate(values):
+            if value is None or tracker.add(value):
+                continue
             
-            records.append(record)
+            row = start + position
+            filler = self._compile_columns(self._get_faker_for_locale(row_locales[position]))[column_index]
+            for attempt in range(max_attempts):
+                self._seed_stream(seed, 'unique', column, row, attempt)
+                value = filler([row])[0]
+                if tracker.add(value):
+                    break
+            else:
+                raise ValueError(f"Could not generate a unique value for column '{column}' "
+                                 f"at row {row} after {max_attempts} attempts")
+            values[position] = value
+            regenerated += 1
         
-        return records
+        return regenerated
+    
+    def _iter_shards_parallel(self,
+                              locales: List[str],
+                              num_records: int,
+                              chunk_size: int,
+                              seed: int,
+                              workers: int,
+                              start_row: int = 0,
+                              batch: int = 0) -> Iterator[Tuple[List[str], List[List[Any]]]]:
+        """
+        Generate shards in a process pool and yield them in row order.
+        
+        Workers are forked so they inherit the table (providers are often
+        lambdas, which cannot be pickled). At most two shards per worker are
+        in flight, which keeps memory bounded when the consumer is slower.
+        
+        Args:
+            locales: Selected locale codes
+            num_records: Number of records to generate
+            chunk_size: Number of records per shard
+            seed: Base seed from which shard seeds are derived
+            workers: Number of worker processes
+            start_row: Row number of the first record
+            batch: Batch number of the generated rows
+            
+        Yields:
+            (row locales, column values) of each shard, in row order
+        """
+        global _SHARD_CONTEXT
+        
+        num_shards = math.ceil(num_records / chunk_size)
+        _SHARD_CONTEXT = (self, locales, num_records, chunk_size, seed, start_row, batch)
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('fork')) as executor:
+                pending = deque()
+                next_shard = 0
+                while next_shard < num_shards or pending:
+                    while next_shard < num_shards and len(pending) < workers * 2:
+                        pending.append(executor.submit(_generate_shard, next_shard))
+                        next_shard += 1
+                    row_locales, columns, profile = pending.popleft().result()
+                    if profile:
+                        self.profiler.merge(profile)
+                    yield row_locales, columns
+        finally:
+            _SHARD_CONTEXT = None
+    
+    def _generate_shard_columns(self,
+                                locales: List[str],
+                                shard_index: int,
+                                num_records: int,
+                                chunk_size: int,
+                                seed: int,
+                                column_indexes: Optional[List[int]] = None,
+                                start_row: int = 0,
+                                batch: int = 0) -> Tuple[List[str], List[List[Any]]]:
+        """
+        Generate the column values of one shard.
+        
+        The locale of each row and every column use their own random stream,
+        derived from the base seed, the stream name and the shard (and batch)
+        number.
+        
+        Args:
+            locales: Selected locale codes
+            shard_index: Shard number (row range [start_row + index * chunk_size, ...))
+            num_records: Total number of records being generated
+            chunk_size: Number of records per shard
+            seed: Base seed from which the stream seeds are derived
+            column_indexes: Columns to generate (all of them when None)
+            start_row: Row number of the first record of the run
+            batch: Batch number of the generated rows
+            
+        Returns:
+            Tuple of (locale of each row, one list of values per generated column)
+        """
+        offset = shard_index * chunk_size
+        size = min(chunk_size, num_records - offset)
+        # Batch 0 keeps the stream keys of a plain run
+        shard_key = shard_index if batch == 0 else f"{batch}.{shard_index}"
+        
+        # Select a random locale for each record of the shard
+        self._seed_stream(seed, 'locales', shard_key)
+        row_locales = random.choices(locales, k=size)
+        
+        return row_locales, self._generate_chunk_columns(row_locales, start_row + offset, seed, shard_key,
+                                                         column_indexes)
+    
+    def _seed_stream(self, seed: int, *keys: Any) -> None:
+        """
+        Point the random module and Faker's shared generator at a derived stream.
+        
+        The stream is keyed by the table too, so same-named columns of
+        different tables (and their row locales) do not repeat each other.
+        """
+        stream_seed = _derive_seed(seed, self.schema_name, self.table_name, *keys)
+        random.seed(stream_seed)
+        Faker.seed(stream_seed)
+    
+    def _records_from_columns(self, column_values: List[List[Any]]) -> List[Dict[str, Any]]:
+        """Assemble per-column value lists into record dictionaries."""
+        columns = self.columns
+        return [dict(zip(columns, values)) for values in zip(*column_values)]
+    
+    def _generate_chunk_columns(self,
+                                row_locales: List[str],
+                                start: int,
+                                seed: int,
+                                shard_key: Union[int, str],
+                                column_indexes: Optional[List[int]] = None) -> List[List[Any]]:
+        """
+        Generate one chunk of records column by column.
+        
+        Each column is reseeded from (seed, table, column name, shard) before
+        it is filled, so its values do not depend on the other columns:
+        adding, removing or reordering a column leaves the rest of the data
+        unchanged, and a single column can be generated on its own.
+        
+        Foreign keys and locale independent batched providers fill the whole
+        column in one call; every other column is filled once per locale with
+        the fillers compiled for that Faker instance.
+        
+        Args:
+            row_locales: Locale of each row of the chunk
+            start: Absolute row number of the first record in the chunk
+            seed: Base seed from which the column seeds are derived
+            shard_key: Shard number of the chunk (prefixed with the batch number
+                       for appended batches)
+            column_indexes: Columns to generate (all of them when None)
+            
+        Returns:
+            One list of values per generated column
+        """
+        size = len(row_locales)
+        
+        # Group row positions by locale so each compiled filler runs once per locale
+        groups: Dict[str, List[int]] = {}
+        for position, locale in enumerate(row_locales):
+            groups.setdefault(locale, []).append(position)
+        
+        # Only the locales used by this chunk are loaded
+        group_fillers = [
+            (locale, self._compile_columns(self._get_faker_for_locale(locale)), positions,
+             [start + position for position in positions])
+            for locale, positions in groups.items()
+        ]
+        chunk_fillers = group_fillers[0][1]
+        chunk_rows = range(start, start + size)
+        profiler = self.profiler
+        
+        if column_indexes is None:
+            column_indexes = range(len(self.columns))
+        
+        column_values = []
+        for index in column_indexes:
+            column = self.columns[index]
+            self._seed_stream(seed, 'column', column, shard_key)
+            
+            if self._is_chunk_level_column(column, self.faker_providers[index]):
+                began = perf_counter() if profiler else 0.0
+                column_values.append(list(chunk_fillers[index](chunk_rows)))
+                if profiler:
+                    profiler.record(column, None, perf_counter() - began, size)
+                continue
+            
+            values = [None] * size
+            for locale, fillers, positions, rows in group_fillers:
+                began = perf_counter() if profiler else 0.0
+                filled = fillers[index](rows)
+                if profiler:
+                    profiler.record(column, locale, perf_counter() - began, len(rows))
+                for position, value in zip(positions, filled):
+                    values[position] = value
+            column_values.append(values)
+        
+        return column_values
+    
+    def _is_chunk_level_column(self, column: str, provider_info: Union[str, Dict, Callable]) -> bool:
+        """Whether a column does not depend on the locale and can be filled once per chunk."""
+        if column in self.foreign_keys:
+            return True
+        return is_batch_provider(provider_info) and getattr(provider_info, 'locale_independent', False)
+    
+    def _compile_columns(self, faker: Faker) -> List[Callable[[Sequence[int]], List[Any]]]:
+        """
+        Compile the column/provider spec into fillers bound to a Faker instance.
+        
+        Provider methods are resolved with getattr once, dict parameters are
+        frozen with functools.partial and foreign key pools are bound up front,
+        so generating a value is a single call without any dispatch. The result
+        is stored with the instance in FAKER_CACHE, so it is freed when the
+        locale is evicted.
+        
+        Args:
+            faker: Faker instance the fillers are bound to
+            
+        Returns:
+            One filler per column; each takes the absolute row numbers to
+            generate and returns one value per row
+        """
+        compiled = FAKER_CACHE.compiled_fillers(faker)
+        fillers = compiled.get(self) if compiled is not None else None
+        if fillers is not None:
+            return fillers
+        
+        fillers = [
+            self._compile_column(faker, column, provider)
+            for column, provider in zip(self.columns, self.faker_providers)
+        ]
+        if compiled is not None:
+            compiled[self] = fillers
+        return fillers
+    
+    def _compile_column(self,
+                        faker: Faker,
+                        column: str,
+                        provider_info: Union[str, Dict, Callable]) -> Callable[[Sequence[int]], List[Any]]:
+        """
+        Compile the filler of a single column for a Faker instance.
+        
+        Mirrors the dispatch of _get_data_for_column, but runs it once instead
+        of once per cell.
+        
+        Args:
+            faker: Faker instance the filler is bound to
+            column: Column name
+            provider_info: Provider specification (string, dict, function or batched)
+            
+        Returns:
+            Function taking the absolute row numbers and returning their values
+        """
+        # Foreign keys: sample from the pool resolved up front
+        if column in self.foreign_keys:
+            sample_batch = self.foreign_keys[column].sample_batch
+            return lambda rows: sample_batch(random, len(rows))
+        
+        if is_batch_provider(provider_info):
+            return partial(provider_info.batch, faker)
+        
+        if isinstance(provider_info, str):
+            if not hasattr(faker, provider_info):
+                raise ValueError(f"Unknown Faker provider: {provider_info}")
+            generate = getattr(faker, provider_info)
+            
+        elif isinstance(provider_info, dict):
+            if 'method' not in provider_info:
+                raise ValueError(f"Provider dict must have a 'method' key: {provider_info}")
+            
+            method_name = provider_info['method']
+            if not hasattr(faker, method_name):
+                raise ValueError(f"Unknown Faker provider method: {method_name}")
+            
+            params = {k: v for k, v in provider_info.items() if k != 'method'}
+            generate = partial(getattr(faker, method_name), **params)
+            
+        elif callable(provider_info):
+            generate = partial(provider_info, faker)
+            
+        else:
+            raise ValueError(f"Unsupported provider type for column {column}: {type(provider_info)}")
+        
+        return lambda rows: [generate() for _ in rows]
     
     def _format_value_for_sql(self, value: Any) -> str:
         """
@@ -231,101 +1021,467 @@ class FakeGenericTable:
         Returns:
             String representation of the value suitable for SQL
         """
-        if value is None:
-            return 'NULL'
-        elif isinstance(value, bool):
-            return str(int(value))
-        elif isinstance(value, (int, float)):
-            return str(value)
-        elif isinstance(value, datetime):
-            return f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'"
-        else:
-            # Escape single quotes in strings
-            return f"'{str(value).replace('\'', '\'\'')}'"
+        return format_sql_value(value)
     
     def to_sql(self, records: List[Dict[str, Any]]) -> str:
         if not records:
             return ""
 
-        columns = list(records[0].keys())
-        columns_str = ', '.join(columns)
-        full_table_name = self.get_full_table_name()
+        buffer = io.StringIO()
+        self._sql_writer(buffer, list(records[0].keys())).write_records(records)
+        return buffer.getvalue()
+    
+    def _sql_writer(self, file: TextIO, columns: List[str]) -> SQLInsertWriter:
+        """Streaming INSERT writer for this table (10,000 rows per statement)."""
+        return SQLInsertWriter(file, self.get_full_table_name(), columns, column_types=self.column_types)
+    
+    def _sql_file_path(self, suffix: str = '') -> str:
+        """Path of the SQL file for this table (or of a delta batch) in the output directory."""
+        return os.path.join(
+            self.path_output,
+            f"{self.prefix}-{self.schema_name.upper()}-{self.table_name.upper()}{suffix}.sql"
+        )
+    
+    def _columnar_file_path(self, file_format: str, suffix: str = '') -> str:
+        """Path of the Parquet/Arrow file for this table in the output directory."""
+        from columnar_export import COLUMNAR_FORMATS
+        
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {file_format} (expected one of {list(COLUMNAR_FORMATS)})")
+        return os.path.join(
+            self.path_output,
+            f"{self.prefix}-{self.schema_name.upper()}-{self.table_name.upper()}{suffix}{COLUMNAR_FORMATS[file_format]}"
+        )
+    
+    def _foreign_keys_file_path(self, suffix: str = '') -> str:
+        """Path of the FK-Values file for this table (or of a delta batch), creating its directory if needed."""
+        output_dir = os.path.join(self.path_output, 'FK-Values')
+        os.makedirs(output_dir, exist_ok=True)  # Create directory if doesn't exist
+        
+        return os.path.join(
+            output_dir,
+            f"FK-{self.schema_name.upper()}-{self.table_name.upper()}{suffix}.txt"
+        )
+    
+    @staticmethod
+    def _iter_record_chunks(records: Union[List[Dict[str, Any]], Iterable[List[Dict[str, Any]]]],
+                            chunk_size: int = 10_000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Normalize the input of the export methods to a stream of chunks.
+        
+        Args:
+            records: Either a list of record dictionaries or an iterable of
+                     record chunks (e.g. the output of iter_fake_data)
+            chunk_size: Slice size used when a plain list of records is given
+            
+        Yields:
+            Non-empty lists of record dictionaries
+        """
+        if isinstance(records, list) and (not records or isinstance(records[0], dict)):
+            for i in range(0, len(records), chunk_size):
+                yield records[i:i + chunk_size]
+            return
+        
+        for chunk in records:
+            if chunk:
+                yield chunk
+    
+    def export_chunks(self,
+                      records: Union[List[Dict[str, Any]], Iterable[List[Dict[str, Any]]]],
+                      columns_export: Optional[List[str]] = None,
+                      write_sql: bool = True,
+                      columnar_format: Optional[str] = None,
+                      compress: bool = False,
+                      fk_format: str = 'text',
+                      file_suffix: str = '') -> int:
+        """
+        Export records to the SQL, columnar and/or FK-Values files in a single pass.
         
-        sql_statements = []
-        batch_size = 10_000  # PostgreSQL	10,000 - 50,000	Máx. ~1GB por query (work_mem)
+        Chunks are written as soon as they are produced, so peak memory is
+        bounded by the chunk size and not by the number of records. When the
+        records come from iter_fake_data, the table state is updated for
+        append_records.
         
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            values_batch = []
+        Args:
+            records: List of record dictionaries or iterable of record chunks
+            columns_export: Columns to export to the FK-Values file (None to skip it)
+            write_sql: Whether to write the SQL INSERT file
+            columnar_format: 'parquet' or 'arrow' to also write the typed columnar
+                             file (requires pyarrow), None to skip it
+            compress: Write the SQL and FK-Values files gzip-compressed
+                      (.sql.gz / .txt.gz), streamed chunk by chunk
+            fk_format: Foreign key outputs: 'text' (FK-Values file), 'binary'
+                       (memory-mapped .fkb store) or 'both'
+            file_suffix: Suffix of the file names (delta files of an appended
+                         batch, whose foreign keys are also added to the
+                         cumulative FK-Values files)
             
-            for record in batch:
-                values = [self._format_value_for_sql(record[column]) for column in columns]
-                values_batch.append(f"({', '.join(values)})")
+        Returns:
+            Number of records exported
+        """
+        if not write_sql and not columns_export and not columnar_format:
+            raise ValueError("Nothing to export: enable write_sql, columnar_format or provide columns_export")
+        
+        sql_filename = with_gzip_extension(self._sql_file_path(file_suffix), compress) if write_sql else None
+        columnar_filename = self._columnar_file_path(columnar_format, file_suffix) if columnar_format else None
+        columnar_writer = None
+        fk_output = (self._foreign_keys_output(columns_export, compress, fk_format, file_suffix)
+                     if columns_export else None)
+        sql_file = open_text(sql_filename, 'w', buffering=SQL_WRITE_BUFFER) if sql_filename else None
+        sql_writer = None
+        total = 0
+        complete = False
+        
+        try:
+            for chunk in self._iter_record_chunks(records):
+                if sql_file:
+                    if sql_writer is None:
+                        sql_writer = self._sql_writer(sql_file, list(chunk[0].keys()))
+                    sql_writer.write_records(chunk)
+                
+                if columnar_filename:
+                    if columnar_writer is None:
+                        from columnar_export import ColumnarWriter, provider_arrow_types
+                        # Declared types first, then the DECIMAL(p,s) of numeric providers
+                        column_types = dict(self.column_types)
+                        column_types.update(provider_arrow_types(self.columns, self.faker_providers))
+                        columnar_writer = ColumnarWriter(
+                            columnar_filename, self.get_full_table_name(), list(chunk[0].keys()), columnar_format,
+                            column_types=column_types
+                        )
+                    columnar_writer.write_chunk(chunk)
+                
+                if fk_output:
+                    try:
+                        fk_output.write_chunk(chunk)
+                    except Exception as e:
+                        print(f"❌ Failed to export foreign keys: {str(e)}")
+                        raise
+                
+                total += len(chunk)
+            complete = True
+        finally:
+            if sql_file:
+                sql_file.close()
+            if columnar_writer:
+                columnar_writer.close()
+            if fk_output:
+                fk_output.close(complete)
+        
+        if columns_export and not total:
+            raise ValueError("Records and columns_export cannot be empty")
+        
+        if sql_filename:
+            print(f"Exported {total} records to {os.path.abspath(sql_filename)}")
+        if columnar_filename:
+            print(f"Exported {total} records to {os.path.abspath(columnar_filename)}")
+        if fk_output:
+            print(f"✅ Successfully exported {total} foreign keys to:\n" + "\n".join(fk_output.paths))
+        
+        files = [path for path in (sql_filename, columnar_filename) if path]
+        self._save_state(total, files + (fk_output.paths if fk_output else []))
+        return total
+    
+    def _foreign_keys_output(self,
+                             columns_export: List[str],
+                             compress: bool,
+                             fk_format: str,
+                             suffix: str = '') -> _ForeignKeysOutput:
+        """FK-Values text file and/or .fkb store of this table (or of a delta batch), as selected by fk_format."""
+        if fk_format not in FK_FORMATS:
+            raise ValueError(f"Unsupported foreign key format: {fk_format} (expected one of {list(FK_FORMATS)})")
+        text_path = with_gzip_extension(self._foreign_keys_file_path(suffix), compress)
+        cumulative_text_path = with_gzip_extension(self._foreign_keys_file_path(), compress)
+        store_path = foreign_key_store_path(text_path)
+        cumulative_store_path = foreign_key_store_path(cumulative_text_path)
+        return _ForeignKeysOutput(
+            text_path if fk_format != 'binary' else None,
+            store_path if fk_format != 'text' else None,
+            columns_export,
+            cumulative_text_path if suffix else None,
+            cumulative_store_path if suffix else None
+        )
+    
+    def _save_state(self, rows: int, files: List[str]) -> None:
+        """
+        Record a batch generated by iter_fake_data in the table state file.
+        
+        Batch 0 (a full run) starts a new state when save_state is set;
+        appended batches update the state they were generated from. The
+        fingerprints of the unique columns are saved next to the state file.
+        
+        Args:
+            rows: Number of rows exported
+            files: Files written for the batch
+        """
+        run, self._last_run = self._last_run, None
+        if run is None or (run['batch'] == 0 and not self.save_state):
+            return
+        
+        path = state_file_path(self.path_output, self.schema_name, self.table_name)
+        if run['batch'] == 0:
+            state = TableState(self.table_name, run['seed'], run['variability'], run['chunk_size'])
+        else:
+            state = TableState.load(path)
+            if state is None or state.next_batch != run['batch']:
+                raise RuntimeError(f"State of {self.get_full_table_name()} changed while appending batch {run['batch']}")
+        
+        state.time_watermark = self._time_watermark() or state.time_watermark
+        state.foreign_keys = self._foreign_key_versions()
+        state.add_batch(rows, files)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        for column, tracker in run['trackers'].items():
+            tracker.save(fingerprint_file_path(path, column))
+        state.save(path)
+    
+    def _time_provider(self) -> Optional[TemporalProvider]:
+        """TemporalProvider of the time column, if any."""
+        if self.time_column is None:
+            return None
+        provider = self.faker_providers[self.columns.index(self.time_column)]
+        return provider if isinstance(provider, TemporalProvider) else None
+    
+    def _time_watermark(self) -> Optional[str]:
+        """End of the time range of the time column (ISO format), if any."""
+        provider = self._time_provider()
+        return provider.end.isoformat(sep=' ') if provider else None
+    
+    def _foreign_key_versions(self) -> Dict[str, Dict[str, Any]]:
+        """Size (and source file, when mapped) of every foreign key pool."""
+        versions = {}
+        for column, sampler in self.foreign_keys.items():
+            versions[column] = {'values': len(sampler)}
+            source = getattr(sampler, 'file_path', None)
+            if source:
+                versions[column]['source'] = os.path.abspath(source)
+        return versions
+    
+    def load_to_postgres(self,
+                         conn: Any,
+                         records: Union[List[Dict[str, Any]], Iterable[List[Dict[str, Any]]]],
+                         columns_export: Optional[List[str]] = None,
+                         compress: bool = False,
+                         commit: bool = True,
+                         fk_format: str = 'text',
+                         file_suffix: str = '') -> int:
+        """
+        Stream records straight into PostgreSQL with COPY ... FROM STDIN.
+        
+        Each chunk is rendered as COPY text and handed to psycopg2 while the
+        next one is generated; no SQL file is written and nothing is re-parsed.
+        The FK-Values file can still be written in the same pass.
+        
+        Args:
+            conn: Open psycopg2 connection, or a DSN string (a connection is
+                  opened and closed by this method; psycopg2 is imported lazily)
+            records: List of record dictionaries or iterable of record chunks
+            columns_export: Columns to export to the FK-Values file (None to skip it)
+            compress: Write the FK-Values file gzip-compressed (.txt.gz)
+            commit: Commit after the COPY (otherwise the caller owns the transaction)
+            fk_format: Foreign key outputs: 'text', 'binary' (.fkb store) or 'both'
+            file_suffix: Suffix of the FK-Values file names (delta files of an
+                         appended batch, see export_chunks)
             
-            sql = f"INSERT INTO {full_table_name} ({columns_str}) VALUES {', '.join(values_batch)};"
-            sql_statements.append(sql)
+        Returns:
+            Number of records loaded
+        """
+        chunks = self._iter_record_chunks(records)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            raise ValueError("No records to load")
+        
+        columns = list(first_chunk[0].keys())
+        full_table_name = self.get_full_table_name()
+        statement = f"COPY {full_table_name} ({', '.join(columns)}) FROM STDIN"
+        fk_output = (self._foreign_keys_output(columns_export, compress, fk_format, file_suffix)
+                     if columns_export else None)
+        total = 0
+        complete = False
+        
+        def copy_blocks() -> Iterator[str]:
+            nonlocal total
+            for chunk in chain([first_chunk], chunks):
+                if fk_output:
+                    fk_output.write_chunk(chunk)
+                total += len(chunk)
+                yield copy_text([[record[column] for record in chunk] for column in columns])
+        
+        own_connection = isinstance(conn, str)
+        if own_connection:
+            import psycopg2
+            conn = psycopg2.connect(conn)
+        
+        try:
+            with conn.cursor() as cur:
+                cur.copy_expert(statement, CopyStream(copy_blocks()), size=COPY_READ_SIZE)
+            if commit:
+                conn.commit()
+            complete = True
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if fk_output:
+                fk_output.close(complete)
+            if own_connection:
+                conn.close()
+        
+        print(f"Loaded {total} records into {full_table_name} with COPY")
+        if fk_output:
+            print(f"✅ Successfully exported {total} foreign keys to:\n" + "\n".join(fk_output.paths))
+        
+        self._save_state(total, fk_output.paths if fk_output else [])
+        return total
     
-        return '\n'.join(sql_statements)
+    def append_records(self,
+                       num_records: int,
+                       columns_export: Optional[List[str]] = None,
+                       write_sql: bool = True,
+                       columnar_format: Optional[str] = None,
+                       compress: bool = False,
+                       workers: int = 1,
+                       conn: Any = None,
+                       fk_format: str = 'text',
+                       end_date: str = 'now') -> int:
+        """
+        Generate and export only new rows, after the rows recorded in the table state.
+        
+        The new batch reuses the seed, variability and chunk size of the
+        state, continues its row numbers, starts the time column right after
+        the time watermark and checks the unique columns against the saved
+        fingerprints, so it stays consistent with the rows already generated.
+        Its rows go to delta files (e.g. 03-FINTECH-CLIENTS-DELTA-0001.sql, or
+        a COPY when conn is given) and its foreign keys to delta FK-Values
+        files that are also added to the cumulative ones.
+        
+        Args:
+            num_records: Number of rows to append
+            columns_export: Columns to export to the FK-Values files (None to skip them)
+            write_sql: Whether to write the delta SQL INSERT file
+            columnar_format: 'parquet' or 'arrow' to also write a delta columnar file
+            compress: Write the SQL and FK-Values files gzip-compressed
+            workers: Number of processes generating shards in parallel
+            conn: psycopg2 connection or DSN: load the rows with COPY instead
+                  of writing the delta SQL/columnar files
+            fk_format: Foreign key outputs: 'text', 'binary' (.fkb store) or 'both'
+            end_date: End of the appended time range: 'now', or an offset
+                      counted from the watermark (e.g. '+1d')
+            
+        Returns:
+            Number of rows appended
+            
+        Raises:
+            FileNotFoundError: If the table has no state file (no full run
+                               with save_state yet)
+        """
+        path = state_file_path(self.path_output, self.schema_name, self.table_name)
+        state = TableState.load(path)
+        if state is None:
+            raise FileNotFoundError(f"No generation state for {self.get_full_table_name()} ({path}): "
+                                    "generate the table once with save_state=True (--save-state) before appending")
+        batch = state.next_batch
+        
+        for column, version in self._foreign_key_versions().items():
+            previous = state.foreign_keys.get(column, {}).get('values')
+            if previous is not None and previous != version['values']:
+                print(f"🔗 Foreign key pool {column}: {previous} -> {version['values']} values since the last batch")
+        
+        trackers = {}
+        for column in self.unique_columns:
+            fingerprints = fingerprint_file_path(path, column)
+            if os.path.exists(fingerprints):
+                trackers[column] = UniqueValueTracker.load(fingerprints)
+            else:
+                print(f"⚠️ No saved fingerprints for unique column {column}, checking the new batch only")
+        
+        providers = self.faker_providers
+        time_provider = self._time_provider()
+        if time_provider and state.time_watermark:
+            self.faker_providers = list(providers)
+            self.faker_providers[self.columns.index(self.time_column)] = time_provider.after(
+                state.time_watermark, end_date
+            )
+            FAKER_CACHE.discard_compiled(self)
+        
+        print(f"Appending batch {batch} of {self.get_full_table_name()}: rows {state.rows + 1}-{state.rows + num_records}"
+              + (f", {self.time_column} after {state.time_watermark}" if time_provider else ""))
+        try:
+            chunks = self.iter_fake_data(
+                num_records,
+                seed=state.seed,
+                variability=state.variability,
+                chunk_size=state.chunk_size,
+                workers=workers,
+                start_row=state.rows,
+                batch=batch,
+                unique_trackers=trackers
+            )
+            suffix = delta_suffix(batch)
+            if conn is not None:
+                return self.load_to_postgres(conn, chunks, columns_export, compress,
+                                             fk_format=fk_format, file_suffix=suffix)
+            return self.export_chunks(chunks, columns_export, write_sql, columnar_format, compress,
+                                      fk_format=fk_format, file_suffix=suffix)
+        finally:
+            self._last_run = None
+            if self.faker_providers is not providers:
+                self.faker_providers = providers
+                FAKER_CACHE.discard_compiled(self)
     
-    def export_to_sql_file(self, records: List[Dict[str, Any]]) -> None:
+    def export_to_sql_file(self,
+                           records: Union[List[Dict[str, Any]], Iterable[List[Dict[str, Any]]]],
+                           compress: bool = False) -> None:
         """
         Export records to an SQL file in the configured output directory.
         
         Args:
-            records: List of record dictionaries to export
+            records: List of record dictionaries, or an iterable of record
+                     chunks (e.g. iter_fake_data) consumed incrementally
+            compress: Write a gzip-compressed .sql.gz file
         """
-        filename = os.path.join(
-            self.path_output,
-            f"{self.prefix}-{self.schema_name.upper()}-{self.table_name.upper()}.sql"
-        )
+        self.export_chunks(records, compress=compress)
+    
+    def export_to_parquet(self,
+                          records: Union[List[Dict[str, Any]], Iterable[List[Dict[str, Any]]]],
+                          file_format: str = 'parquet') -> None:
+        """
+        Export records to a typed columnar file instead of SQL text.
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(self.to_sql(records))
+        INSERT, COPY or CSV files can be derived from it later with
+        columnar_export.convert_columnar_file, without parsing SQL.
         
-        print(f"Exported {len(records)} records to {os.path.abspath(filename)}")
+        Args:
+            records: List of record dictionaries, or an iterable of record
+                     chunks (e.g. iter_fake_data) consumed incrementally
+            file_format: 'parquet' or 'arrow' (Arrow IPC file)
+        """
+        self.export_chunks(records, write_sql=False, columnar_format=file_format)
         
-    def export_foreign_keys_file(self, records: List[Dict[str, Any]], columns_export: List[str]) -> None:
+    def export_foreign_keys_file(self,
+                                 records: Union[List[Dict[str, Any]], Iterable[List[Dict[str, Any]]]],
+                                 columns_export: List[str],
+                                 compress: bool = False,
+                                 fk_format: str = 'text') -> None:
         """
         Export foreign keys records to a text file, creating directories if needed.
 
+        Only the text file is written by default; fk_format='binary' writes
+        the memory-mapped .fkb store (see fk_store) instead and 'both' writes
+        the two.
+
         Args:
-            records: List of dictionaries containing the records
+            records: List of dictionaries containing the records, or an
+                     iterable of record chunks consumed incrementally
             columns_export: List of column names to export
+            compress: Write a gzip-compressed .txt.gz file
+            fk_format: Foreign key outputs: 'text' (FK-Values file), 'binary'
+                       (.fkb store instead of the text file) or 'both'
         """
         # Validate input
-        if not records or not columns_export:
+        if not columns_export:
             raise ValueError("Records and columns_export cannot be empty")
         
-        # Verify columns exist
-        sample_record = records[0]
-        for col in columns_export:
-            if col not in sample_record:
-                raise KeyError(f"Column '{col}' not found in records")
-
-        # Prepare file path
-        output_dir = os.path.join(self.path_output, 'FK-Values')
-        os.makedirs(output_dir, exist_ok=True)  # Create directory if doesn't exist
-        
-        output_file = os.path.join(
-            output_dir,
-            f"FK-{self.schema_name.upper()}-{self.table_name.upper()}.txt"
-        )
-
-        # Prepare content
-        header = "|".join(columns_export)
-        lines = [header] + [
-            "|".join(str(record[col]) for col in columns_export)
-            for record in records
-        ]
-
-        # Write file
-        try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write("\n".join(lines))
-            print(f"✅ Successfully exported {len(records)} foreign keys to:\n{output_file}")
-        except Exception as e:
-            print(f"❌ Failed to export foreign keys: {str(e)}")
-            raise
+        self.export_chunks(records, columns_export, write_sql=False, compress=compress, fk_format=fk_format)
         
 
 
@@ -338,12 +1494,31 @@ def main():
                        help='Comma-separated list of column names')
     parser.add_argument('--providers', type=str, required=True, 
                        help='Comma-separated list of Faker providers')
-    parser.add_argument('--records', type=int, required=True, help='Number of records to generate')
+    parser.add_argument('--records', type=int, default=None,
+                        help='Number of records to generate (not needed with --append)')
+    parser.add_argument('--append', type=int, default=None, metavar='N',
+                        help='Append N rows after the recorded table state (delta SQL/COPY files)')
+    parser.add_argument('--save-state', action='store_true',
+                        help='Record the table state of a full run, so --append can continue it later')
     parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducibility')
     parser.add_argument('--variability', type=float, default=0.3, 
                         help='Locale variability (0-1, where 0 = single locale, 1 = all locales)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes (output is identical for any value)')
+    parser.add_argument('--output-format', choices=['sql', 'parquet', 'arrow'], default='sql',
+                        help='Table data format: SQL INSERT file or typed columnar file (requires pyarrow)')
+    parser.add_argument('--compress', action='store_true',
+                        help='Write gzip-compressed output files (.sql.gz)')
+    parser.add_argument('--dsn', type=str, default=None,
+                        help='PostgreSQL DSN: load the table with COPY instead of writing a file (requires psycopg2)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the time spent generating each column, per locale')
+    parser.add_argument('--profile-json', type=str, default=None,
+                        help='Also write the column profile to this JSON file (implies --profile)')
     
     args = parser.parse_args()
+    if args.records is None and args.append is None:
+        parser.error('--records or --append is required')
     
     # Parse columns and providers
     columns = [col.strip() for col in args.columns.split(',')]
@@ -354,18 +1529,39 @@ def main():
         table_name=args.table,
         schema_name=args.schema,
         columns=columns,
-        faker_providers=providers
+        faker_providers=providers,
+        save_state=args.save_state
     )
+    if args.profile or args.profile_json:
+        table.enable_profiling(args.profile_json)
+    
+    if args.append:
+        # Generate only the new rows, continuing the recorded table state
+        table.append_records(
+            args.append,
+            write_sql=args.output_format == 'sql',
+            columnar_format=None if args.output_format == 'sql' else args.output_format,
+            compress=args.compress,
+            workers=args.workers,
+            conn=args.dsn
+        )
+        return
     
-    # Generate fake data
-    records = table.generate_fake_data(
+    # Generate fake data as a stream of chunks
+    chunks = table.iter_fake_data(
         num_records=args.records,
         seed=args.seed,
-        variability=args.variability
+        variability=args.variability,
+        workers=args.workers
     )
     
-    # Export to SQL file
-    table.export_to_sql_file(records)
+    # Load into PostgreSQL, or export to SQL or columnar file
+    if args.dsn:
+        table.load_to_postgres(args.dsn, chunks)
+    elif args.output_format == 'sql':
+        table.export_to_sql_file(chunks, compress=args.compress)
+    else:
+        table.export_to_parquet(chunks, args.output_format)
 
 
 if __name__ == "__main__":
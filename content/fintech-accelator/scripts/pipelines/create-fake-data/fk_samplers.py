@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Foreign key samplers for FakeGenericTable.
+
+A sampler draws valid foreign key values for a column. Three building blocks
+are provided:
+
+- RangeSampler: lazy integer domains (e.g. SERIAL ids 1..N) that are never
+  materialized.
+- PoolSampler: explicit pools backed by compact arrays (array('q') for
+  integers, one UTF-8 blob plus an offsets array for strings); pools of
+  other or mixed types are kept as they are.
+- WeightedSampler / ZipfSampler: skewed draws over any other sampler, so
+  some keys (e.g. some cards) appear far more often than others.
+
+Every sampler supports single draws and batch draws. ``rng`` is any object
+with the interface of the ``random`` module (the module itself or a
+random.Random instance).
+"""
+import math
+from array import array
+from typing import Any, Iterable, List, Sequence, Union
+
+
+class ForeignKeySampler:
+    """Base class of foreign key samplers."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> Any:
+        raise NotImplementedError
+
+    def sample(self, rng) -> Any:
+        """Draw one value."""
+        return self.sample_batch(rng, 1)[0]
+
+    def sample_batch(self, rng, k: int) -> List[Any]:
+        """Draw k values uniformly (with replacement)."""
+        return rng.choices(self, k=k)
+
+
+class RangeSampler(ForeignKeySampler):
+    """
+    Uniform draws from the integer range [start, stop) without materializing it.
+
+    Replaces pools like ``[id for id in range(1, records + 1)]``.
+    """
+
+    def __init__(self, start: int, stop: int = None):
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError(f"Empty foreign key range: [{start}, {stop})")
+        self.domain = range(start, stop)
+
+    def __len__(self) -> int:
+        return len(self.domain)
+
+    def __getitem__(self, index: int) -> int:
+        return self.domain[index]
+
+    def sample_batch(self, rng, k: int) -> List[int]:
+        return rng.choices(self.domain, k=k)
+
+    def __repr__(self) -> str:
+        return f"RangeSampler({self.domain.start}, {self.domain.stop})"
+
+
+class StringArray(Sequence):
+    """
+    Sequence of strings stored as one UTF-8 blob plus an offsets array.
+
+    About 8 bytes of overhead per value instead of ~50 for a list of str.
+    Values can be appended (e.g. while parsing a file) but not modified.
+    """
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self._blob = bytearray()
+        self._offsets = array('Q', [0])
+        for value in values:
+            self.append(value)
+
+    def append(self, value: Any) -> None:
+        self._blob += str(value).encode('utf-8')
+        self._offsets.append(len(self._blob))
+
+    def extend(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        return self._blob[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _compact_pool(values: Sequence[Any]) -> Sequence[Any]:
+    """array('q') for 64-bit integers, StringArray for strings, the values unchanged otherwise."""
+    if all(_is_int(value) for value in values):
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values
+    if all(isinstance(value, str) for value in values):
+        return StringArray(values)
+    return values
+
+
+class PoolSampler(ForeignKeySampler):
+    """
+    Uniform draws from an explicit pool of values stored in a compact array.
+
+    Integer pools use array('q') and string pools a StringArray; any other
+    pool (floats, Decimals, None, mixed types) is kept as a list so draws
+    return the original objects. A StringArray or an array('q') is used
+    as-is, without copying it.
+    """
+
+    def __init__(self, values: Iterable[Any]):
+        if isinstance(values, StringArray) or (isinstance(values, array) and values.typecode == 'q'):
+            if not len(values):
+                raise ValueError("Foreign key pool cannot be empty")
+            self.values = values
+            return
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        if not values:
+            raise ValueError("Foreign key pool cannot be empty")
+        self.values = _compact_pool(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[index]
+
+    def sample_batch(self, rng, k: int) -> List[Any]:
+        return rng.choices(self.values, k=k)
+
+    def __repr__(self) -> str:
+        return f"PoolSampler({len(self)} values)"
+
+
+class PoolCollector:
+    """
+    Compact pool filled chunk by chunk, e.g. with the keys of a table being generated.
+
+    Values are stored in an array('q') while they are all integers and in a
+    StringArray while they are all strings, so collecting keys never builds
+    a list of every value. Other or mixed types fall back to a plain list
+    (see PoolSampler for the same storage rules).
+    """
+
+    def __init__(self):
+        self.values: Union[array, StringArray, List[Any]] = array('q')
+
+    def extend(self, values: Iterable[Any]) -> None:
+        values = values if isinstance(values, list) else list(values)
+        if isinstance(self.values, array):
+            if all(_is_int(value) for value in values):
+                try:
+                    self.values.extend(array('q', values))
+                    return
+                except OverflowError:
+                    pass
+            if not self.values and all(isinstance(value, str) for value in values):
+                self.values = StringArray()
+            else:
+                self.values = list(self.values)
+        elif isinstance(self.values, StringArray) and not all(isinstance(value, str) for value in values):
+            self.values = list(self.values)
+        self.values.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_sampler(self) -> PoolSampler:
+        """PoolSampler over the collected values (not copied)."""
+        return PoolSampler(self.values)
+
+
+class WeightedSampler(ForeignKeySampler):
+    """
+    Draws from another sampler with explicit per-position weights.
+
+    Uses Vose's alias method: O(n) setup, O(1) per draw, with the tables kept
+    in compact arrays.
+    """
+
+    def __init__(self, base: ForeignKeySampler, weights: Sequence[float]):
+        if len(weights) != len(base):
+            raise ValueError(f"Number of weights ({len(weights)}) must match pool size ({len(base)})")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("Weights must add up to a positive value")
+
+        n = len(weights)
+        self.base = base
+        self.probability = array('d', [0.0]) * n
+        self.alias = array('q', [0]) * n
+
+        scaled = array('d', (weight * n / total for weight in weights))
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        for index in large + small:
+            self.probability[index] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.base[index]
+
+    def sample_batch(self, rng, k: int) -> List[Any]:
+        rand = rng.random
+        n = len(self.probability)
+        probability, alias, base = self.probability, self.alias, self.base
+        values = []
+        for _ in range(k):
+            position = rand() * n
+            column = int(position)
+            if position - column >= probability[column]:
+                column = alias[column]
+            values.append(base[column])
+        return values
+
+
+class ZipfSampler(ForeignKeySampler):
+    """
+    Zipf-like skewed draws from another sampler in O(1) memory.
+
+    Ranks are drawn by inverting the continuous power-law CDF, then mapped to
+    pool positions through a fixed permutation so the popular keys are spread
+    over the pool instead of being its first entries.
+    """
+
+    def __init__(self, base: ForeignKeySampler, exponent: float = 1.1, permutation_key: int = 0x9E3779B97F4A7C15):
+        if exponent <= 0:
+            raise ValueError(f"Zipf exponent must be positive, got {exponent}")
+        self.base = base
+        self.exponent = exponent
+        n = len(base)
+        self._n = n
+
+        # Multiplier coprime with n makes rank -> position a permutation
+        multiplier = permutation_key % n or 1
+        while math.gcd(multiplier, n) != 1:
+            multiplier += 1
+        self._multiplier = multiplier
+        self._offset = (permutation_key >> 17) % n
+
+        if exponent == 1.0:
+            self._log_top = math.log(n + 1)
+        else:
+            self._one_minus_s = 1.0 - exponent
+            self._top = (n + 1) ** self._one_minus_s
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, index: int) -> Any:
+        return self.base[index]
+
+    def sample_batch(self, rng, k: int) -> List[Any]:
+        rand = rng.random
+        n, multiplier, offset, base = self._n, self._multiplier, self._offset, self.base
+        values = []
+        if self.exponent == 1.0:
+            log_top = self._log_top
+            for _ in range(k):
+                rank = min(int(math.exp(rand() * log_top)), n)
+                values.append(base[((rank - 1) * multiplier + offset) % n])
+        else:
+            one_minus_s, top = self._one_minus_s, self._top
+            inverse = 1.0 / one_minus_s
+            for _ in range(k):
+                rank = min(int((1.0 + rand() * (top - 1.0)) ** inverse), n)
+                values.append(base[((rank - 1) * multiplier + offset) % n])
+        return values
+
+
+def as_sampler(values: Union[ForeignKeySampler, range, Iterable[Any]]) -> ForeignKeySampler:
+    """
+    Wrap a foreign key specification into a sampler.
+
+    Args:
+        values: A sampler (returned as-is), a range (lazy RangeSampler with
+                step 1) or any iterable of values (PoolSampler)
+
+    Returns:
+        Foreign key sampler
+    """
+    if isinstance(values, ForeignKeySampler):
+        return values
+    if isinstance(values, range) and values.step == 1:
+        return RangeSampler(values.start, values.stop)
+    return PoolSampler(values)
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Binary, memory-mapped foreign key store (.fkb).
+
+FK-Values text files have to be parsed into Python lists of strings by every
+consuming script. A .fkb file holds the same columns in a layout that can be
+memory-mapped read-only and sampled in place:
+
+- integer columns: fixed-width little-endian int64 values
+- other columns: one UTF-8 blob plus an array of n + 1 uint64 end offsets
+
+Layout (all integers little-endian, every section aligned to 8 bytes)::
+
+    header      magic b'FKB1', version u16, column count u16, row count u64
+    columns     kind (b'q' or b's'), pad, name length u16,
+                data offset u64, data size u64, offsets offset u64, name
+    sections    column data (and offsets) at the recorded positions
+
+The file is written through temporary spill files, so the writer only keeps
+one chunk in memory, and renamed into place when complete. Pages of a mapped
+store are shared by every process that maps it (and by forked workers of the
+process that opened it), so N workers sampling 10M keys cost one copy in the
+page cache instead of N lists of str.
+"""
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Any, Dict, List, Sequence, Union
+
+from fk_samplers import ForeignKeySampler
+
+
+STORE_EXTENSION = '.fkb'
+STORE_MAGIC = b'FKB1'
+STORE_VERSION = 1
+
+_HEADER = struct.Struct('<4sHHQ')
+_COLUMN = struct.Struct('<cxHQQQ')
+_ALIGNMENT = 8
+_INT_KIND = b'q'
+_STR_KIND = b's'
+
+
+def foreign_key_store_path(text_path: str) -> str:
+    """
+    Path of the binary store matching an FK-Values text file.
+
+    Args:
+        text_path: Path of the FK-Values file (.txt or .txt.gz)
+
+    Returns:
+        Same path with the .fkb extension
+    """
+    base = text_path[:-3] if text_path.endswith('.gz') else text_path
+    return os.path.splitext(base)[0] + STORE_EXTENSION
+
+
+def _is_int_column(values: Sequence[Any]) -> bool:
+    return all(isinstance(value, int) and not isinstance(value, bool) for value in values)
+
+
+def _pad(file, position: int) -> None:
+    """Write zero bytes up to the next aligned position."""
+    file.write(b'\0' * (-position % _ALIGNMENT))
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+class ForeignKeyStoreWriter:
+    """
+    Writes a .fkb store chunk by chunk.
+
+    The kind of each column (int64 or string) is taken from the first chunk;
+    values are spilled to temporary files and assembled by close().
+    """
+
+    def __init__(self, file_path: str, columns: List[str]):
+        if not columns:
+            raise ValueError("A foreign key store needs at least one column")
+        self.file_path = file_path
+        self.columns = columns
+        self.rows = 0
+        self._kinds: List[bytes] = []
+        self._data = []
+        self._offsets = []
+        self._positions: List[int] = []
+        self._closed = False
+
+    def write_columns(self, column_values: Sequence[Sequence[Any]]) -> None:
+        """
+        Append rows given column-wise (one sequence per column, in column order).
+
+        Args:
+            column_values: Values of each column, all of the same length
+        """
+        if not self._kinds:
+            directory = os.path.dirname(os.path.abspath(self.file_path))
+            for values in column_values:
+                self._kinds.append(_INT_KIND if _is_int_column(values) else _STR_KIND)
+                self._data.append(tempfile.TemporaryFile(dir=directory))
+                self._offsets.append(tempfile.TemporaryFile(dir=directory))
+                self._positions.append(0)
+                _little_endian(array('Q', [0])).tofile(self._offsets[-1])
+
+        for index, values in enumerate(column_values):
+            if self._kinds[index] == _INT_KIND:
+                if not _is_int_column(values):
+                    raise TypeError(f"Column '{self.columns[index]}' mixes integers with other values")
+                _little_endian(array('q', values)).tofile(self._data[index])
+                continue
+
+            ends = array('Q')
+            position = self._positions[index]
+            parts = []
+            for value in values:
+                encoded = str(value).encode('utf-8')
+                parts.append(encoded)
+                position += len(encoded)
+                ends.append(position)
+            self._data[index].write(b''.join(parts))
+            _little_endian(ends).tofile(self._offsets[index])
+            self._positions[index] = position
+
+        self.rows += len(column_values[0]) if column_values else 0
+
+    def write_records(self, records: Sequence[Dict[str, Any]]) -> None:
+        """
+        Append rows given as record dictionaries.
+
+        Args:
+            records: Records holding (at least) the store's columns
+        """
+        if records:
+            self.write_columns([[record[column] for record in records] for column in self.columns])
+
+    def close(self) -> None:
+        """Assemble the store and move it into place."""
+        if self._closed:
+            return
+        self._closed = True
+        if not self._kinds:
+            # No rows: every column is an empty string column
+            self._kinds = [_STR_KIND] * len(self.columns)
+            self._data = [tempfile.TemporaryFile() for _ in self.columns]
+            self._offsets = [tempfile.TemporaryFile() for _ in self.columns]
+            for offsets in self._offsets:
+                _little_endian(array('Q', [0])).tofile(offsets)
+
+        names = [column.encode('utf-8') for column in self.columns]
+        position = _HEADER.size + sum(_COLUMN.size + len(name) for name in names)
+        position += -position % _ALIGNMENT
+        layout = []
+        for kind, data, offsets in zip(self._kinds, self._data, self._offsets):
+            data_size = data.seek(0, os.SEEK_END)
+            data_offset, position = position, position + data_size
+            position += -position % _ALIGNMENT
+            offsets_offset = 0
+            if kind == _STR_KIND:
+                offsets_offset = position
+                position += offsets.seek(0, os.SEEK_END)
+            layout.append((data_offset, data_size, offsets_offset))
+
+        temporary_path = f"{self.file_path}.tmp"
+        try:
+            with open(temporary_path, 'wb') as out:
+                out.write(_HEADER.pack(STORE_MAGIC, STORE_VERSION, len(self.columns), self.rows))
+                for kind, name, (data_offset, data_size, offsets_offset) in zip(self._kinds, names, layout):
+                    out.write(_COLUMN.pack(kind, len(name), data_offset, data_size, offsets_offset))
+                    out.write(name)
+                _pad(out, out.tell())
+                for kind, data, offsets in zip(self._kinds, self._data, self._offsets):
+                    data.seek(0)
+                    shutil.copyfileobj(data, out)
+                    _pad(out, out.tell())
+                    if kind == _STR_KIND:
+                        offsets.seek(0)
+                        shutil.copyfileobj(offsets, out)
+            os.replace(temporary_path, self.file_path)
+        finally:
+            self._release()
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def abort(self) -> None:
+        """Drop the spilled data without writing the store."""
+        self._closed = True
+        self._release()
+
+    def _release(self) -> None:
+        for spill in self._data + self._offsets:
+            spill.close()
+        self._data, self._offsets = [], []
+
+
+class _MappedStringColumn(Sequence):
+    """Read-only sequence of strings decoded on access from a mapped blob and offsets array."""
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+
+class ForeignKeyStore:
+    """
+    Read-only, memory-mapped view of a .fkb store.
+
+    Columns are returned as sequences over the mapped pages: integer columns
+    as memoryviews of int64, string columns decoded one value at a time.
+    """
+
+    def __init__(self, file_path: str):
+        if sys.byteorder == 'big':
+            raise RuntimeError("Foreign key stores are little-endian and cannot be mapped on this platform")
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        magic, version, column_count, self.rows = _HEADER.unpack_from(buffer, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            buffer.release()
+            self._mmap.close()
+            raise ValueError(f"Not a foreign key store (version {STORE_VERSION}): {file_path}")
+
+        self._views: Dict[str, Sequence[Any]] = {}
+        self._buffers = [buffer]
+        self.columns: List[str] = []
+        position = _HEADER.size
+        for _ in range(column_count):
+            kind, name_size, data_offset, data_size, offsets_offset = _COLUMN.unpack_from(buffer, position)
+            position += _COLUMN.size
+            name = bytes(buffer[position:position + name_size]).decode('utf-8')
+            position += name_size
+
+            data = buffer[data_offset:data_offset + data_size]
+            self._buffers.append(data)
+            if kind == _INT_KIND:
+                view = data.cast('q')
+                self._buffers.append(view)
+            else:
+                offsets = buffer[offsets_offset:offsets_offset + 8 * (self.rows + 1)].cast('Q')
+                self._buffers.append(offsets)
+                view = _MappedStringColumn(data, offsets)
+            self.columns.append(name)
+            self._views[name] = view
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, column: Union[str, int]) -> Sequence[Any]:
+        """
+        Values of one column, backed by the mapped file.
+
+        Args:
+            column: Column name, or 1-based column number (as in read_column_data)
+
+        Returns:
+            Sequence of the column's values
+        """
+        if isinstance(column, int):
+            if not 1 <= column <= len(self.columns):
+                raise ValueError(f"Store {self.file_path} has only {len(self.columns)} columns")
+            column = self.columns[column - 1]
+        if column not in self._views:
+            raise KeyError(f"Column '{column}' not found in {self.file_path}")
+        return self._views[column]
+
+    def close(self) -> None:
+        """Unmap the file (sequences returned by column() become unusable)."""
+        self._views.clear()
+        for view in reversed(self._buffers):
+            view.release()
+        self._buffers = []
+        self._mmap.close()
+
+
+def concat_foreign_key_stores(target_path: str, source_paths: Sequence[str], batch_size: int = 100_000) -> int:
+    """
+    Write the rows of several stores with the same columns, one after the other, into a store.
+
+    The target may be one of the sources (e.g. appending a delta store to
+    the cumulative one): the result is written aside and renamed into place.
+
+    Args:
+        target_path: Path of the resulting store
+        source_paths: Stores to concatenate, in order
+        batch_size: Rows copied at a time
+
+    Returns:
+        Number of rows of the resulting store
+    """
+    stores = [ForeignKeyStore(path) for path in source_paths]
+    writer = None
+    try:
+        columns = stores[0].columns
+        for store in stores[1:]:
+            if store.columns != columns:
+                raise ValueError(f"Columns of {store.file_path} ({store.columns}) do not match {columns}")
+        writer = ForeignKeyStoreWriter(target_path, columns)
+        for store in stores:
+            views = [store.column(column) for column in columns]
+            for start in range(0, len(store), batch_size):
+                end = min(start + batch_size, len(store))
+                writer.write_columns([[view[index] for index in range(start, end)] for view in views])
+    except BaseException:
+        if writer:
+            writer.abort()
+        raise
+    finally:
+        # Unmapped before the target is replaced (a mapped file cannot be replaced on Windows)
+        for store in stores:
+            store.close()
+    writer.close()
+    return writer.rows
+
+
+class MappedPoolSampler(ForeignKeySampler):
+    """
+    Uniform draws from one column of a memory-mapped .fkb store.
+
+    Draws read the mapped pages directly; nothing is copied into Python
+    lists. Pickling keeps only the path and the column, the receiving
+    process maps the file again.
+
+    Args:
+        file_path: Path of the .fkb store
+        column: Column name, or 1-based column number
+        as_text: Return the values of integer columns as str, like a pool
+                 read from the FK-Values text file, so the same seed gives
+                 the same values whichever file is used
+    """
+
+    def __init__(self, file_path: str, column: Union[str, int] = 1, as_text: bool = False):
+        self.file_path = file_path
+        self.column = column
+        self.as_text = as_text
+        self.store = ForeignKeyStore(file_path)
+        self.values = self.store.column(column)
+        if not len(self.values):
+            raise ValueError(f"Foreign key pool cannot be empty: {file_path}")
+        self._to_text = as_text and isinstance(self.values, memoryview)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Any:
+        value = self.values[index]
+        return str(value) if self._to_text else value
+
+    def sample_batch(self, rng, k: int) -> List[Any]:
+        values = rng.choices(self.values, k=k)
+        return list(map(str, values)) if self._to_text else values
+
+    def __reduce__(self):
+        return MappedPoolSampler, (self.file_path, self.column, self.as_text)
+
+    def __repr__(self) -> str:
+        return f"MappedPoolSampler({self.file_path!r}, {self.column!r}, {len(self)} values)"
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Batched numeric providers for FakeGenericTable.
+
+Faker's pydecimal, latitude/longitude and random_number validate their
+arguments and build every value through several Python calls. The
+providers here draw integers from the seeded stream and scale them once:
+
+- MoneyProvider: amounts of a DECIMAL(precision, scale) column, uniform,
+  lognormal or Pareto distributed, always within the column bounds
+- LatitudeProvider / LongitudeProvider: DECIMAL(10,6) coordinates
+- DigitStringProvider: fixed-width digit strings with optional prefix and
+  suffixes (ids like 'TS-0123...9AM')
+
+They are locale independent, so each column is filled once per chunk, and
+can be used by name in the provider list (see NUMERIC_PROVIDERS and
+resolve_numeric_provider), e.g. ``'money'`` or
+``{'method': 'money', 'distribution': 'lognormal', 'median': 35}``.
+"""
+import math
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from faker import Faker
+
+from batch_providers import BatchProvider
+
+
+MONEY_DISTRIBUTIONS = ('uniform', 'lognormal', 'pareto')
+
+# Times a lognormal or Pareto draw outside the bounds is redrawn before it is clamped
+_MAX_REDRAWS = 8
+
+
+def decimal_bounds(precision: int, scale: int) -> int:
+    """
+    Largest unscaled value of a DECIMAL(precision, scale) column.
+
+    Args:
+        precision: Total number of digits
+        scale: Digits after the decimal point
+
+    Returns:
+        10**precision - 1, e.g. 999999999999999 (9999999999999.99) for DECIMAL(15,2)
+    """
+    if not 0 <= scale <= precision:
+        raise ValueError(f"Invalid DECIMAL({precision},{scale})")
+    return 10 ** precision - 1
+
+
+class _ScaledDecimalProvider(BatchProvider):
+    """Values drawn as integers in [low, high] units of 10**-scale, returned as Decimal."""
+
+    locale_independent = True
+
+    def __init__(self, low: float, high: float, precision: int, scale: int):
+        limit = decimal_bounds(precision, scale)
+        self.precision = precision
+        self.scale = scale
+        self.unit = Decimal(1).scaleb(-scale)
+        self.low = round(Decimal(str(low)) / self.unit)
+        self.high = round(Decimal(str(high)) / self.unit)
+        if self.low > self.high:
+            raise ValueError(f"Invalid range: low ({low}) is greater than high ({high})")
+        if self.low < -limit or self.high > limit:
+            raise ValueError(f"Range [{low}, {high}] does not fit DECIMAL({precision},{scale})")
+
+    def _to_decimals(self, units: List[int]) -> List[Decimal]:
+        unit = self.unit
+        # Decimal(int) * unit keeps the trailing zeros of the scale (12.00, not 12)
+        return [Decimal(value) * unit for value in units]
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Decimal]:
+        randrange = faker.random.randrange
+        low, span = self.low, self.high - self.low + 1
+        return self._to_decimals([low + randrange(span) for _ in rows])
+
+
+class MoneyProvider(_ScaledDecimalProvider):
+    """
+    Positive monetary amounts of a DECIMAL(precision, scale) column.
+
+    Replaces lambdas like ``faker.pydecimal(left_digits=13, right_digits=2, positive=True)``.
+
+    Args:
+        low: Smallest amount (default: one cent)
+        high: Largest amount (default: the largest value of the column)
+        distribution: 'uniform' over [low, high]; 'lognormal' around ``median``
+                      with spread ``sigma`` (typical card payments); 'pareto'
+                      from ``low`` with tail index ``alpha`` (many small, few
+                      very large amounts)
+        median: Median amount of the lognormal distribution
+        sigma: Standard deviation of log(amount) of the lognormal distribution
+        alpha: Tail index of the Pareto distribution
+        precision: Total digits of the column
+        scale: Decimal places of the column
+    """
+
+    def __init__(self,
+                 low: float = 0.01,
+                 high: Optional[float] = None,
+                 distribution: str = 'uniform',
+                 median: float = 50.0,
+                 sigma: float = 1.0,
+                 alpha: float = 1.16,
+                 precision: int = 15,
+                 scale: int = 2):
+        if distribution not in MONEY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution} (expected one of {MONEY_DISTRIBUTIONS})")
+        if low <= 0:
+            raise ValueError(f"Money amounts must be positive, got low={low}")
+        if high is None:
+            high = Decimal(decimal_bounds(precision, scale)).scaleb(-scale)
+        super().__init__(low, high, precision, scale)
+        self.distribution = distribution
+        self.mu = math.log(median)
+        self.sigma = sigma
+        self.alpha = alpha
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Decimal]:
+        if self.distribution == 'uniform':
+            return super().batch(faker, rows)
+
+        rng = faker.random
+        if self.distribution == 'lognormal':
+            mu, sigma = self.mu, self.sigma
+            draw = lambda: rng.lognormvariate(mu, sigma)
+        else:
+            minimum, alpha = float(self.low * self.unit), self.alpha
+            draw = lambda: minimum * rng.paretovariate(alpha)
+
+        low, high, units_per_one = self.low, self.high, 10 ** self.scale
+        units = []
+        for _ in rows:
+            for _ in range(_MAX_REDRAWS):
+                value = round(draw() * units_per_one)
+                if low <= value <= high:
+                    break
+            units.append(min(max(value, low), high))
+        return self._to_decimals(units)
+
+
+class LatitudeProvider(_ScaledDecimalProvider):
+    """
+    Uniform latitudes of a DECIMAL(10,6) column, in [-90, 90] by default.
+
+    Replaces ``faker.latitude()`` (same range and decimal places).
+    """
+
+    def __init__(self, low: float = -90.0, high: float = 90.0, precision: int = 10, scale: int = 6):
+        if low < -90 or high > 90:
+            raise ValueError(f"Latitudes must be within [-90, 90], got [{low}, {high}]")
+        super().__init__(low, high, precision, scale)
+
+
+class LongitudeProvider(_ScaledDecimalProvider):
+    """
+    Uniform longitudes of a DECIMAL(10,6) column, in [-180, 180] by default.
+
+    Replaces ``faker.longitude()`` (same range and decimal places).
+    """
+
+    def __init__(self, low: float = -180.0, high: float = 180.0, precision: int = 10, scale: int = 6):
+        if low < -180 or high > 180:
+            raise ValueError(f"Longitudes must be within [-180, 180], got [{low}, {high}]")
+        super().__init__(low, high, precision, scale)
+
+
+class DigitStringProvider(BatchProvider):
+    """
+    Fixed-width strings of random digits, with an optional prefix and suffix.
+
+    Replaces lambdas like ``f"TS-{faker.random_number(digits=25)}{random.choice(['AM', 'PM'])}"``;
+    the digits are zero-padded, so every value has the same length.
+
+    Args:
+        digits: Number of digits
+        prefix: Text before the digits
+        suffixes: Texts drawn uniformly and appended after the digits
+    """
+
+    locale_independent = True
+
+    def __init__(self, digits: int = 10, prefix: str = '', suffixes: Optional[Sequence[str]] = None):
+        if digits <= 0:
+            raise ValueError(f"digits must be positive, got {digits}")
+        self.digits = digits
+        self.prefix = prefix
+        self.suffixes = list(suffixes) if suffixes else None
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[str]:
+        rng = faker.random
+        randrange, limit, digits, prefix = rng.randrange, 10 ** self.digits, self.digits, self.prefix
+        values = [f"{prefix}{randrange(limit):0{digits}d}" for _ in rows]
+        if self.suffixes:
+            values = [value + suffix for value, suffix in zip(values, rng.choices(self.suffixes, k=len(values)))]
+        return values
+
+
+# Provider names usable in FakeGenericTable's provider list, as a string or as
+# the 'method' of a dict with the constructor arguments
+NUMERIC_PROVIDERS: Dict[str, type] = {
+    'money': MoneyProvider,
+    'geo_latitude': LatitudeProvider,
+    'geo_longitude': LongitudeProvider,
+    'digit_string': DigitStringProvider,
+}
+
+
+def resolve_numeric_provider(provider_info: Union[str, Dict, Any]) -> Any:
+    """
+    Build the numeric provider named by a provider specification.
+
+    Args:
+        provider_info: Provider specification of a column
+
+    Returns:
+        A provider instance for a name of NUMERIC_PROVIDERS (string or dict
+        'method'), the specification unchanged otherwise
+    """
+    if isinstance(provider_info, str) and provider_info in NUMERIC_PROVIDERS:
+        return NUMERIC_PROVIDERS[provider_info]()
+    if isinstance(provider_info, dict) and provider_info.get('method') in NUMERIC_PROVIDERS:
+        params = {key: value for key, value in provider_info.items() if key != 'method'}
+        return NUMERIC_PROVIDERS[provider_info['method']](**params)
+    return provider_info
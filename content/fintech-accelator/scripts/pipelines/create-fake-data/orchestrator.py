@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+In-process, dependency-aware generation of the whole fintech dataset.
+
+Each table is generated by the generate_data_dummy function of its entity
+script (class/*_fake_fintech.py). A table starts as soon as the tables it
+references are done, so independent tables (clients, issuers,
+merchant_locations) run in parallel in forked processes. The key columns
+other tables reference are handed back to the parent as compact
+PoolSampler pools and passed in memory to the dependent tables, which
+inherit them through fork instead of re-reading FK-Values files. Static
+FK files read by several tables are parsed once, before forking.
+"""
+import importlib
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from fk_samplers import PoolCollector, PoolSampler
+
+
+CLASS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'class')
+
+FK_VALUES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'data', 'sql', 'FK-Values')
+
+# FK-Values files shipped with the repository and read by several tables
+SHARED_FK_FILES = ('FK-FINTECH-COUNTRIES.txt',)
+
+
+class TableSpec(NamedTuple):
+    """How to generate one table and what it needs from the others."""
+    # Entity script in class/ exposing generate_data_dummy
+    module: str
+    # Tables that must be generated first
+    depends_on: Tuple[str, ...] = ()
+    # Key columns exported to FK-Values and handed to dependent tables
+    exports: Tuple[str, ...] = ()
+    # FK column -> (table, exported column) it is drawn from
+    foreign_keys: Dict[str, Tuple[str, str]] = {}
+    # FK column -> table whose SERIAL range (1..rows) it is drawn from
+    serial_keys: Dict[str, str] = {}
+    # Whether generate_data_dummy takes the number of records (SERIAL key ranges)
+    takes_records: bool = False
+
+
+# Listed in the order of the file prefixes (start_prefix, start_prefix + 1, ...)
+FINTECH_TABLES: Dict[str, TableSpec] = {
+    'clients': TableSpec('clients_fake_fintech', exports=('client_id',)),
+    'issuers': TableSpec('issuers_fake_fintech', exports=('issuer_id',)),
+    'franchises': TableSpec(
+        'franchises_fake_fintech',
+        depends_on=('issuers',),
+        foreign_keys={'issuer_id': ('issuers', 'issuer_id')},
+    ),
+    'merchant_locations': TableSpec('merchant_locations_fake_fintech'),
+    'credit_cards': TableSpec(
+        'credit_cards_fake_fintech',
+        depends_on=('clients', 'franchises'),
+        exports=('card_id',),
+        foreign_keys={'client_id': ('clients', 'client_id')},
+        serial_keys={'franchise_id': 'franchises'},
+        takes_records=True,
+    ),
+    'transactions': TableSpec(
+        'transactions_fake_fintech',
+        depends_on=('credit_cards', 'merchant_locations'),
+        foreign_keys={'card_id': ('credit_cards', 'card_id')},
+        serial_keys={'location_id': 'merchant_locations'},
+        takes_records=True,
+    ),
+}
+
+
+class TableResult(NamedTuple):
+    """Outcome of the generation of one table."""
+    table: str
+    records: int
+    # Time spent generating and exporting inside the worker
+    generate_seconds: float
+    # Time from start to pools received by the parent
+    wall_seconds: float
+    pools: Dict[str, PoolSampler]
+
+
+def dependency_order(tables: Dict[str, TableSpec]) -> List[str]:
+    """
+    Order tables so every table comes after the tables it depends on.
+
+    Args:
+        tables: Table specifications by name
+
+    Returns:
+        Table names in a valid generation order (stable w.r.t. the dict order)
+    """
+    order: List[str] = []
+    visiting = set()
+
+    def visit(name: str) -> None:
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle involving table '{name}'")
+        if name not in tables:
+            raise KeyError(f"Unknown table '{name}'")
+        visiting.add(name)
+        for dependency in tables[name].depends_on:
+            visit(dependency)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in tables:
+        visit(name)
+    return order
+
+
+def _load_entity_module(module_name: str):
+    """Import an entity script from class/ ('class' is a keyword, so no package import)."""
+    if CLASS_DIR not in sys.path:
+        sys.path.append(CLASS_DIR)
+    return importlib.import_module(module_name)
+
+
+def _preload_shared_files() -> None:
+    """Parse the shared FK-Values files into the column cache inherited by the table processes."""
+    read_columns_data = _load_entity_module('read_columns_from_file').read_columns_data
+    for file_name in SHARED_FK_FILES:
+        file_path = os.path.join(FK_VALUES_DIR, file_name)
+        if os.path.exists(file_path):
+            read_columns_data(file_path, [1])
+
+
+def _generate_table(table: str,
+                    spec: TableSpec,
+                    pools: Dict[str, PoolSampler],
+                    prefix: str,
+                    options: Dict[str, Any]) -> Tuple[int, float, Dict[str, PoolSampler]]:
+    """
+    Generate and export one table, collecting its exported key columns.
+
+    Args:
+        table: Table name
+        spec: Table specification
+        pools: Pools exported by the tables already generated, by (table.column)
+        prefix: Prefix of the output files
+        options: Generation and export options of the run
+
+    Returns:
+        Tuple of (records, seconds, exported pools by column)
+    """
+    start = time.perf_counter()
+    module = _load_entity_module(spec.module)
+    records = options['records'][table]
+
+    foreign_keys = {
+        column: pools[f"{source}.{source_column}"]
+        for column, (source, source_column) in spec.foreign_keys.items()
+    }
+    for column, source in spec.serial_keys.items():
+        foreign_keys[column] = range(1, options['records'][source] + 1)
+    kwargs: Dict[str, Any] = {'auto_prefix': prefix, 'foreign_keys': foreign_keys}
+    if spec.takes_records:
+        kwargs['records'] = records
+    if table == 'transactions' and options.get('card_skew'):
+        kwargs['card_skew'] = options['card_skew']
+    data_table = module.generate_data_dummy(**kwargs)
+    data_table.save_state = options['save_state']
+
+    chunks = data_table.iter_fake_data(
+        num_records=records,
+        seed=options['seed'],
+        variability=options['variability'],
+        chunk_size=options['chunk_size'],
+        workers=options['workers'],
+    )
+
+    # Keys are appended to compact arrays chunk by chunk, never to a list of every key
+    collected: Dict[str, PoolCollector] = {column: PoolCollector() for column in spec.exports}
+
+    def collect(chunk_iter: Iterator[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        for chunk in chunk_iter:
+            for column, values in collected.items():
+                values.extend([record[column] for record in chunk])
+            yield chunk
+
+    output_format = options['output_format']
+    exported_records = data_table.export_chunks(
+        collect(chunks),
+        list(spec.exports) or None,
+        write_sql=output_format == 'sql',
+        columnar_format=None if output_format == 'sql' else output_format,
+        compress=options['compress'],
+    )
+
+    exported = {column: values.to_sampler() for column, values in collected.items() if len(values)}
+    return exported_records, time.perf_counter() - start, exported
+
+
+def _table_process(conn, table: str, spec: TableSpec, pools, prefix: str, options: Dict[str, Any]) -> None:
+    """Body of a forked table worker: send (status, payload) back to the parent."""
+    try:
+        conn.send(('ok', _generate_table(table, spec, pools, prefix, options)))
+    except BaseException:
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def run_pipeline(records: Union[int, Dict[str, int]],
+                 variability: float = 0.25,
+                 start_prefix: int = 3,
+                 seed: int = 42,
+                 workers: int = 1,
+                 chunk_size: int = 10_000,
+                 parallel: Optional[int] = None,
+                 output_format: str = 'sql',
+                 compress: bool = False,
+                 card_skew: Optional[float] = None,
+                 save_state: bool = False,
+                 tables: Optional[Dict[str, TableSpec]] = None,
+                 logger=None) -> Dict[str, TableResult]:
+    """
+    Generate every table of the dataset in one invocation.
+
+    Args:
+        records: Number of records of every table, or by table name (e.g.
+                 the row counts of a scale factor, see scale_planner.py)
+        variability: Locale variability (0-1)
+        start_prefix: Prefix number of the first table; the others follow in
+                      the order of ``tables``
+        seed: Random seed
+        workers: Worker processes used inside each table (see iter_fake_data)
+        chunk_size: Records per generated chunk (see iter_fake_data)
+        parallel: Tables generated at the same time (default: CPU count).
+                  1, or a platform without fork, runs tables one by one in
+                  this process
+        output_format: 'sql', 'parquet' or 'arrow'
+        compress: Write gzip-compressed SQL and FK-Values files
+        card_skew: Zipf exponent of transactions.card_id (None for uniform)
+        save_state: Record the state of every table, so rows can be appended
+                    later (see FakeGenericTable.append_records)
+        tables: Table specifications (default: FINTECH_TABLES)
+        logger: Logger for progress and timings (default: print)
+
+    Returns:
+        Result of each table, by table name
+
+    Raises:
+        RuntimeError: If a table fails (tables depending on it are skipped)
+    """
+    tables = tables or FINTECH_TABLES
+    log = logger.info if logger else print
+    order = dependency_order(tables)
+    if isinstance(records, int):
+        records = {name: records for name in tables}
+    missing = [name for name in tables if name not in records]
+    if missing:
+        raise KeyError(f"No record count for tables: {', '.join(missing)}")
+    prefixes = {name: f"{start_prefix + index:02d}" for index, name in enumerate(tables)}
+    options = {
+        'records': records,
+        'seed': seed,
+        'variability': variability,
+        'workers': workers,
+        'chunk_size': chunk_size,
+        'output_format': output_format,
+        'compress': compress,
+        'card_skew': card_skew,
+        'save_state': save_state,
+    }
+    parallel = parallel or os.cpu_count() or 1
+    use_fork = parallel > 1 and 'fork' in multiprocessing.get_all_start_methods()
+
+    pools: Dict[str, PoolSampler] = {}
+    results: Dict[str, TableResult] = {}
+    run_start = time.perf_counter()
+    _preload_shared_files()
+
+    def finish(table: str, started: float, outcome: Tuple[int, float, Dict[str, PoolSampler]]) -> None:
+        table_records, generate_seconds, exported = outcome
+        for column, pool in exported.items():
+            pools[f"{table}.{column}"] = pool
+        results[table] = TableResult(table, table_records, generate_seconds, time.perf_counter() - started, exported)
+        log(f"Table {table} done: {table_records} records in {generate_seconds:.2f}s")
+
+    if not use_fork:
+        for table in order:
+            log(f"Generating {table} (prefix {prefixes[table]})")
+            started = time.perf_counter()
+            finish(table, started, _generate_table(table, tables[table], pools, prefixes[table], options))
+    else:
+        context = multiprocessing.get_context('fork')
+        pending = list(order)
+        running: Dict[Any, Tuple[str, Any, float]] = {}
+        failed: Optional[str] = None
+
+        while pending or running:
+            # Start every table whose dependencies are done, up to the parallelism limit
+            if failed is None:
+                for table in list(pending):
+                    if len(running) >= parallel:
+                        break
+                    if all(dependency in results for dependency in tables[table].depends_on):
+                        pending.remove(table)
+                        parent_conn, child_conn = context.Pipe(duplex=False)
+                        process = context.Process(
+                            target=_table_process,
+                            args=(child_conn, table, tables[table], pools, prefixes[table], options),
+                            name=f"generate-{table}",
+                        )
+                        process.start()
+                        child_conn.close()
+                        running[parent_conn] = (table, process, time.perf_counter())
+                        log(f"Generating {table} (prefix {prefixes[table]})")
+            elif not running:
+                break
+
+            for conn in wait(list(running)):
+                table, process, started = running.pop(conn)
+                try:
+                    status, payload = conn.recv()
+                except EOFError:
+                    status, payload = 'error', f"worker exited with code {process.exitcode}"
+                conn.close()
+                process.join()
+                if status == 'ok':
+                    finish(table, started, payload)
+                else:
+                    failed = failed or table
+                    log(f"Table {table} failed:\n{payload}")
+
+        if failed is not None:
+            skipped = [table for table in order if table not in results and table != failed]
+            raise RuntimeError(f"Table {failed} failed; not generated: {', '.join(skipped) or 'none'}")
+
+    total_seconds = time.perf_counter() - run_start
+    log("Per-table timings:")
+    for table in order:
+        result = results[table]
+        rate = result.records / result.generate_seconds if result.generate_seconds else 0.0
+        log(f"  {table:<20} {result.records:>10} records  {result.generate_seconds:8.2f}s  {rate:10,.0f} rows/s")
+    log(f"All {len(results)} tables generated in {total_seconds:.2f}s")
+    return results
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Scale factors and a memory/time planner for the whole fintech dataset.
+
+A scale factor (SF) fixes the row count of every table from its rows at
+SF1, like the TPC benchmarks, so the ratios between tables (cards per
+client, transactions per card, ...) stay the same at every size:
+
+    SF1      100K clients, 150K cards, 1M transactions
+    SF10     1M clients, 1.5M cards, 10M transactions
+    SF100    10M clients, 15M cards, 100M transactions
+
+The planner estimates the SQL output size, the peak memory and the runtime
+of orchestrator.run_pipeline for a scale factor, and picks the chunk size,
+the worker processes per table and the tables generated at the same time
+that finish first within a memory budget (by default 75% of the host RAM).
+The estimates come from per-table costs measured on a reference machine,
+or from a benchmark_generator.py results file measured on the host.
+"""
+import json
+import math
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+from orchestrator import FINTECH_TABLES, TableSpec, dependency_order
+
+
+# Rows of each table at scale factor 1
+ROWS_PER_SCALE_FACTOR: Dict[str, int] = {
+    'clients': 100_000,
+    'issuers': 1_000,
+    'franchises': 4_000,
+    'merchant_locations': 50_000,
+    # 1.5 cards per client
+    'credit_cards': 150_000,
+    # About 6.7 transactions per card
+    'transactions': 1_000_000,
+}
+
+SCALE_FACTORS: Dict[str, float] = {'SF1': 1, 'SF10': 10, 'SF100': 100}
+
+CHUNK_SIZES = (100_000, 50_000, 20_000, 10_000, 5_000, 1_000)
+
+# Share of the host RAM used as the default memory budget
+DEFAULT_MEMORY_SHARE = 0.75
+
+# Resident memory of a table process (interpreter, Faker, loaded locales) and
+# of each extra worker process forked by iter_fake_data
+PROCESS_BYTES = 120 * 1024 * 1024
+WORKER_BYTES = 80 * 1024 * 1024
+
+# Exported keys are collected into compact PoolSampler pools while a table runs,
+# and kept by the orchestrator until the end of the run
+KEY_POOL_BYTES = 40
+
+# Fixed cost of a chunk (reseeding every column, grouping rows by locale,
+# sending the shard back from a worker)
+CHUNK_SECONDS = 0.005
+
+# Speed-up of each extra worker process of a table
+WORKER_EFFICIENCY = 0.85
+
+
+class TableCost(NamedTuple):
+    """Measured cost of generating one table with one worker."""
+    # Rows generated and formatted as SQL per second
+    rows_per_second: float
+    # Size of the SQL output per row
+    output_bytes_per_row: float
+    # Memory per row of a chunk in flight (records and their SQL text)
+    chunk_bytes_per_row: float
+    # Memory per generated row kept for the whole table (unique-value trackers)
+    resident_bytes_per_row: float = 0.0
+
+
+# generate_fake_data + to_sql at 20K rows, variability 0.3, on one CPU (Python 3.12)
+DEFAULT_COSTS: Dict[str, TableCost] = {
+    'clients': TableCost(2_800, 188, 1_700, 27),
+    'issuers': TableCost(4_500, 114, 1_260, 27),
+    'franchises': TableCost(180_000, 52, 580),
+    'merchant_locations': TableCost(32_000, 85, 1_180),
+    'credit_cards': TableCost(59_000, 90, 910),
+    'transactions': TableCost(23_000, 150, 1_480, 27),
+}
+
+
+class TablePlan(NamedTuple):
+    """Estimates of one table of a plan."""
+    table: str
+    rows: int
+    output_bytes: int
+    peak_memory_bytes: int
+    seconds: float
+
+
+class ScalePlan(NamedTuple):
+    """Row counts, settings and estimates of a scale factor run."""
+    scale_factor: float
+    chunk_size: int
+    workers: int
+    parallel: int
+    tables: Dict[str, TablePlan]
+    output_bytes: int
+    peak_memory_bytes: int
+    seconds: float
+    memory_budget: Optional[int]
+
+    @property
+    def rows(self) -> Dict[str, int]:
+        """Row count of each table (the records argument of run_pipeline)."""
+        return {table: plan.rows for table, plan in self.tables.items()}
+
+    @property
+    def fits(self) -> bool:
+        """Whether the estimated peak memory is within the budget."""
+        return self.memory_budget is None or self.peak_memory_bytes <= self.memory_budget
+
+    def report(self) -> str:
+        """Multi-line summary of the plan."""
+        budget = _format_bytes(self.memory_budget) if self.memory_budget else 'unlimited'
+        lines = [f"Scale factor {self.scale_factor:g}: chunk_size={self.chunk_size}, "
+                 f"workers={self.workers}, parallel={self.parallel}",
+                 f"  {'table':<20} {'rows':>12} {'SQL output':>12} {'peak memory':>12} {'time':>10}"]
+        for plan in self.tables.values():
+            lines.append(f"  {plan.table:<20} {plan.rows:>12,} {_format_bytes(plan.output_bytes):>12} "
+                         f"{_format_bytes(plan.peak_memory_bytes):>12} {_format_seconds(plan.seconds):>10}")
+        lines.append(f"  Total: {sum(self.rows.values()):,} rows, {_format_bytes(self.output_bytes)} of SQL, "
+                     f"peak memory {_format_bytes(self.peak_memory_bytes)} (budget {budget}), "
+                     f"about {_format_seconds(self.seconds)}")
+        return "\n".join(lines)
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def parse_scale_factor(value: Union[str, float]) -> float:
+    """
+    Parse a scale factor given as a preset or a number.
+
+    Args:
+        value: 'SF10', 'sf0.1', '10' or 10
+
+    Returns:
+        Scale factor
+
+    Raises:
+        ValueError: If the scale factor is not a positive number
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        if text.upper() in SCALE_FACTORS:
+            return float(SCALE_FACTORS[text.upper()])
+        if text[:2].upper() == 'SF':
+            text = text[2:]
+        try:
+            value = float(text)
+        except ValueError:
+            raise ValueError(f"Invalid scale factor: {value!r} (expected e.g. SF10 or 0.5)") from None
+    if not value > 0:
+        raise ValueError(f"Scale factor must be positive, got {value}")
+    return float(value)
+
+
+def scale_rows(scale_factor: float, tables: Optional[Dict[str, TableSpec]] = None) -> Dict[str, int]:
+    """
+    Row count of each table at a scale factor.
+
+    Args:
+        scale_factor: Scale factor (1 = ROWS_PER_SCALE_FACTOR)
+        tables: Table specifications (default: FINTECH_TABLES)
+
+    Returns:
+        Rows by table name (at least 1 per table)
+    """
+    tables = tables or FINTECH_TABLES
+    return {name: max(1, round(ROWS_PER_SCALE_FACTOR[name] * scale_factor)) for name in tables}
+
+
+def host_memory_bytes() -> Optional[int]:
+    """Physical memory of the host, or None where sysconf does not report it."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def load_costs(file_path: str, variability: float = 0.3) -> Dict[str, TableCost]:
+    """
+    Per-table costs measured by benchmark_generator.py.
+
+    The largest benchmarked record count at the variability closest to the
+    given one is used; tables missing from the file keep DEFAULT_COSTS.
+
+    Args:
+        file_path: Results file written by benchmark_generator.py --output
+        variability: Locale variability of the planned run
+
+    Returns:
+        Cost of every table
+    """
+    with open(file_path, encoding='utf-8') as f:
+        results = json.load(f).get('results', [])
+
+    costs = dict(DEFAULT_COSTS)
+    for table, default in DEFAULT_COSTS.items():
+        table_results = [result for result in results if result['table'] == table]
+        if not table_results:
+            continue
+        closest = min(abs(result['variability'] - variability) for result in table_results)
+        table_results = [result for result in table_results if abs(result['variability'] - variability) == closest]
+        records = max(result['records'] for result in table_results)
+        operations = {result['operation']: result for result in table_results if result['records'] == records}
+        if 'generate' not in operations or 'to_sql' not in operations:
+            continue
+
+        generate, to_sql = operations['generate'], operations['to_sql']
+        peaks = [result['peak_traced_mb'] for result in (generate, to_sql) if result.get('peak_traced_mb')]
+        costs[table] = TableCost(
+            rows_per_second=records / (generate['seconds'] + to_sql['seconds']),
+            output_bytes_per_row=(to_sql['output_bytes'] / records if to_sql.get('output_bytes')
+                                  else default.output_bytes_per_row),
+            chunk_bytes_per_row=max(peaks) * 1024 * 1024 / records if peaks else default.chunk_bytes_per_row,
+            resident_bytes_per_row=default.resident_bytes_per_row,
+        )
+    return costs
+
+
+def _table_memory(spec: TableSpec, cost: TableCost, rows: int, chunk_size: int, workers: int) -> int:
+    """Peak memory of one running table (process, chunks in flight, per-row state)."""
+    chunk_rows = min(chunk_size, rows)
+    parallel_shards = workers > 1 and rows > chunk_size
+    # Sequential: the chunk being exported and the next one; parallel: up to two
+    # pending shards per worker, one shard being generated in each worker and
+    # the chunk being exported
+    in_flight = 3 * workers + 1 if parallel_shards else 2
+    memory = PROCESS_BYTES + (workers * WORKER_BYTES if parallel_shards else 0)
+    memory += in_flight * chunk_rows * cost.chunk_bytes_per_row
+    memory += rows * (cost.resident_bytes_per_row + KEY_POOL_BYTES * len(spec.exports))
+    return int(memory)
+
+
+def _simulate(tables: Dict[str, TableSpec],
+              rows: Dict[str, int],
+              costs: Dict[str, TableCost],
+              chunk_size: int,
+              workers: int,
+              parallel: int,
+              cpus: int) -> Dict[str, Any]:
+    """
+    Replay the scheduling of run_pipeline with the estimated table costs.
+
+    Tables start as soon as their dependencies are done, up to ``parallel``
+    at a time; running tables share the CPUs in proportion to their worker
+    processes.
+
+    Returns:
+        Per-table seconds and peak memory, run seconds and peak memory
+    """
+    order = dependency_order(tables)
+    remaining = {name: rows[name] / costs[name].rows_per_second
+                 + math.ceil(rows[name] / chunk_size) * CHUNK_SECONDS for name in order}
+    memory = {name: _table_memory(tables[name], costs[name], rows[name], chunk_size, workers) for name in order}
+    # Processes busy per table: a table has no more parallel shards than chunks
+    busy = {name: min(workers, cpus, math.ceil(rows[name] / chunk_size)) for name in order}
+
+    pending, running, done = list(order), {}, set()
+    clock, peak, pools = 0.0, 0, 0
+    seconds: Dict[str, float] = {}
+    while pending or running:
+        for name in list(pending):
+            if len(running) >= parallel:
+                break
+            if all(dependency in done for dependency in tables[name].depends_on):
+                pending.remove(name)
+                running[name] = clock
+        peak = max(peak, pools + sum(memory[name] for name in running))
+
+        # Every running table progresses at its speed, slowed down when they need more CPUs than there are
+        share = min(1.0, cpus / sum(busy[name] for name in running))
+        speed = {name: (1 + (busy[name] - 1) * WORKER_EFFICIENCY) * share for name in running}
+        step = min(remaining[name] / speed[name] for name in running)
+        clock += step
+        for name in list(running):
+            remaining[name] -= step * speed[name]
+            if remaining[name] <= 1e-9:
+                seconds[name] = clock - running.pop(name)
+                done.add(name)
+                pools += rows[name] * KEY_POOL_BYTES * len(tables[name].exports)
+    return {'seconds': seconds, 'memory': memory, 'run_seconds': clock, 'peak_memory': peak}
+
+
+def plan_scale_factor(scale_factor: Union[str, float],
+                      memory_budget: Optional[int] = None,
+                      cpus: Optional[int] = None,
+                      costs: Optional[Dict[str, TableCost]] = None,
+                      chunk_sizes: Sequence[int] = CHUNK_SIZES,
+                      tables: Optional[Dict[str, TableSpec]] = None) -> ScalePlan:
+    """
+    Pick the run settings of a scale factor that fit a memory budget.
+
+    Every combination of chunk size, workers per table and tables at a time
+    is estimated; the fastest one within the budget is returned (the one
+    using the least memory among equally fast ones). When none fits, the
+    plan with the lowest peak memory is returned and ``fits`` is False.
+
+    Args:
+        scale_factor: Scale factor ('SF10', 0.5, ...)
+        memory_budget: Bytes the run may use (default: 75% of the host RAM,
+                       unlimited where it cannot be read)
+        cpus: CPUs available (default: os.cpu_count())
+        costs: Per-table costs (default: DEFAULT_COSTS, see load_costs)
+        chunk_sizes: Candidate chunk sizes
+        tables: Table specifications (default: FINTECH_TABLES)
+
+    Returns:
+        The chosen plan
+    """
+    scale_factor = parse_scale_factor(scale_factor)
+    tables = tables or FINTECH_TABLES
+    costs = costs or DEFAULT_COSTS
+    cpus = cpus or os.cpu_count() or 1
+    if memory_budget is None:
+        host_memory = host_memory_bytes()
+        memory_budget = int(host_memory * DEFAULT_MEMORY_SHARE) if host_memory else None
+    rows = scale_rows(scale_factor, tables)
+
+    candidates: List[ScalePlan] = []
+    for chunk_size in chunk_sizes:
+        for workers in range(1, cpus + 1):
+            for parallel in range(1, len(tables) + 1):
+                estimate = _simulate(tables, rows, costs, chunk_size, workers, parallel, cpus)
+                table_plans = {
+                    name: TablePlan(name, rows[name], int(rows[name] * costs[name].output_bytes_per_row),
+                                    estimate['memory'][name], estimate['seconds'][name])
+                    for name in tables
+                }
+                candidates.append(ScalePlan(
+                    scale_factor=scale_factor,
+                    chunk_size=chunk_size,
+                    workers=workers,
+                    parallel=parallel,
+                    tables=table_plans,
+                    output_bytes=sum(plan.output_bytes for plan in table_plans.values()),
+                    peak_memory_bytes=estimate['peak_memory'],
+                    seconds=estimate['run_seconds'],
+                    memory_budget=memory_budget,
+                ))
+
+    fitting = [plan for plan in candidates if plan.fits]
+    if not fitting:
+        return min(candidates, key=lambda plan: plan.peak_memory_bytes)
+    # Estimates within 1% are equally fast: prefer fewer processes and less memory
+    fastest = min(plan.seconds for plan in fitting)
+    close = [plan for plan in fitting if plan.seconds <= fastest * 1.01]
+    return min(close, key=lambda plan: (plan.workers * plan.parallel, plan.peak_memory_bytes))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Row counts, size, memory and time estimates of a scale factor')
+    parser.add_argument('scale_factor', type=str, help='Scale factor: SF1, SF10, SF100 or any number (e.g. 0.1)')
+    parser.add_argument('--memory-budget', type=float, default=None,
+                        help=f'Memory budget in GB (default: {DEFAULT_MEMORY_SHARE:.0%}% of the host RAM)')
+    parser.add_argument('--cpus', type=int, default=None, help='CPUs available (default: CPU count)')
+    parser.add_argument('--costs', type=str, default=None,
+                        help='benchmark_generator.py results file to estimate from (default: built-in costs)')
+    parser.add_argument('--variability', type=float, default=0.3, help='Locale variability of the run')
+    args = parser.parse_args()
+    try:
+        scale_factor = parse_scale_factor(args.scale_factor)
+    except ValueError as e:
+        parser.error(str(e))
+
+    plan = plan_scale_factor(
+        scale_factor,
+        memory_budget=int(args.memory_budget * 1024 ** 3) if args.memory_budget else None,
+        cpus=args.cpus,
+        costs=load_costs(args.costs, args.variability) if args.costs else None,
+    )
+    print(plan.report())
+    if not plan.fits:
+        print("⚠️ No settings fit the memory budget; the plan with the lowest peak memory is shown")
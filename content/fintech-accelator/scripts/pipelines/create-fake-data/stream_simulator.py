@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Live transaction stream for load testing the fintech schema.
+
+Instead of one bulk file, transactions are inserted continuously into
+PostgreSQL at a target rate, with the providers of transactions_fake_fintech:
+
+- a producer thread generates batches (iter_fake_data, one chunk per batch),
+  stamps transaction_date with the emission time and paces itself with a
+  token bucket
+- batches go through a bounded queue: when the database falls behind, the
+  producer blocks on it (backpressure) instead of piling rows up in memory
+- N sender threads, each with its own connection, insert the batches
+  (multi-row INSERT or COPY) and commit them one by one
+- insert latency (execute + commit) and end-to-end latency (emitted ->
+  committed) are recorded in log-bucketed histograms, reported every few
+  seconds and summarized at the end (p50/p90/p99/max)
+
+psycopg2 is imported lazily, only when a DSN is given.
+"""
+import io
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'class'))
+
+from sql_writer import copy_text
+from temporal_providers import DATETIME_FORMAT
+
+
+INSERT_METHODS = ('insert', 'copy')
+
+# Seconds between checks that some sender is still running while the queue is full
+QUEUE_POLL_SECONDS = 0.5
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter (used by a single producer thread).
+
+    Tokens accumulate at ``rate`` per second up to ``capacity``; taking n
+    tokens waits until they are available, so bursts never exceed the
+    capacity and the long-run rate never exceeds ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens, sleeping until enough have accumulated.
+
+        Args:
+            tokens: Number of tokens (rows) to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of capacity {self.capacity}")
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return waited
+            delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class LatencyHistogram:
+    """
+    Thread-safe histogram of latencies with logarithmic buckets.
+
+    Buckets grow by ``precision`` (1% by default), so percentiles are exact
+    to within that relative error while memory stays constant whatever the
+    number of samples.
+    """
+
+    def __init__(self, precision: float = 0.01):
+        self._log_base = math.log1p(precision)
+        self._buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one latency sample."""
+        bucket = int(math.log(max(seconds, 1e-6) * 1e6) / self._log_base)
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Latency below which ``percent`` % of the samples fall.
+
+        Args:
+            percent: Percentile (0-100)
+
+        Returns:
+            Upper bound of the matching bucket, in seconds (0 without samples)
+        """
+        with self._lock:
+            buckets = sorted(self._buckets.items())
+            count = self.count
+        if not count:
+            return 0.0
+        rank = math.ceil(percent / 100 * count)
+        seen = 0
+        for bucket, bucket_count in buckets:
+            seen += bucket_count
+            if seen >= rank:
+                return min(math.exp((bucket + 1) * self._log_base) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50, p90, p99 and max, in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class _Sender(threading.Thread):
+    """
+    Sender thread: inserts the batches of the queue through its own connection.
+
+    A failed batch is counted and rolled back. When the connection is
+    broken (the rollback fails too, or the connection reports itself
+    closed) the sender opens a new one with ``connect``; if that fails as
+    well, the sender stops and the producer notices it (see _put).
+    """
+
+    def __init__(self,
+                 name: str,
+                 batches: "queue.Queue",
+                 conn: Any,
+                 connect: Callable[[], Any],
+                 statement: Callable[[List[Dict[str, Any]]], str],
+                 method: str,
+                 stats: "_StreamStats"):
+        super().__init__(name=name, daemon=True)
+        self.batches = batches
+        self.conn = conn
+        self.connect = connect
+        self.statement = statement
+        self.method = method
+        self.stats = stats
+
+    def run(self) -> None:
+        try:
+            while True:
+                item = self.batches.get()
+                if item is None:
+                    return
+                emitted, batch = item
+                started = time.monotonic()
+                try:
+                    with self.conn.cursor() as cur:
+                        if self.method == 'copy':
+                            cur.copy_expert(self.statement(batch), io.StringIO(self._copy_block(batch)))
+                        else:
+                            cur.execute(self.statement(batch))
+                    self.conn.commit()
+                except Exception as e:
+                    self.stats.failed(len(batch), e)
+                    if not self._recover():
+                        return
+                    continue
+                finished = time.monotonic()
+                self.stats.committed(len(batch), finished - started, finished - emitted)
+        finally:
+            self._close()
+
+    def _recover(self) -> bool:
+        """Roll back a failed batch, reconnecting if the connection is broken; False if the sender must stop."""
+        try:
+            self.conn.rollback()
+            if not getattr(self.conn, 'closed', 0):
+                return True
+        except Exception:
+            pass
+        self._close()
+        try:
+            self.conn = self.connect()
+        except Exception as e:
+            self.stats.sender_stopped(self.name, e)
+            return False
+        self.stats.reconnected()
+        return True
+
+    def _close(self) -> None:
+        if self.conn is None:
+            return
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+        self.conn = None
+
+    @staticmethod
+    def _copy_block(batch: List[Dict[str, Any]]) -> str:
+        columns = list(batch[0].keys())
+        return copy_text([[record[column] for record in batch] for column in columns])
+
+
+class _StreamStats:
+    """Counters and histograms shared by the producer and the senders."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.batches = 0
+        self.failed_rows = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.stopped_senders = 0
+        self.last_error: Optional[str] = None
+        self.insert_latency = LatencyHistogram()
+        self.end_to_end_latency = LatencyHistogram()
+
+    def committed(self, rows: int, insert_seconds: float, end_to_end_seconds: float) -> None:
+        self.insert_latency.record(insert_seconds)
+        self.end_to_end_latency.record(end_to_end_seconds)
+        with self._lock:
+            self.rows += rows
+            self.batches += 1
+
+    def failed(self, rows: int, error: Exception) -> None:
+        with self._lock:
+            self.failed_rows += rows
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+
+    def reconnected(self) -> None:
+        with self._lock:
+            self.reconnects += 1
+
+    def sender_stopped(self, name: str, error: Exception) -> None:
+        with self._lock:
+            self.stopped_senders += 1
+            self.last_error = f"{name} could not reconnect: {type(error).__name__}: {error}"
+
+
+def _put(batches: "queue.Queue", item: Any, senders: List[threading.Thread]) -> bool:
+    """
+    Put an item on the batch queue, waiting while it is full.
+
+    Returns:
+        False (without putting the item) if every sender stopped while the
+        queue was full, so nothing would ever take it
+    """
+    while True:
+        try:
+            batches.put(item, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            if not any(sender.is_alive() for sender in senders):
+                return False
+
+
+def run_stream(dsn: Optional[str],
+               rate: float = 5000,
+               duration: float = 60,
+               connections: int = 4,
+               batch_size: int = 500,
+               queue_depth: Optional[int] = None,
+               method: str = 'insert',
+               seed: Optional[int] = None,
+               variability: float = 0.3,
+               records: Optional[int] = None,
+               card_skew: Optional[float] = None,
+               report_interval: float = 5.0,
+               connect: Optional[Callable[[], Any]] = None,
+               logger=None) -> Dict[str, Any]:
+    """
+    Insert generated transactions into PostgreSQL at a target rate.
+
+    The referenced tables (credit cards, merchant locations, payment methods)
+    must already be loaded: card ids come from the FK-Values files and the
+    SERIAL ranges from the table state, as for transactions_fake_fintech.py.
+
+    Args:
+        dsn: PostgreSQL DSN (each sender opens its own connection)
+        rate: Target rate, in transactions per second
+        duration: Length of the run, in seconds
+        connections: Number of sender threads / connections
+        batch_size: Rows per INSERT or COPY (and per commit)
+        queue_depth: Batches waiting for a sender before the producer blocks
+                     (default: two per connection)
+        method: 'insert' (multi-row INSERT) or 'copy' (COPY ... FROM STDIN)
+        seed: Random seed (default: from the clock, so runs do not repeat
+              the transaction ids of the previous ones)
+        variability: Locale variability (0-1)
+        records: Size of the SERIAL ranges of the tables without a state file
+        card_skew: Zipf exponent of card_id (None for uniform)
+        report_interval: Seconds between progress reports
+        connect: Function returning a new DB-API connection (default:
+                 psycopg2.connect(dsn))
+        logger: Logger for progress and results (default: print)
+
+    Returns:
+        Summary of the run: rows, achieved rate, errors, backpressure and
+        latency percentiles (insert and end-to-end, in milliseconds)
+    """
+    if method not in INSERT_METHODS:
+        raise ValueError(f"Unsupported insert method: {method} (expected one of {list(INSERT_METHODS)})")
+    if connections <= 0 or batch_size <= 0:
+        raise ValueError("connections and batch_size must be positive")
+    log = logger.info if logger else print
+
+    if connect is None:
+        import psycopg2
+        connect = lambda: psycopg2.connect(dsn)
+
+    from transactions_fake_fintech import generate_data_dummy
+
+    # Live traffic continues the generated tables: SERIAL ranges come from their states
+    table = generate_data_dummy(records=records, card_skew=card_skew, from_state=True)
+    full_table_name = table.get_full_table_name()
+    if method == 'copy':
+        statement = lambda batch: f"COPY {full_table_name} ({', '.join(batch[0].keys())}) FROM STDIN"
+    else:
+        statement = table.to_sql
+
+    seed = seed if seed is not None else time.time_ns() % (1 << 32)
+
+    # Connections are opened up front so a bad DSN fails before anything is generated
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(connect())
+    except Exception:
+        for conn in opened:
+            conn.close()
+        raise
+
+    # Bursts are limited to a tenth of a second of traffic (or one batch)
+    capacity = max(rate / 10, batch_size)
+    max_rows = math.ceil(rate * duration + capacity)
+    chunks = table.iter_fake_data(max_rows, seed=seed, variability=variability, chunk_size=batch_size)
+    # The first batch loads the locales; the clock starts once it is ready
+    chunks = chain([next(chunks)], chunks)
+    batches: "queue.Queue" = queue.Queue(maxsize=queue_depth or 2 * connections)
+    stats = _StreamStats()
+
+    senders = [
+        _Sender(f"sender-{index}", batches, conn, connect, statement, method, stats)
+        for index, conn in enumerate(opened)
+    ]
+    for sender in senders:
+        sender.start()
+
+    log(f"Streaming into {full_table_name}: {rate:,.0f} tps for {duration:.0f}s, "
+        f"{connections} connections, {batch_size} rows per {method}, seed {seed}")
+    bucket = TokenBucket(rate, capacity)
+    emitted_rows = 0
+    throttled_seconds = 0.0
+    blocked_seconds = 0.0
+    start = time.monotonic()
+    deadline = start + duration
+    next_report = start + report_interval
+    reported_rows = 0
+
+    try:
+        for chunk in chunks:
+            throttled_seconds += bucket.acquire(len(chunk))
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            # Live stream: transactions happen when they are emitted
+            stamp = datetime.now().strftime(DATETIME_FORMAT)
+            for record in chunk:
+                record['transaction_date'] = stamp
+
+            if not _put(batches, (now, chunk), senders):
+                log("⚠️ Every sender stopped (connections lost), ending the run")
+                break
+            blocked_seconds += time.monotonic() - now
+            emitted_rows += len(chunk)
+
+            if now >= next_report:
+                interval = now - next_report + report_interval
+                latency = stats.insert_latency.summary()
+                log(f"{now - start:6.1f}s  {(stats.rows - reported_rows) / interval:10,.0f} tps  "
+                    f"queue {batches.qsize():3d}  insert p50 {latency['p50_ms']:.1f} ms  "
+                    f"p99 {latency['p99_ms']:.1f} ms  errors {stats.errors}")
+                reported_rows = stats.rows
+                next_report = now + report_interval
+    finally:
+        # One stop marker per sender; stopped senders take none, so never wait on them
+        for _ in senders:
+            if not _put(batches, None, senders):
+                break
+        for sender in senders:
+            sender.join()
+
+    seconds = time.monotonic() - start
+    summary = {
+        'target_tps': rate,
+        'achieved_tps': stats.rows / seconds if seconds else 0.0,
+        'seconds': seconds,
+        'rows': stats.rows,
+        'batches': stats.batches,
+        'emitted_rows': emitted_rows,
+        'failed_rows': stats.failed_rows,
+        'errors': stats.errors,
+        'reconnects': stats.reconnects,
+        'stopped_senders': stats.stopped_senders,
+        'last_error': stats.last_error,
+        # Time the producer waited for tokens (ahead of the target rate)
+        'throttled_seconds': throttled_seconds,
+        # Time the producer was blocked by a full queue (database behind)
+        'backpressure_seconds': blocked_seconds,
+        'insert_latency': stats.insert_latency.summary(),
+        'end_to_end_latency': stats.end_to_end_latency.summary(),
+    }
+
+    log(f"Committed {stats.rows:,} rows in {seconds:.1f}s: {summary['achieved_tps']:,.0f} tps "
+        f"(target {rate:,.0f}), {stats.errors} failed batches, {stats.reconnects} reconnects, "
+        f"{stats.stopped_senders} senders stopped")
+    for name in ('insert_latency', 'end_to_end_latency'):
+        latency = summary[name]
+        log(f"  {name:<19} p50 {latency['p50_ms']:8.1f} ms  p90 {latency['p90_ms']:8.1f} ms  "
+            f"p99 {latency['p99_ms']:8.1f} ms  max {latency['max_ms']:8.1f} ms")
+    log(f"  producer throttled {throttled_seconds:.1f}s, blocked by backpressure {blocked_seconds:.1f}s")
+    if stats.last_error:
+        log(f"  last error: {stats.last_error}")
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Stream generated transactions into PostgreSQL at a target rate')
+    parser.add_argument('--dsn', type=str, required=True, help='PostgreSQL DSN (requires psycopg2)')
+    parser.add_argument('--rate', type=float, default=5000, help='Target transactions per second (default: 5000)')
+    parser.add_argument('--duration', type=float, default=60, help='Length of the run in seconds (default: 60)')
+    parser.add_argument('--connections', type=int, default=4, help='Concurrent connections (default: 4)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Rows per INSERT/COPY and commit (default: 500)')
+    parser.add_argument('--queue-depth', type=int, default=None,
+                        help='Batches queued before the producer blocks (default: 2 per connection)')
+    parser.add_argument('--method', choices=INSERT_METHODS, default='insert',
+                        help='Multi-row INSERT or COPY FROM STDIN (default: insert)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed (default: from the clock)')
+    parser.add_argument('--variability', type=float, default=0.3,
+                        help='Locale variability (0-1, where 0 = single locale, 1 = all locales)')
+    parser.add_argument('--records', type=int, default=None,
+                        help='Size of the SERIAL ranges of the tables without a state file')
+    parser.add_argument('--card-skew', type=float, default=None,
+                        help='Zipf exponent for card_id (e.g. 1.1); uniform when omitted')
+    parser.add_argument('--report-interval', type=float, default=5.0, help='Seconds between progress reports')
+    parser.add_argument('--stats-file', type=str, default=None, help='Write the summary of the run to a JSON file')
+    args = parser.parse_args()
+
+    result = run_stream(
+        args.dsn,
+        rate=args.rate,
+        duration=args.duration,
+        connections=args.connections,
+        batch_size=args.batch_size,
+        queue_depth=args.queue_depth,
+        method=args.method,
+        seed=args.seed,
+        variability=args.variability,
+        records=args.records,
+        card_skew=args.card_skew,
+        report_interval=args.report_interval
+    )
+    if args.stats_file:
+        with open(args.stats_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Generation state of a table, kept to append rows incrementally.
+
+Full exports of a table created with save_state=True write a small JSON
+file (State/STATE-<SCHEMA>-<TABLE>.json next to the SQL files) and every
+append updates it:
+
+- rows: number of rows generated so far, i.e. the first row number of the
+  next batch (row numbers drive row-derived keys such as card numbers)
+- seed / variability / chunk_size / batches: the random streams of batch b
+  are derived from (seed, table, column, b, shard), so a batch can be reproduced
+  and a new one never repeats the streams of the previous ones
+- time_watermark: end of the time range covered by the table's time column;
+  the next batch starts right after it
+- foreign_keys: size (and source file) of each foreign key pool used, to
+  tell whether a parent table grew since the last batch
+
+The fingerprints of the unique columns (see unique_tracking) are saved next
+to the state file, so appended rows never repeat a key of a previous batch.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+STATE_DIR = 'State'
+
+
+def state_file_path(path_output: str, schema_name: str, table_name: str) -> str:
+    """
+    Path of the state file of a table.
+
+    Args:
+        path_output: Output directory of the table's SQL files
+        schema_name: Database schema name
+        table_name: Table name
+
+    Returns:
+        Path of the JSON state file
+    """
+    return os.path.join(path_output, STATE_DIR, f"STATE-{schema_name.upper()}-{table_name.upper()}.json")
+
+
+def fingerprint_file_path(state_path: str, column: str) -> str:
+    """
+    Path of the saved fingerprints of a unique column, next to the state file.
+
+    Args:
+        state_path: Path of the table's state file
+        column: Unique column name
+
+    Returns:
+        Path of the fingerprint file (e.g. STATE-FINTECH-CLIENTS-CLIENT_ID.fpt)
+    """
+    return f"{os.path.splitext(state_path)[0]}-{column.upper()}.fpt"
+
+
+def delta_suffix(batch: int) -> str:
+    """File name suffix of the delta files of an appended batch (e.g. '-DELTA-0001')."""
+    return f"-DELTA-{batch:04d}"
+
+
+class TableState:
+    """Generation state of one table (see the module docstring for the fields)."""
+
+    def __init__(self,
+                 table: str,
+                 seed: int,
+                 variability: float,
+                 chunk_size: int,
+                 rows: int = 0,
+                 batches: Optional[List[Dict[str, Any]]] = None,
+                 time_watermark: Optional[str] = None,
+                 foreign_keys: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.table = table
+        self.seed = seed
+        self.variability = variability
+        self.chunk_size = chunk_size
+        self.rows = rows
+        self.batches = list(batches or [])
+        self.time_watermark = time_watermark
+        self.foreign_keys = dict(foreign_keys or {})
+
+    @property
+    def next_batch(self) -> int:
+        return len(self.batches)
+
+    def add_batch(self, rows: int, files: List[str]) -> Dict[str, Any]:
+        """
+        Record a generated batch and advance the row sequence.
+
+        Args:
+            rows: Number of rows of the batch
+            files: Files written for the batch
+
+        Returns:
+            The recorded batch entry
+        """
+        entry = {
+            'batch': self.next_batch,
+            'start_row': self.rows,
+            'rows': rows,
+            'time_watermark': self.time_watermark,
+            'files': files,
+            'created': datetime.now().replace(microsecond=0).isoformat(sep=' '),
+        }
+        self.batches.append(entry)
+        self.rows += rows
+        return entry
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'table': self.table,
+            'seed': self.seed,
+            'variability': self.variability,
+            'chunk_size': self.chunk_size,
+            'rows': self.rows,
+            'time_watermark': self.time_watermark,
+            'foreign_keys': self.foreign_keys,
+            'batches': self.batches,
+        }
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional['TableState']:
+        """
+        Read a state file.
+
+        Args:
+            file_path: Path of the state file
+
+        Returns:
+            The state, or None if the file does not exist
+        """
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(**data)
+
+    def save(self, file_path: str) -> None:
+        """Write the state file atomically (written aside, then renamed)."""
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temporary_path = f"{file_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temporary_path, file_path)
+
+
+def table_rows(path_output: str, schema_name: str, table_name: str, default: Optional[int]) -> int:
+    """
+    Number of rows generated so far for a table, e.g. the size of its SERIAL range.
+
+    Meant for appends: a full run should size its ranges from its own
+    arguments, since the state file may come from an earlier run.
+
+    Args:
+        path_output: Output directory of the table's SQL files
+        schema_name: Database schema name
+        table_name: Table name
+        default: Value returned when the table has no state file
+
+    Returns:
+        Rows recorded in the state file, or default
+
+    Raises:
+        FileNotFoundError: If the table has no state file and default is None
+    """
+    path = state_file_path(os.path.abspath(path_output), schema_name, table_name)
+    state = TableState.load(path)
+    if state is not None:
+        return state.rows
+    if default is None:
+        raise FileNotFoundError(f"No generation state for table {table_name} ({path}): pass the number of records")
+    return default
+
+
+def foreign_key_rows(path_output: str,
+                     schema_name: str,
+                     table_name: str,
+                     column: str,
+                     parent_name: str,
+                     default: Optional[int]) -> int:
+    """
+    Size of the parent SERIAL range a foreign key column draws from when appending.
+
+    The parent table's state gives its current number of rows. When the
+    parent was generated without state and no default is given, the pool
+    size recorded in the table's own state (the range of its last batch)
+    is reused.
+
+    Args:
+        path_output: Output directory of the tables' SQL files
+        schema_name: Database schema name
+        table_name: Table being appended
+        column: Foreign key column of the table
+        parent_name: Referenced table
+        default: Value used when the parent table has no state file
+
+    Returns:
+        Number of parent rows to draw the foreign keys from
+
+    Raises:
+        FileNotFoundError: If neither table records the size and default is None
+    """
+    try:
+        return table_rows(path_output, schema_name, parent_name, default)
+    except FileNotFoundError:
+        state = TableState.load(state_file_path(os.path.abspath(path_output), schema_name, table_name))
+        recorded = state.foreign_keys.get(column, {}).get('values') if state else None
+        if recorded is None:
+            raise FileNotFoundError(f"No generation state for table {parent_name}, nor a recorded {column} "
+                                    f"range in the state of {table_name}: pass the number of records") from None
+        return recorded
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Compiled string-template providers for composite columns.
+
+Columns like the clients email used to chain several Faker calls per row
+(``faker.email().split('@')[0] + faker.last_name() + ...``). A template
+describes the value instead::
+
+    "{first_name|slug}.{last_name|slug}{digits:5}@{choice:DOMAINS}"
+
+It is parsed once into a list of batched providers, one per placeholder,
+and a format string for the literal text. Filling a column draws every
+placeholder for the whole slice in one call (choices, digit strings and
+value banks are a single random.choices/randrange pass) and joins them
+with str.format, so the text is assembled without any per-row dispatch.
+
+Placeholders: ``{name[:argument][|filter...]}``
+
+- ``{digits:N}``: N zero-padded random digits
+- ``{choice:KEY}``: uniform choice from ``choices[KEY]``, or from an inline
+  comma-separated list (``{choice:AM,PM}``)
+- ``{int:LOW-HIGH}``: uniform integer in [LOW, HIGH]
+- ``{money}``, ``{geo_latitude}``, ...: a numeric provider (numeric_providers.py)
+- ``{first_name}``, ``{city}``, ...: a Faker provider, called once per row,
+  or drawn from its value bank with value_banks=True when it is in
+  BANKABLE_PROVIDERS
+
+Filters: ``lower``, ``upper`` and ``slug`` (lowercase ASCII letters and
+digits only, for emails and usernames). Literal braces are written ``{{``
+and ``}}``.
+"""
+import re
+import string
+import unicodedata
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from faker import Faker
+
+from batch_providers import BatchProvider, ChoiceProvider, IntRangeProvider
+from numeric_providers import NUMERIC_PROVIDERS, DigitStringProvider
+from value_banks import BANKABLE_PROVIDERS, ValueBankProvider
+
+
+_INT_RANGE = re.compile(r'^(-?\d+)-(-?\d+)$')
+
+
+@lru_cache(maxsize=65536)
+def _slug(value: str) -> str:
+    ascii_value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+    return ''.join(char for char in ascii_value.lower() if char.isalnum())
+
+
+TEMPLATE_FILTERS: Dict[str, Callable[[str], str]] = {
+    'lower': str.lower,
+    'upper': str.upper,
+    'slug': _slug,
+}
+
+
+class _FakerMethodProvider(BatchProvider):
+    """Placeholder backed by a Faker method, called once per row."""
+
+    def __init__(self, method: str):
+        self.method = method
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Any]:
+        if not hasattr(faker, self.method):
+            raise ValueError(f"Unknown Faker provider in template: {self.method}")
+        generate = getattr(faker, self.method)
+        return [generate() for _ in rows]
+
+
+class TemplateProvider(BatchProvider):
+    """
+    Batched provider formatting a string template with batched placeholders.
+
+    Example: TemplateProvider("{first_name|slug}.{last_name|slug}{digits:5}@{choice:DOMAINS}",
+                              choices={'DOMAINS': ['gmail.com', 'example.com']})
+
+    Args:
+        template: Template text (see the module docstring for the syntax)
+        choices: Lists referenced by ``{choice:KEY}`` placeholders
+        value_banks: Draw bankable Faker providers from their value banks
+                     instead of calling the Faker method once per row
+    """
+
+    def __init__(self,
+                 template: str,
+                 choices: Optional[Dict[str, Sequence[Any]]] = None,
+                 value_banks: bool = False):
+        self.template = template
+        self.choices = dict(choices or {})
+        self.value_banks = value_banks
+        # Placeholders in order: (provider, filters)
+        self.parts: List[tuple] = []
+        literals = []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            literals.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+            if conversion or '{' in (spec or ''):
+                raise ValueError(f"Unsupported placeholder in template {template!r}: {{{field}!{conversion}:{spec}}}")
+            self.parts.append(self._compile_placeholder(field + (f":{spec}" if spec else '')))
+            literals.append('{}')
+        if not self.parts:
+            raise ValueError(f"Template has no placeholders: {template!r}")
+        self._format = ''.join(literals).format
+        self.locale_independent = all(getattr(provider, 'locale_independent', False) for provider, _ in self.parts)
+
+    def _compile_placeholder(self, placeholder: str) -> tuple:
+        """Build the batched provider and the filters of one placeholder."""
+        head, *filter_names = placeholder.split('|')
+        name, _, argument = head.strip().partition(':')
+        for filter_name in filter_names:
+            if filter_name not in TEMPLATE_FILTERS:
+                raise ValueError(f"Unknown template filter '{filter_name}' (expected one of {list(TEMPLATE_FILTERS)})")
+        filters = [TEMPLATE_FILTERS[filter_name] for filter_name in filter_names]
+
+        if name == 'digits':
+            if not argument.isdigit():
+                raise ValueError(f"{{digits:N}} needs a number of digits, got {{{placeholder}}}")
+            provider = DigitStringProvider(int(argument))
+        elif name == 'choice':
+            if argument in self.choices:
+                elements = self.choices[argument]
+            elif ',' in argument:
+                elements = argument.split(',')
+            else:
+                raise ValueError(f"Unknown choice list '{argument}' (pass it in choices)")
+            provider = ChoiceProvider(elements)
+        elif name == 'int':
+            match = _INT_RANGE.match(argument)
+            if not match:
+                raise ValueError(f"{{int:LOW-HIGH}} needs a range, got {{{placeholder}}}")
+            provider = IntRangeProvider(int(match.group(1)), int(match.group(2)))
+        elif argument:
+            raise ValueError(f"Placeholder {{{placeholder}}} does not take an argument")
+        elif name in NUMERIC_PROVIDERS:
+            provider = NUMERIC_PROVIDERS[name]()
+        elif self.value_banks and name in BANKABLE_PROVIDERS:
+            provider = ValueBankProvider(name)
+        else:
+            provider = _FakerMethodProvider(name)
+        return provider, filters
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[str]:
+        columns = []
+        for provider, filters in self.parts:
+            values = provider.batch(faker, rows)
+            for apply in filters:
+                values = [apply(str(value)) for value in values]
+            columns.append(values)
+        return list(map(self._format, *columns))
+
+    def __repr__(self) -> str:
+        return f"TemplateProvider({self.template!r})"
+
+
+def resolve_template_provider(provider_info: Union[str, Dict, Any]) -> Any:
+    """
+    Build the template provider described by a provider specification.
+
+    Args:
+        provider_info: Provider specification of a column: a template string
+                       (any string with a placeholder) or a dict with
+                       ``'method': 'template'``, the template and its arguments
+
+    Returns:
+        A TemplateProvider, or the specification unchanged
+    """
+    if isinstance(provider_info, str) and '{' in provider_info:
+        return TemplateProvider(provider_info)
+    if isinstance(provider_info, dict) and provider_info.get('method') == 'template':
+        params = {key: value for key, value in provider_info.items() if key != 'method'}
+        return TemplateProvider(**params)
+    return provider_info
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Batched date and timestamp providers.
+
+Faker's date_time_between / date_between / date_of_birth build one datetime
+per call and the scripts then format it with strftime, which makes date
+columns some of the slowest ones to generate. TemporalProvider draws whole
+columns as integer offsets (seconds or days since 1970-01-01) and formats
+them in bulk: day strings are cached and the time of day comes from small
+lookup tables, so no datetime object is created unless one is requested.
+
+Offsets follow an arrival profile: uniform over the range, or weighted by
+hour of day (diurnal), day of week and month (seasonal). Weighted draws use
+random.choices over cumulative weights, one C-level call per column slice.
+"""
+import re
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+from faker import Faker
+
+from batch_providers import BatchProvider
+
+
+SECONDS_PER_DAY = 86_400
+SECONDS_PER_HOUR = 3_600
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+# Faker-style relative dates: '-2y', '+30d', '-1y6M', 'now', 'today'
+_RELATIVE_PART = re.compile(r'([+-]?)(\d+)([yMwdhms])')
+_RELATIVE = re.compile(r'(?:[+-]?\d+[yMwdhms])+')
+_UNIT_SECONDS = {
+    'y': 365.25 * SECONDS_PER_DAY,
+    'M': 30.4375 * SECONDS_PER_DAY,
+    'w': 7 * SECONDS_PER_DAY,
+    'd': SECONDS_PER_DAY,
+    'h': SECONDS_PER_HOUR,
+    'm': 60,
+    's': 1,
+}
+
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 'HH:MM' for every minute of the day and 'SS' for every second of the minute
+_CLOCK = [f"{hour:02d}:{minute:02d}" for hour in range(24) for minute in range(60)]
+_TWO_DIGITS = [f"{second:02d}" for second in range(60)]
+
+
+class ArrivalProfile(NamedTuple):
+    """
+    Relative weights of the moments of a time range (None means uniform).
+
+    Weights only need to be proportional; they are combined by product, so
+    a Saturday at 19:00 in December weighs weekday[5] * month[11] * hour[19].
+    """
+    # 24 weights, hour 0 first
+    hour_weights: Optional[Sequence[float]] = None
+    # 7 weights, Monday first
+    weekday_weights: Optional[Sequence[float]] = None
+    # 12 weights, January first
+    month_weights: Optional[Sequence[float]] = None
+
+
+# Card payments: quiet nights, a lunch peak and a larger evening peak
+DIURNAL_HOUR_WEIGHTS = [
+    0.6, 0.4, 0.3, 0.2, 0.2, 0.3, 0.7, 1.4, 2.2, 2.6, 2.9, 3.3,
+    4.0, 3.8, 3.1, 2.9, 3.1, 3.6, 4.1, 4.3, 3.8, 2.9, 1.9, 1.1,
+]
+
+# Busier Fridays and Saturdays, quieter Sundays
+WEEKDAY_WEIGHTS = [0.95, 0.95, 1.0, 1.0, 1.15, 1.25, 0.8]
+
+# Post-holiday dip in January-February, November sales and December holidays
+MONTH_WEIGHTS = [0.85, 0.8, 0.9, 0.95, 1.0, 1.0, 1.05, 1.05, 0.95, 1.0, 1.15, 1.4]
+
+ARRIVAL_PROFILES: Dict[str, ArrivalProfile] = {
+    'uniform': ArrivalProfile(),
+    'diurnal': ArrivalProfile(hour_weights=DIURNAL_HOUR_WEIGHTS),
+    'seasonal': ArrivalProfile(DIURNAL_HOUR_WEIGHTS, WEEKDAY_WEIGHTS, MONTH_WEIGHTS),
+}
+
+
+def resolve_datetime(value: Union[str, date, datetime], now: Optional[datetime] = None) -> datetime:
+    """
+    Resolve an absolute or Faker-style relative date.
+
+    Args:
+        value: datetime, date, 'now', 'today' or a relative offset such as
+               '-2y', '+30d' or '-1y6M' (y, M, w, d, h, m, s units)
+        now: Reference time of relative values (default: current time)
+
+    Returns:
+        Naive datetime
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    now = now or datetime.now().replace(microsecond=0)
+    text = str(value).strip()
+    if text == 'now':
+        return now
+    if text == 'today':
+        return now.replace(hour=0, minute=0, second=0)
+
+    if not _RELATIVE.fullmatch(text):
+        raise ValueError(f"Unsupported date specification: {value!r}")
+    seconds = 0.0
+    sign = 1
+    for part_sign, amount, unit in _RELATIVE_PART.findall(text):
+        # A sign applies to the following parts too ('-1y6M' is 18 months ago)
+        if part_sign:
+            sign = -1 if part_sign == '-' else 1
+        seconds += sign * int(amount) * _UNIT_SECONDS[unit]
+    return now + timedelta(seconds=int(seconds))
+
+
+def _cumulative(weights: Sequence[float], size: int, name: str) -> List[float]:
+    if len(weights) != size:
+        raise ValueError(f"{name} needs {size} weights, got {len(weights)}")
+    if min(weights) < 0 or not sum(weights) > 0:
+        raise ValueError(f"{name} must be non-negative and add up to a positive value")
+    return list(accumulate(weights))
+
+
+class TemporalProvider(BatchProvider):
+    """
+    Dates or timestamps in a range, drawn and formatted a column slice at a time.
+
+    Replaces lambdas like
+    ``lambda faker: faker.date_time_between(start_date='-2y', end_date='now').strftime(...)``.
+
+    Args:
+        start_date: Start of the range (datetime, date or Faker-style string)
+        end_date: End of the range (datetime, date or Faker-style string)
+        unit: 'second' for timestamps, 'day' for dates
+        profile: Arrival profile name (see ARRIVAL_PROFILES) or ArrivalProfile
+        date_format: strftime pattern of the returned strings; None returns
+                     datetime (unit 'second') or date (unit 'day') objects
+        offset_days: Day offsets, one of which is drawn uniformly and added
+                     to each value (e.g. card validity periods)
+        now: Reference time of relative dates (default: creation time, so
+             every shard and worker uses the same range)
+    """
+
+    locale_independent = True
+
+    def __init__(self,
+                 start_date: Union[str, date, datetime] = '-30y',
+                 end_date: Union[str, date, datetime] = 'now',
+                 unit: str = 'second',
+                 profile: Union[str, ArrivalProfile] = 'uniform',
+                 date_format: Optional[str] = None,
+                 offset_days: Optional[Sequence[int]] = None,
+                 now: Optional[datetime] = None):
+        if unit not in ('second', 'day'):
+            raise ValueError(f"Unsupported unit: {unit} (expected 'second' or 'day')")
+        if isinstance(profile, str):
+            if profile not in ARRIVAL_PROFILES:
+                raise ValueError(f"Unknown arrival profile: {profile} (expected one of {list(ARRIVAL_PROFILES)})")
+            profile = ARRIVAL_PROFILES[profile]
+
+        now = now or datetime.now().replace(microsecond=0)
+        start = resolve_datetime(start_date, now)
+        end = resolve_datetime(end_date, now)
+        if end < start:
+            raise ValueError(f"Empty date range: {start} > {end}")
+
+        self.start = start
+        self.end = end
+        self.unit = unit
+        self.profile = profile
+        self.date_format = date_format
+        self.offset_days = list(offset_days) if offset_days else None
+        self.low = int((start - _EPOCH).total_seconds())
+        self.high = int((end - _EPOCH).total_seconds())
+        self.first_day = self.low // SECONDS_PER_DAY
+        self.last_day = self.high // SECONDS_PER_DAY
+
+        self._hour_cum = None
+        if unit == 'second' and profile.hour_weights is not None:
+            self._hour_cum = _cumulative(profile.hour_weights, 24, 'hour_weights')
+        self._day_cum = None
+        if profile.weekday_weights is not None or profile.month_weights is not None:
+            self._day_cum = self._day_cumulative_weights(profile)
+
+        self._day_text: Dict[int, str] = {}
+        self._day_dates: Dict[int, date] = {}
+
+    def after(self, watermark: Union[str, datetime], end_date: Union[str, date, datetime] = 'now') -> 'TemporalProvider':
+        """
+        Same provider over the range that follows a watermark (used to append rows).
+
+        Args:
+            watermark: End of the range already covered (datetime or ISO string)
+            end_date: End of the new range: 'now', a date, or an offset counted
+                      from the watermark (e.g. '+1d' for one more day)
+
+        Returns:
+            New TemporalProvider starting one unit (second or day) after the watermark
+        """
+        if isinstance(watermark, str):
+            watermark = datetime.fromisoformat(watermark)
+        step = timedelta(days=1) if self.unit == 'day' else timedelta(seconds=1)
+        end = resolve_datetime(end_date, None if end_date == 'now' else watermark)
+        if end < watermark + step:
+            raise ValueError(f"Nothing to append after the watermark {watermark}: range ends at {end} "
+                             "(use a later end date, e.g. '+1d')")
+        return TemporalProvider(
+            start_date=watermark + step,
+            end_date=end,
+            unit=self.unit,
+            profile=self.profile,
+            date_format=self.date_format,
+            offset_days=self.offset_days,
+        )
+
+    def _day_cumulative_weights(self, profile: ArrivalProfile) -> List[float]:
+        """Cumulative weight of every day of the range (weekday x month)."""
+        weekday = profile.weekday_weights or [1.0] * 7
+        month = profile.month_weights or [1.0] * 12
+        _cumulative(weekday, 7, 'weekday_weights')
+        _cumulative(month, 12, 'month_weights')
+        weights = []
+        for day in range(self.first_day, self.last_day + 1):
+            current = date.fromordinal(_EPOCH_ORDINAL + day)
+            weights.append(weekday[current.weekday()] * month[current.month - 1])
+        return list(accumulate(weights))
+
+    def _draw_days(self, rng, k: int) -> List[int]:
+        first_day = self.first_day
+        if self._day_cum is not None:
+            days = range(first_day, self.last_day + 1)
+            return rng.choices(days, cum_weights=self._day_cum, k=k)
+        span = self.last_day - first_day + 1
+        rand = rng.random
+        return [first_day + int(rand() * span) for _ in range(k)]
+
+    def _draw_seconds(self, rng, k: int) -> List[int]:
+        low, high = self.low, self.high
+        rand = rng.random
+        if self._day_cum is None and self._hour_cum is None:
+            span = high - low + 1
+            return [low + int(rand() * span) for _ in range(k)]
+
+        hour_cum = self._hour_cum
+        values = []
+        while len(values) < k:
+            missing = k - len(values)
+            days = self._draw_days(rng, missing)
+            if hour_cum is None:
+                seconds = [int(rand() * SECONDS_PER_DAY) for _ in range(missing)]
+            else:
+                hours = rng.choices(range(24), cum_weights=hour_cum, k=missing)
+                seconds = [hour * SECONDS_PER_HOUR + int(rand() * SECONDS_PER_HOUR) for hour in hours]
+            # The first and last days are partial: moments outside the range are drawn again
+            values.extend(
+                value for value in (day * SECONDS_PER_DAY + second for day, second in zip(days, seconds))
+                if low <= value <= high
+            )
+        return values
+
+    def _date_text(self, day: int) -> str:
+        text = self._day_text.get(day)
+        if text is None:
+            text = self._day_text[day] = date.fromordinal(_EPOCH_ORDINAL + day).isoformat()
+        return text
+
+    def _date(self, day: int) -> date:
+        value = self._day_dates.get(day)
+        if value is None:
+            value = self._day_dates[day] = date.fromordinal(_EPOCH_ORDINAL + day)
+        return value
+
+    def _format(self, offsets: List[int]) -> List[Any]:
+        """Convert offsets (days or seconds since the epoch) to the requested output."""
+        date_format = self.date_format
+        if self.unit == 'day':
+            if date_format == DATE_FORMAT:
+                return [self._date_text(day) for day in offsets]
+            dates = [self._date(day) for day in offsets]
+            return dates if date_format is None else [value.strftime(date_format) for value in dates]
+
+        if date_format == DATETIME_FORMAT:
+            date_text, clock, two_digits = self._date_text, _CLOCK, _TWO_DIGITS
+            values = []
+            for offset in offsets:
+                day, second = divmod(offset, SECONDS_PER_DAY)
+                minute, second = divmod(second, 60)
+                values.append(f"{date_text(day)} {clock[minute]}:{two_digits[second]}")
+            return values
+        if date_format == DATE_FORMAT:
+            return [self._date_text(offset // SECONDS_PER_DAY) for offset in offsets]
+        datetimes = [_EPOCH + timedelta(seconds=offset) for offset in offsets]
+        return datetimes if date_format is None else [value.strftime(date_format) for value in datetimes]
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Any]:
+        rng = faker.random
+        k = len(rows)
+        offsets = self._draw_days(rng, k) if self.unit == 'day' else self._draw_seconds(rng, k)
+        if self.offset_days:
+            shifts = rng.choices(self.offset_days, k=k)
+            if self.unit == 'day':
+                offsets = [offset + shift for offset, shift in zip(offsets, shifts)]
+            else:
+                offsets = [offset + shift * SECONDS_PER_DAY for offset, shift in zip(offsets, shifts)]
+        return self._format(offsets)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compact uniqueness tracking for FakeGenericTable.unique_columns.
+
+Values are reduced to 64-bit blake2b fingerprints stored in an
+open-addressing hash table backed by array('Q'), which takes 8 bytes per
+slot instead of the ~100 bytes per entry of a Python set of strings.
+Fingerprints are deterministic across processes, so the same run always
+flags the same collisions. A fingerprint collision between two different
+values is reported as a duplicate, which only costs one extra
+regeneration and never lets a real duplicate through.
+
+The table can be saved to a file and loaded back, so appended batches of a
+table are checked against the values of the batches already generated.
+"""
+import hashlib
+from array import array
+from typing import Any, Dict
+
+
+class UniqueValueTracker:
+    """Open-addressing set of 64-bit value fingerprints with collision statistics."""
+
+    _MAX_LOAD = 0.6
+
+    def __init__(self, initial_capacity: int = 1 << 16):
+        capacity = 1
+        while capacity < initial_capacity:
+            capacity <<= 1
+        self._slots = array('Q', bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._count = 0
+        # Statistics
+        self.checked = 0
+        self.collisions = 0
+
+    @staticmethod
+    def _fingerprint(value: Any) -> int:
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        # 0 marks an empty slot
+        return int.from_bytes(digest, 'big') or 1
+
+    def _insert(self, fingerprint: int) -> bool:
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while True:
+            current = slots[index]
+            if current == 0:
+                slots[index] = fingerprint
+                self._count += 1
+                return True
+            if current == fingerprint:
+                return False
+            index = (index + 1) & mask
+
+    def _grow(self) -> None:
+        old_slots = self._slots
+        self._slots = array('Q', bytes(16 * len(old_slots)))
+        self._mask = len(self._slots) - 1
+        self._count = 0
+        for fingerprint in old_slots:
+            if fingerprint:
+                self._insert(fingerprint)
+
+    def add(self, value: Any) -> bool:
+        """
+        Record a value.
+
+        Args:
+            value: Value to record
+
+        Returns:
+            True if the value was new, False if it was already seen
+        """
+        self.checked += 1
+        if self._count + 1 > self._MAX_LOAD * len(self._slots):
+            self._grow()
+        if self._insert(self._fingerprint(value)):
+            return True
+        self.collisions += 1
+        return False
+
+    def __len__(self) -> int:
+        return self._count
+
+    def save(self, file_path: str) -> None:
+        """
+        Write the fingerprint table to a file (native byte order, for this machine).
+
+        Args:
+            file_path: Path of the fingerprint file
+        """
+        with open(file_path, 'wb') as f:
+            array('Q', [self._count]).tofile(f)
+            self._slots.tofile(f)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'UniqueValueTracker':
+        """
+        Read a fingerprint table written by save().
+
+        Args:
+            file_path: Path of the fingerprint file
+
+        Returns:
+            Tracker holding the saved fingerprints (statistics start at zero)
+        """
+        with open(file_path, 'rb') as f:
+            data = array('Q', f.read())
+        tracker = cls(initial_capacity=1)
+        tracker._count = data[0]
+        tracker._slots = data[1:]
+        tracker._mask = len(tracker._slots) - 1
+        return tracker
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the fingerprint table."""
+        return self._slots.itemsize * len(self._slots)
+
+    def stats(self) -> Dict[str, int]:
+        """Collision statistics of the tracker."""
+        return {
+            'checked': self.checked,
+            'unique': self._count,
+            'collisions': self.collisions,
+            'memory_bytes': self.memory_bytes,
+        }
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Pre-materialized value banks for low-cardinality Faker providers.
+
+Providers like first_name, last_name or country pick one element of a
+fixed list per locale, yet are called once per row. A value
+bank samples the provider once per locale, keeps the distinct values with
+their frequencies, and afterwards draws whole columns with a single
+random.choices call. Banks are cached on disk keyed by locale, provider,
+bank size and Faker version.
+"""
+import hashlib
+import json
+import os
+from collections import Counter
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import faker as faker_package
+from faker import Faker
+
+from batch_providers import BatchProvider
+
+
+# Providers drawing a single element of a locale list, whose whole domain fits
+# in a bank. Combinatorial providers (name, city, company, street_name, ...)
+# join several elements and would be cut down to the values of the bank.
+BANKABLE_PROVIDERS = {
+    'first_name', 'first_name_male', 'first_name_female',
+    'last_name', 'prefix', 'suffix',
+    'city_name', 'state', 'country',
+    'street_suffix', 'company_suffix',
+    'word', 'color_name', 'currency_code',
+}
+
+DEFAULT_BANK_SIZE = 20_000
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'fintech-fake-data', 'value-banks')
+
+# Banks already loaded in this process: (locale, provider, size) -> (values, cum_weights)
+_LOADED_BANKS: Dict[Tuple[str, str, int], Tuple[List[Any], List[int]]] = {}
+
+
+def _bank_seed(locale: str, provider: str) -> int:
+    """Fixed seed of the sampling run, so a bank is the same on every host."""
+    digest = hashlib.blake2b(f"{locale}|{provider}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _bank_file_path(cache_dir: str, locale: str, provider: str, size: int) -> str:
+    """Path of the on-disk cache file of a bank."""
+    return os.path.join(cache_dir, f"{locale}-{provider}-{size}-faker{faker_package.VERSION}.json")
+
+
+def build_value_bank(locale: str, provider: str, size: int = DEFAULT_BANK_SIZE) -> Tuple[List[Any], List[int]]:
+    """
+    Sample a provider's output domain for a locale.
+
+    A dedicated, seeded Faker instance is used so building a bank never
+    touches the random state of the tables being generated.
+
+    Args:
+        locale: Locale code (e.g., 'en_US')
+        provider: Name of the Faker provider method
+        size: Number of samples drawn
+
+    Returns:
+        Tuple of (distinct values, cumulative counts) ready for random.choices
+    """
+    sampler = Faker(locale)
+    if not hasattr(sampler, provider):
+        raise ValueError(f"Unknown Faker provider: {provider}")
+    sampler.seed_instance(_bank_seed(locale, provider))
+
+    generate = getattr(sampler, provider)
+    counts = Counter(generate() for _ in range(size))
+    values = list(counts.keys())
+    return values, list(accumulate(counts[value] for value in values))
+
+
+def load_value_bank(locale: str,
+                    provider: str,
+                    size: int = DEFAULT_BANK_SIZE,
+                    cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Tuple[List[Any], List[int]]:
+    """
+    Get a value bank from memory, the disk cache, or by building it.
+
+    Args:
+        locale: Locale code (e.g., 'en_US')
+        provider: Name of the Faker provider method
+        size: Number of samples drawn when the bank is built
+        cache_dir: Directory of the on-disk cache (None disables it)
+
+    Returns:
+        Tuple of (distinct values, cumulative counts)
+    """
+    key = (locale, provider, size)
+    bank = _LOADED_BANKS.get(key)
+    if bank is not None:
+        return bank
+
+    file_path = _bank_file_path(cache_dir, locale, provider, size) if cache_dir else None
+    if file_path and os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        bank = (data['values'], data['cum_weights'])
+    else:
+        bank = build_value_bank(locale, provider, size)
+        if file_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file first so concurrent workers never read a partial bank
+            tmp_path = f"{file_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'values': bank[0], 'cum_weights': bank[1]}, f, ensure_ascii=False)
+            os.replace(tmp_path, file_path)
+
+    _LOADED_BANKS[key] = bank
+    return bank
+
+
+class ValueBankProvider(BatchProvider):
+    """
+    Batched provider drawing a Faker provider's values from its value bank.
+
+    Example: ValueBankProvider('first_name') instead of 'first_name'.
+    """
+
+    def __init__(self,
+                 provider: str,
+                 size: int = DEFAULT_BANK_SIZE,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.provider = provider
+        self.size = size
+        self.cache_dir = cache_dir
+
+    def batch(self, faker: Faker, rows: Sequence[int]) -> List[Any]:
+        values, cum_weights = load_value_bank(faker.locales[0], self.provider, self.size, self.cache_dir)
+        return faker.random.choices(values, cum_weights=cum_weights, k=len(rows))
+
+    def __repr__(self) -> str:
+        return f"ValueBankProvider({self.provider!r})"
@@ -3,8 +3,16 @@ import sys
 import argparse
 from pathlib import Path
 import os
+from itertools import chain
 from tqdm import tqdm
 
+# Columnar converters and compressed file helpers live next to the data generator
+CREATE_FAKE_DATA_DIR = Path(__file__).resolve().parent.parent / "create-fake-data"
+sys.path.append(str(CREATE_FAKE_DATA_DIR))
+from compressed_io import GZIP_EXTENSION, is_gzip_path, open_text, resolve_existing_path
+
+COLUMNAR_EXTENSIONS = ['.parquet', '.arrow']
+
 
 def parse_insert_line(line):
     """Extract values from an INSERT line"""
@@ -26,15 +34,24 @@ def get_table_info(line):
     return None, None
 
 
-def generate_bulk_insert_file(table_name, columns, values_list, output_path, batch_size):
-    """Generate bulk INSERT file with batched statements"""
-    total_batches = (len(values_list) + batch_size - 1) // batch_size
-    
-    with open(output_path, 'w', encoding='utf-8') as out:
-        for i in tqdm(range(0, len(values_list), batch_size), 
-                      desc=f"Generating batches for {output_path.name}",
-                      total=total_batches):
-            batch = values_list[i:i+batch_size]
+def iter_batches(values, batch_size):
+    """Group an iterable of values into lists of batch_size items"""
+    batch = []
+    for value in values:
+        batch.append(value)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_bulk_batches(output_path, table_name, columns, batches, total_batches=None):
+    """Write BEGIN/INSERT/COMMIT blocks, gzip-compressed when output_path ends in .gz"""
+    with open_text(output_path, 'w') as out:
+        for batch in tqdm(batches,
+                          desc=f"Generating batches for {output_path.name}",
+                          total=total_batches):
             out.write("BEGIN;\n")
             out.write(f"INSERT INTO {table_name} ({columns}) VALUES\n")
             out.write(",\n".join(f"({v})" for v in batch))
@@ -43,8 +60,55 @@ def generate_bulk_insert_file(table_name, columns, values_list, output_path, bat
     print(f"✅ Script generated successfully: {output_path}")
 
 
-def convert_to_bulk_insert(batch_size):
-    """Convert SQL files with individual INSERTs to batched INSERTs"""
+def generate_bulk_insert_file(table_name, columns, values_list, output_path, batch_size):
+    """Generate bulk INSERT file with batched statements (values_list can be any iterable)"""
+    total_batches = None
+    if hasattr(values_list, '__len__'):
+        total_batches = (len(values_list) + batch_size - 1) // batch_size
+    
+    write_bulk_batches(output_path, table_name, columns, iter_batches(values_list, batch_size), total_batches)
+
+
+def find_columnar_file(sql_path):
+    """Return the Parquet/Arrow file generated for the same table, unless the SQL file is newer"""
+    base_path = Path(str(sql_path)[:-len(GZIP_EXTENSION)]) if is_gzip_path(sql_path) else sql_path
+    for extension in COLUMNAR_EXTENSIONS:
+        columnar_path = base_path.with_suffix(extension)
+        if not columnar_path.exists():
+            continue
+        if not sql_path.exists() or columnar_path.stat().st_mtime >= sql_path.stat().st_mtime:
+            return columnar_path
+    return None
+
+
+def generate_bulk_insert_file_from_columnar(columnar_path, output_path, batch_size):
+    """Generate bulk INSERT file streaming typed values from a columnar file (no SQL parsing)"""
+    from columnar_export import iter_sql_value_rows, read_columnar_schema, read_columnar_table_name
+
+    table_name = read_columnar_table_name(str(columnar_path))
+    if not table_name:
+        print(f"⚠️ Could not extract table information from {columnar_path.name}")
+        return
+    columns = ", ".join(read_columnar_schema(str(columnar_path)).names)
+
+    write_bulk_batches(output_path, table_name, columns, iter_sql_value_rows(str(columnar_path), batch_size))
+
+
+def iter_insert_lines(file_path):
+    """Stream the INSERT lines of a plain or gzip-compressed SQL file"""
+    with open_text(file_path) as f:
+        for line in f:
+            line = line.strip()
+            if line and line.lower().startswith("insert into"):
+                yield line
+
+
+def convert_to_bulk_insert(batch_size, compress=False):
+    """Convert SQL files with individual INSERTs to batched INSERTs
+    
+    Input files are streamed (.sql or .sql.gz). The output is gzip-compressed
+    when compress is set or when the input file was compressed.
+    """
     # Base path for SQL files
     base_path = Path("../../../data/sql")
     
@@ -63,42 +127,37 @@ def convert_to_bulk_insert(batch_size):
     
     print("Starting SQL files processing...")
     for file_name in tqdm(FILES_SQL, desc="Processing SQL files"):
-        file_path = base_path / file_name
+        # Picks 04-...sql.gz when only the compressed file exists
+        file_path = Path(resolve_existing_path(base_path / file_name))
+        output_file = output_dir / f"{file_name[:-4]}_bulk_batches.sql"
+        if compress or is_gzip_path(file_path):
+            output_file = output_dir / f"{output_file.name}{GZIP_EXTENSION}"
+
+        # Typed columnar data is converted directly, without re-parsing SQL text
+        columnar_path = find_columnar_file(file_path)
+        if columnar_path:
+            generate_bulk_insert_file_from_columnar(columnar_path, output_file, batch_size)
+            continue
         
         if not file_path.exists():
             print(f"❌ File not found: {file_path}")
             continue
 
-        table_name = None
-        columns = None
-        values_list = []
-
-        # Count total lines for progress bar
-        total_lines = sum(1 for _ in open(file_path, 'r', encoding='utf-8'))
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in tqdm(f, total=total_lines, desc=f"Reading {file_name}", leave=False):
-                line = line.strip()
-                if not line or not line.lower().startswith("insert into"):
-                    continue
-
-                if table_name is None:
-                    table_name, columns = get_table_info(line)
-                    if not table_name or not columns:
-                        print(f"⚠️ Could not extract table information from {file_name}")
-                        break
-
-                values = parse_insert_line(line)
-                if values:
-                    values_list.append(values)
-
-        if not values_list:
+        lines = iter_insert_lines(file_path)
+        first_line = next(lines, None)
+        if first_line is None:
             print(f"⚠️ No values found to insert in {file_name}")
             continue
 
+        table_name, columns = get_table_info(first_line)
+        if not table_name or not columns:
+            print(f"⚠️ Could not extract table information from {file_name}")
+            continue
+
+        values = (v for v in map(parse_insert_line, chain([first_line], lines)) if v)
+
         # Create output file with the same name but in the Bulk-Load folder
-        output_file = output_dir / f"{file_name[:-4]}_bulk_batches.sql"
-        generate_bulk_insert_file(table_name, columns, values_list, output_file, batch_size)
+        generate_bulk_insert_file(table_name, columns, values, output_file, batch_size)
 
 
 def main():
@@ -111,9 +170,14 @@ def main():
         default=10000, 
         help="Batch size for INSERT statements (default: 10000)"
     )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write gzip-compressed batch files (.sql.gz)"
+    )
 
     args = parser.parse_args()
-    convert_to_bulk_insert(args.batch_size)
+    convert_to_bulk_insert(args.batch_size, args.compress)
 
 
 if __name__ == "__main__":
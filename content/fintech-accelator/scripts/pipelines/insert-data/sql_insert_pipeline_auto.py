@@ -10,6 +10,10 @@ from psycopg2 import sql, errors
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from tqdm import tqdm
 
+# Compressed file helpers live next to the data generator
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'create-fake-data'))
+from compressed_io import open_text, resolve_existing_path
+
 # Improved logging configuration
 logging.basicConfig(
     level=logging.INFO,
@@ -103,53 +107,60 @@ class SQLPipeline:
             
         return True
 
+    def iter_sql_statements(self, file_path: str, encoding: str = 'utf-8'):
+        """Stream the statements of a plain or gzip-compressed (.gz) SQL file"""
+        parts = []
+        with open_text(file_path, encoding=encoding) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('--'):
+                    continue
+                parts.append(line)
+                if line.endswith(";"):
+                    yield " ".join(parts)
+                    parts = []
+
+    def execute_statements(self, file_path: str, encoding: str) -> Optional[int]:
+        """Execute the statements of a file as they are read; None if one fails"""
+        executed = 0
+        with self.conn.cursor() as cur:
+            # Progress bar for statements within the file
+            with tqdm(self.iter_sql_statements(file_path, encoding),
+                      desc=f"Processing {os.path.basename(file_path)}", leave=False) as pbar_statements:
+                for statement in pbar_statements:
+                    try:
+                        cur.execute(statement)
+                        executed += 1
+                        pbar_statements.set_postfix(status="OK")
+                    except errors.Error as e:
+                        pbar_statements.set_postfix(status="ERROR")
+                        logger.error(f"Error in statement: {e.pgerror}")
+                        self.conn.rollback()
+                        return None
+        return executed
+
     def execute_sql_file(self, file_path: str) -> bool:
         """Execute SQL file with transaction control and error handling"""
         if not self.validate_sql_file(file_path):
             return False
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                sql_commands = f.read()
-        except UnicodeDecodeError:
             try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    sql_commands = f.read()
-            except Exception as e:
-                logger.error(f"Failed to read file {file_path}: {e}")
-                return False
-
-        statements = []
-        buffer = ""
-        for line in sql_commands.splitlines():
-            line = line.strip()
-            if not line or line.startswith('--'):
-                continue
-            buffer += " " + line
-            if line.endswith(";"):
-                statements.append(buffer.strip())
-                buffer = ""
+                executed = self.execute_statements(file_path, 'utf-8')
+            except UnicodeDecodeError:
+                # Nothing is committed before the end of the file, so it can be replayed as latin-1
+                self.conn.rollback()
+                executed = self.execute_statements(file_path, 'latin-1')
 
-        if not statements:
-            logger.warning(f"No valid SQL statements found in {file_path}")
-            return True
+            if executed is None:
+                return False
 
-        try:
-            with self.conn.cursor() as cur:
-                # Progress bar for statements within the file
-                with tqdm(statements, desc=f"Processing {os.path.basename(file_path)}", leave=False) as pbar_statements:
-                    for statement in pbar_statements:
-                        try:
-                            cur.execute(statement)
-                            pbar_statements.set_postfix(status="OK")
-                        except errors.Error as e:
-                            pbar_statements.set_postfix(status="ERROR")
-                            logger.error(f"Error in statement: {e.pgerror}")
-                            self.conn.rollback()
-                            return False
+            if not executed:
+                logger.warning(f"No valid SQL statements found in {file_path}")
+                return True
                             
             self.conn.commit()
-            logger.info(f"Successfully executed {len(statements)} statements from {file_path}")
+            logger.info(f"Successfully executed {executed} statements from {file_path}")
             return True
             
         except Exception as e:
@@ -208,13 +219,14 @@ class SQLPipeline:
             
             # Add standard SQL files first
             for sql_file in self.standard_sql_files:
-                all_files.append((sql_file, os.path.join(sql_dir, sql_file)))
+                all_files.append((sql_file, resolve_existing_path(os.path.join(sql_dir, sql_file))))
             
             # Add bulk load SQL files (in Bulk-Load directory)
             bulk_load_dir = os.path.join(sql_dir, "Bulk-Load")
             if os.path.exists(bulk_load_dir):
                 for sql_file in self.bulk_load_sql_files:
-                    all_files.append((sql_file, os.path.join(bulk_load_dir, sql_file)))
+                    # Picks the .sql.gz batches when they are the only or newest variant
+                    all_files.append((sql_file, resolve_existing_path(os.path.join(bulk_load_dir, sql_file))))
             else:
                 logger.warning(f"Bulk-Load directory not found at {bulk_load_dir}")
                 